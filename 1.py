@@ -1,12 +1,21 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
+import json
 import time
 import os
+import itertools
 from dotenv import load_dotenv
 
 from models.llm_handler import LLMHandler
-from agents.system_pipeline import run_full_pipeline
+from agents.insight_agent import INSIGHT_FIELDS
+from agents.system_pipeline import iter_pipeline
+from utils.plotly_charts import (
+    comparison_figures,
+    cost_distribution_figure,
+    topology_figure,
+)
+from utils.result_store import ResultStore, input_key
+from utils.tracing import serve_metrics
+from utils.warmup import start_warm_up
 
 # ============================================================
 # INITIALIZATION
@@ -17,10 +26,54 @@ load_dotenv()
 API_KEY = os.getenv("GROQ_API_KEY")
 MODEL = "llama-3.1-8b-instant"
 
-llm = LLMHandler(API_KEY, MODEL)
+# Port for the Prometheus /metrics endpoint; unset leaves it off
+METRICS_PORT = os.getenv("NETARCHITECT_METRICS_PORT")
+
+
+# Built once per server process and shared by every session and rerun
+@st.cache_resource
+def load_llm(api_key, model):
+    return LLMHandler(api_key, model)
+
+
+@st.cache_resource
+def warm_up_services():
+    # Catalog, ReportLab and NumPy load on a background thread so the
+    # first page renders without waiting on them
+    return start_warm_up()
+
+
+@st.cache_resource
+def load_report_jobs():
+    # ReportLab is only imported once there is a report to build
+    from utils.report_jobs import get_report_jobs
+
+    return get_report_jobs()
+
+
+@st.cache_resource
+def start_metrics_endpoint(port):
+    # Streamlit cannot add routes, so /metrics gets its own small server
+    return serve_metrics(int(port))
+
+
+llm = load_llm(API_KEY, MODEL)
+warm_up = warm_up_services()
+
+if METRICS_PORT:
+    start_metrics_endpoint(METRICS_PORT)
+
+# Charts are drawn in the browser; hide plotly's toolbar
+PLOTLY_CONFIG = {"displayModeBar": False}
 
 st.set_page_config(layout="wide")
 
+# Finished results for this session, keyed by their inputs
+if "results" not in st.session_state:
+    st.session_state.results = ResultStore()
+
+results = st.session_state.results
+
 # ============================================================
 # HEADER
 # ============================================================
@@ -51,25 +104,27 @@ with col3:
 st.divider()
 
 # ============================================================
-# RUN PIPELINE
+# DASHBOARD RENDERING
 # ============================================================
 
-if st.button("Run Optimization"):
+# The same drawing code fills the dashboard in while the pipeline runs
+# and draws the finished result. `live` numbers each in-progress redraw
+# so widget keys stay unique within the run; widgets are disabled until
+# the result is complete.
 
-    user_input = {
-        "num_employees": employees,
-        "office_size_sqft": office_size,
-        "security_level": security,
-        "growth_rate_percent": growth,
-        "cloud_preference": deployment,
-        "budget": budget,
-    }
+TAB_NAMES = [
+    "Vendor Comparison",
+    "Deep Analysis",
+    "Deployment Plan",
+    "AI Insights",
+]
 
-    result = run_full_pipeline(user_input, llm)
 
-    # ========================================================
-    # TOP METRICS SECTION
-    # ========================================================
+def widget_key(name, live):
+    return name if live is None else f"live{live}_{name}"
+
+
+def draw_summary(result):
 
     st.subheader("Executive Summary")
 
@@ -77,261 +132,404 @@ if st.button("Run Optimization"):
 
     m1.metric("Cisco Cost", f"₹ {result['cost']['cisco_total_cost']:,}")
     m2.metric("TP-Link Cost", f"₹ {result['cost']['tplink_total_cost']:,}")
+
+    # Not known until the optimization phase has finished
+    decision = result.get("optimization_decision")
     m3.metric(
         "Optimization Needed",
-        result["optimization_decision"]["optimization_needed"],
+        "…" if decision is None else decision["optimization_needed"],
     )
 
+
+# ============================================================
+# TAB 1 — VENDOR COMPARISON
+# ============================================================
+
+def draw_comparison_tab(result, live=None):
+
+    st.subheader("Vendor Comparison Dashboard")
+
+    # Plotly figures are shipped as JSON and drawn client-side
+    comparison = comparison_figures(result["optimized_analysis"])
+
+    # ----------------------------------------------------
+    # Compact Static Charts (Side-by-Side)
+    # ----------------------------------------------------
+
+    for column, (name, fig) in zip(st.columns(3), comparison.items()):
+        with column:
+            st.plotly_chart(
+                fig,
+                key=widget_key(f"compare_{name}", live),
+                config=PLOTLY_CONFIG,
+            )
+
     st.divider()
 
-    # ========================================================
-    # MAIN TABS
-    # ========================================================
+    # ----------------------------------------------------
+    # INTERACTIVE SLIDER VIEW (Carousel)
+    # ----------------------------------------------------
+
+    st.subheader("Interactive Comparison View")
+
+    if "slide_index" not in st.session_state:
+        st.session_state.slide_index = 0
+
+    graph_types = ["Cost", "Performance", "Risk"]
+
+    left, mid, right = st.columns([1, 6, 1])
+
+    with left:
+        if st.button(
+            "⬅",
+            key=widget_key("left_slide", live),
+            disabled=live is not None,
+        ):
+            st.session_state.slide_index = (
+                st.session_state.slide_index - 1
+            ) % len(graph_types)
+
+    with right:
+        if st.button(
+            "➡",
+            key=widget_key("right_slide", live),
+            disabled=live is not None,
+        ):
+            st.session_state.slide_index = (
+                st.session_state.slide_index + 1
+            ) % len(graph_types)
+
+    current_graph = graph_types[st.session_state.slide_index]
+
+    with mid:
+        st.plotly_chart(
+            comparison[current_graph],
+            key=widget_key("carousel", live),
+            config=PLOTLY_CONFIG,
+        )
+
+
+# ============================================================
+# TAB 2 — DEEP ANALYSIS
+# ============================================================
+
+def draw_analysis_tab(result, live=None):
 
-    tab1, tab2, tab3, tab4 = st.tabs(
-        [
-            "Vendor Comparison",
-            "Deep Analysis",
-            "Deployment Plan",
-            "AI Insights",
-        ]
+    st.subheader("Deep Vendor Analysis")
+
+    vendor_choice = st.selectbox(
+        "Select Vendor",
+        ["Cisco", "TP-Link"],
+        key=widget_key("vendor_choice", live),
+        disabled=live is not None,
     )
 
+    key = vendor_choice.lower().replace("-", "").replace(" ", "")
 
+    # ----------------------------------------------------
+    # Component Breakdown
+    # ----------------------------------------------------
 
+    st.markdown("### Component Cost Breakdown")
 
-    # ========================================================
-    # TAB 1 — VENDOR COMPARISON
-    # ========================================================
+    breakdown = result["cost"][f"{key}_breakdown"]
 
-    with tab1:
+    st.json(breakdown)
 
-        st.subheader("Vendor Comparison Dashboard")
+    # Pie Chart Distribution
+    st.plotly_chart(
+        cost_distribution_figure(breakdown),
+        key=widget_key("cost_pie", live),
+        config=PLOTLY_CONFIG,
+    )
 
-        vendors = ["Cisco", "TP-Link"]
+    st.divider()
 
-        # ----------------------------------------------------
-        # Compact Static Charts (Side-by-Side)
-        # ----------------------------------------------------
+    # ----------------------------------------------------
+    # Performance + Risk Metrics
+    # ----------------------------------------------------
 
-        colA, colB, colC = st.columns(3)
-
-        # Cost Chart
-        with colA:
-            fig_cost, ax_cost = plt.subplots(figsize=(3.5, 2.2), dpi=90)
-            ax_cost.bar(vendors, [
-                result["cost"]["cisco_total_cost"],
-                result["cost"]["tplink_total_cost"]
-            ])
-            ax_cost.set_title("Cost", fontsize=9)
-            ax_cost.tick_params(labelsize=8)
-            plt.tight_layout()
-            st.pyplot(fig_cost, use_container_width=False)
-
-        # Performance Chart
-        with colB:
-            fig_perf, ax_perf = plt.subplots(figsize=(3.5, 2.2), dpi=90)
-            ax_perf.bar(vendors, [
-                result["performance"]["cisco"],
-                result["performance"]["tplink"]
-            ])
-            ax_perf.set_title("Performance", fontsize=9)
-            ax_perf.tick_params(labelsize=8)
-            plt.tight_layout()
-            st.pyplot(fig_perf, use_container_width=False)
-
-        # Risk Chart
-        with colC:
-            fig_risk, ax_risk = plt.subplots(figsize=(3.5, 2.2), dpi=90)
-            ax_risk.bar(vendors, [
-                result["security"]["cisco"],
-                result["security"]["tplink"]
-            ])
-            ax_risk.set_title("Risk", fontsize=9)
-            ax_risk.tick_params(labelsize=8)
-            plt.tight_layout()
-            st.pyplot(fig_risk, use_container_width=False)
-
-        st.divider()
+    colX, colY = st.columns(2)
 
-        # ----------------------------------------------------
-        # INTERACTIVE SLIDER VIEW (Carousel)
-        # ----------------------------------------------------
+    colX.metric("Performance Score", result["performance"][key])
+    colY.metric("Risk Score", result["security"][key])
+
+
+# ============================================================
+# TAB 3 — DEPLOYMENT PLAN
+# ============================================================
 
-        st.subheader("Interactive Comparison View")
+def draw_deployment_tab(result, live=None):
 
-        if "slide_index" not in st.session_state:
-            st.session_state.slide_index = 0
+    st.subheader("Deployment Strategy Overview")
 
-        graph_types = ["Cost", "Performance", "Risk"]
+    st.json(result["deployment"])
 
-        left, mid, right = st.columns([1, 6, 1])
+    st.divider()
 
-        with left:
-            if st.button("⬅", key="left_slide"):
-                st.session_state.slide_index = (
-                    st.session_state.slide_index - 1
-                ) % len(graph_types)
+    st.subheader("Deployment Metrics")
 
-        with right:
-            if st.button("➡", key="right_slide"):
-                st.session_state.slide_index = (
-                    st.session_state.slide_index + 1
-                ) % len(graph_types)
+    col1, col2 = st.columns(2)
 
-        current_graph = graph_types[st.session_state.slide_index]
+    with col1:
+        st.metric(
+            "Cable Length (m)",
+            result["deployment"]["cable_length_meters"]
+        )
+        st.metric(
+            "Labour Hours",
+            result["deployment"]["estimated_labour_hours"]
+        )
+        st.metric(
+            "Labour Cost",
+            f"₹ {result['deployment']['labour_cost']:,}"
+        )
 
-        fig_slide, ax_slide = plt.subplots(figsize=(4, 2.5), dpi=90)
+    with col2:
+        st.metric(
+            "Rack Units",
+            result["deployment"]["rack_units_required"]
+        )
+        st.metric(
+            "Power Estimate (kW)",
+            result["deployment"]["estimated_power_kw"]
+        )
+        st.metric(
+            "Total Project Cost",
+            f"₹ {result['deployment']['total_project_cost_estimate']:,}"
+        )
 
-        if current_graph == "Cost":
-            values = [
-                result["cost"]["cisco_total_cost"],
-                result["cost"]["tplink_total_cost"]
-            ]
-            ax_slide.set_ylabel("₹", fontsize=8)
+    st.divider()
 
-        elif current_graph == "Performance":
-            values = [
-                result["performance"]["cisco"],
-                result["performance"]["tplink"]
-            ]
-            ax_slide.set_ylabel("Score", fontsize=8)
+    st.subheader("Network Architecture Diagram")
+    st.plotly_chart(
+        topology_figure(result["topology"]["cisco"]),
+        key=widget_key("topology", live),
+        config=PLOTLY_CONFIG,
+    )
 
-        else:
-            values = [
-                result["security"]["cisco"],
-                result["security"]["tplink"]
-            ]
-            ax_slide.set_ylabel("Risk", fontsize=8)
 
-        ax_slide.bar(vendors, values)
-        ax_slide.set_title(current_graph, fontsize=9)
-        ax_slide.tick_params(labelsize=8)
+# ============================================================
+# TAB 4 — AI INSIGHTS
+# ============================================================
 
-        plt.tight_layout()
-        st.pyplot(fig_slide, use_container_width=False)
+def draw_insight(target, key, title, text):
 
-    # ========================================================
-    # TAB 2 — DEEP ANALYSIS
-    # ========================================================
+    target.markdown(f"### {title}")
 
-    with tab2:
+    if key == "final_recommendation":
+        target.success(text)
+    else:
+        target.write(text)
 
-        st.subheader("Deep Vendor Analysis")
 
-        vendor_choice = st.selectbox(
-            "Select Vendor",
-            ["Cisco", "TP-Link"]
-        )
+def draw_insights_tab(result):
 
-        key = vendor_choice.lower().replace("-", "").replace(" ", "")
+    st.subheader("Executive AI Insights")
 
-        # ----------------------------------------------------
-        # Component Breakdown
-        # ----------------------------------------------------
+    insights = result["insights"]
 
-        st.markdown("### Component Cost Breakdown")
+    for key, title in INSIGHT_FIELDS:
+        draw_insight(st, key, title, insights[key])
 
-        breakdown = result["cost"][f"{key}_breakdown"]
 
-        st.json(breakdown)
+# Each dashboard tab is a fragment: its own widgets (carousel arrows,
+# vendor selectbox) rerun only that tab from the stored result, not the
+# whole page.
 
-        # Pie Chart Distribution
-        labels = [item["model"] for item in breakdown.values()]
-        values = [item["total"] for item in breakdown.values()]
+@st.fragment
+def render_comparison_tab(result):
+    draw_comparison_tab(result)
 
-        fig_pie, ax_pie = plt.subplots(figsize=(3.5, 2.5), dpi=90)
-        ax_pie.pie(values, labels=labels, autopct="%1.1f%%")
-        ax_pie.set_title("Cost Distribution", fontsize=9)
 
-        plt.tight_layout()
-        st.pyplot(fig_pie, use_container_width=False)
+@st.fragment
+def render_analysis_tab(result):
+    draw_analysis_tab(result)
 
-        st.divider()
 
-        # ----------------------------------------------------
-        # Performance + Risk Metrics
-        # ----------------------------------------------------
+@st.fragment
+def render_deployment_tab(result):
+    draw_deployment_tab(result)
 
-        colX, colY = st.columns(2)
 
-        colX.metric("Performance Score", result["performance"][key])
-        colY.metric("Risk Score", result["security"][key])
+@st.fragment
+def render_insights_tab(result):
+    draw_insights_tab(result)
 
-    # ========================================================
-    # TAB 3 — DEPLOYMENT PLAN
-    # ========================================================
 
-    with tab3:
+# ============================================================
+# RUN PIPELINE
+# ============================================================
 
-        st.subheader("Deployment Strategy Overview")
+user_input = {
+    "num_employees": employees,
+    "office_size_sqft": office_size,
+    "security_level": security,
+    "growth_rate_percent": growth,
+    "cloud_preference": deployment,
+    "budget": budget,
+}
 
-        st.json(result["deployment"])
+# ?profile=1 samples the next run's phases into collapsed-stack files
+# (see utils.sampling_profiler); the cached result is bypassed for it
+profile_run = st.query_params.get("profile") == "1"
 
-        st.divider()
+if st.button("Run Optimization"):
 
-        st.subheader("Deployment Metrics")
+    run_key = input_key(user_input)
 
-        col1, col2 = st.columns(2)
+    # Inputs already analysed this session are served from memory
+    if run_key not in results or profile_run:
 
-        with col1:
-            st.metric(
-                "Cable Length (m)",
-                result["deployment"]["cable_length_meters"]
-            )
-            st.metric(
-                "Labour Hours",
-                result["deployment"]["estimated_labour_hours"]
-            )
-            st.metric(
-                "Labour Cost",
-                f"₹ {result['deployment']['labour_cost']:,}"
-            )
+        # ----------------------------------------------------
+        # Live progress: the dashboard's metrics and tabs are
+        # drawn from each event as the pipeline emits it; AI
+        # insights stream in last
+        # ----------------------------------------------------
 
-        with col2:
-            st.metric(
-                "Rack Units",
-                result["deployment"]["rack_units_required"]
-            )
-            st.metric(
-                "Power Estimate (kW)",
-                result["deployment"]["estimated_power_kw"]
+        live_area = st.empty()
+        live_box = live_area.container()
+        live_status = live_box.status("Running pipeline…", expanded=True)
+        live_summary = live_box.empty()
+        live_box.divider()
+
+        comparison_tab, analysis_tab, deployment_tab, insights_tab = (
+            live_box.tabs(TAB_NAMES)
+        )
+        live_comparison = comparison_tab.empty()
+        live_analysis = analysis_tab.empty()
+        live_deployment = deployment_tab.empty()
+        insights_tab.subheader("Generating AI Insights…")
+        live_slots = {key: insights_tab.empty() for key, _ in INSIGHT_FIELDS}
+        insight_titles = dict(INSIGHT_FIELDS)
+
+        # The result so far, in the shape of the finished one
+        partial = {}
+        redraws = itertools.count()
+
+        def redraw(slot, draw):
+            # Plotly reads NumPy from sys.modules; let the warm-up thread
+            # finish importing it before the first chart
+            warm_up.join()
+            with slot.container():
+                draw(partial, live=next(redraws))
+
+        # The UI draws the topology itself, so skip the PNG diagram
+        for event in iter_pipeline(
+            user_input,
+            llm,
+            render=False,
+            profile_cpu=profile_run or None,
+        ):
+            if event.kind == "insight_field":
+                key = event.data["key"]
+                if key in live_slots:
+                    draw_insight(
+                        live_slots[key].container(),
+                        key,
+                        insight_titles[key],
+                        event.data["text"],
+                    )
+                continue
+
+            live_status.write(
+                f"{event.kind.capitalize()} ready ({event.elapsed_ms:,.0f} ms)"
             )
-            st.metric(
-                "Total Project Cost",
-                f"₹ {result['deployment']['total_project_cost_estimate']:,}"
+
+            if event.kind == "analysis":
+                partial.update(
+                    cost=event.data["cost"],
+                    performance=event.data["performance"],
+                    security=event.data["security"],
+                    optimized_analysis={
+                        "cost_analysis": event.data["cost"],
+                        "performance_scores": event.data["performance"],
+                        "security_scores": event.data["security"],
+                    },
+                )
+
+            elif event.kind == "optimization":
+                optimized = event.data["optimized_analysis"]
+                decision = event.data["decision"]
+                partial.update(
+                    cost=optimized["cost_analysis"],
+                    performance=optimized["performance_scores"],
+                    security=optimized["security_scores"],
+                    optimized_analysis=optimized,
+                    optimization_decision=decision,
+                    topology=event.data["topology"],
+                )
+                live_status.write(
+                    f"Optimization needed: {decision['optimization_needed']}"
+                    f" — {decision['reason']}"
+                )
+
+            elif event.kind == "deployment":
+                partial["deployment"] = event.data
+                redraw(live_deployment, draw_deployment_tab)
+
+            elif event.kind == "result":
+                results.put(run_key, event.data)
+
+            if event.kind in ("analysis", "optimization"):
+                with live_summary.container():
+                    draw_summary(partial)
+                redraw(live_comparison, draw_comparison_tab)
+                redraw(live_analysis, draw_analysis_tab)
+
+        live_area.empty()
+
+        profile = results.get(run_key)["profile"]
+        if profile:
+            st.info(
+                "CPU profile written:\n\n"
+                + "\n".join(f"- `{path}`" for path in profile["files"])
             )
 
-        st.divider()
+    st.session_state.active_result = run_key
 
-        st.subheader("Network Architecture Diagram")
-        st.image(result["diagram"])
+# ============================================================
+# DASHBOARD
+# ============================================================
 
-    with tab4:
-        st.subheader("Executive AI Insights")
+active_key = st.session_state.get("active_result")
+result = results.get(active_key)
+
+if result is not None and active_key != input_key(user_input):
+    st.info("Inputs changed. Run Optimization to refresh the analysis.")
+
+if result is not None:
+
+    # Typeset the PDF in the background while the dashboard renders;
+    # a no-op once this result has a report
+    report_jobs = load_report_jobs()
+    report_jobs.submit(result)
+
+    # ========================================================
+    # TOP METRICS SECTION
+    # ========================================================
 
-        insights = result["insights"]
+    draw_summary(result)
 
-        st.markdown("### Executive Summary")
-        st.write(insights["executive_summary"])
+    st.divider()
 
-        st.markdown("### Cost Analysis Insight")
-        st.write(insights["cost_analysis_insight"])
+    # ========================================================
+    # MAIN TABS
+    # ========================================================
 
-        st.markdown("### Performance Insight")
-        st.write(insights["performance_insight"])
+    tab1, tab2, tab3, tab4 = st.tabs(TAB_NAMES)
 
-        st.markdown("### Risk Insight")
-        st.write(insights["risk_insight"])
+    with tab1:
+        render_comparison_tab(result)
 
-        st.markdown("### Scalability Outlook")
-        st.write(insights["scalability_insight"])
+    with tab2:
+        render_analysis_tab(result)
 
-        st.markdown("### Deployment Intelligence")
-        st.write(insights["deployment_insight"])
+    with tab3:
+        render_deployment_tab(result)
 
-        st.markdown("### Final Recommendation")
-        st.success(insights["final_recommendation"])
+    with tab4:
+        render_insights_tab(result)
 
     # ========================================================
     # PDF DOWNLOAD SECTION
@@ -341,8 +539,21 @@ if st.button("Run Optimization"):
 
     st.subheader("Export Executive Report")
 
+    # Served from the background job (or built now if it is not there);
+    # "ignore" keeps the dashboard on screen after the download
     st.download_button(
         "Download Full Executive Report (PDF)",
-        result["pdf"],
-        file_name="NetArchitect_Report.pdf"
+        lambda: report_jobs.get(result),
+        file_name="NetArchitect_Report.pdf",
+        mime="application/pdf",
+        on_click="ignore",
+    )
+
+    # Per-phase and per-LLM-call timings and token counts for this run
+    st.download_button(
+        "Download Pipeline Trace (JSON)",
+        lambda: json.dumps(result["trace"], indent=2),
+        file_name="NetArchitect_Trace.json",
+        mime="application/json",
+        on_click="ignore",
     )
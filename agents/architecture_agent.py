@@ -1,45 +1,43 @@
-from utils.catalog_loader import CatalogLoader
-import math
+from agents import deterministic_engine
+from utils.catalog_loader import as_dicts, get_catalog
+from utils.canonical_profile import canonicalize_profile, component_counts
 from utils.selection_validator import SelectionValidator
 
 
-def design(requirements: dict, company_profile: dict, llm) -> dict:
-
-    loader = CatalogLoader()
+def _select_with_llm(company_profile: dict, counts: dict, loader, llm):
 
     num_users = company_profile["num_employees"]
     office_sqft = company_profile["office_size_sqft"]
-    security_level = company_profile["security_level"]
-    cloud_pref = company_profile["cloud_preference"]
-
-    # -----------------------------
-    # 1️⃣ Deterministic Quantity Logic
-    # -----------------------------
 
-    router_count = max(1, math.ceil(num_users / 150))
-    switch_count = max(1, math.ceil(num_users / 48))
-    ap_count = max(2, math.ceil(office_sqft / 1500))
-    firewall_count = 1 if security_level in ["Medium", "High"] else 0
-    ids_count = 1 if security_level == "High" else 0
+    # Every profile in the same equivalence class gets the same counts and
+    # catalog options below, so the prompt only carries the class
+    canonical_profile = canonicalize_profile(company_profile, loader)
 
     # -----------------------------
-    # 2️⃣ Filter Catalog Options
+    # Filter Catalog Options
     # -----------------------------
 
-    cisco_routers = loader.filter_routers("Cisco", num_users, office_sqft)
-    tplink_routers = loader.filter_routers("TP-Link", num_users, office_sqft)
+    # Plain dicts, so the prompt prints the records as it always has
+    cisco_routers = as_dicts(
+        loader.filter_routers("Cisco", num_users, office_sqft)
+    )
+    tplink_routers = as_dicts(
+        loader.filter_routers("TP-Link", num_users, office_sqft)
+    )
 
-    cisco_switches = loader.get_vendor_catalog("Cisco")["switches"]
-    tplink_switches = loader.get_vendor_catalog("TP-Link")["switches"]
+    cisco_switches = as_dicts(loader.get_vendor_catalog("Cisco")["switches"])
+    tplink_switches = as_dicts(loader.get_vendor_catalog("TP-Link")["switches"])
 
-    cisco_aps = loader.get_vendor_catalog("Cisco")["access_points"]
-    tplink_aps = loader.get_vendor_catalog("TP-Link")["access_points"]
+    cisco_aps = as_dicts(loader.get_vendor_catalog("Cisco")["access_points"])
+    tplink_aps = as_dicts(
+        loader.get_vendor_catalog("TP-Link")["access_points"]
+    )
 
-    cisco_firewalls = loader.filter_firewalls("Cisco", num_users)
-    tplink_firewalls = loader.filter_firewalls("TP-Link", num_users)
+    cisco_firewalls = as_dicts(loader.filter_firewalls("Cisco", num_users))
+    tplink_firewalls = as_dicts(loader.filter_firewalls("TP-Link", num_users))
 
     # -----------------------------
-    # 3️⃣ LLM Selects Models Only
+    # LLM Selects Models Only
     # -----------------------------
 
     system_prompt = """
@@ -54,13 +52,13 @@ def design(requirements: dict, company_profile: dict, llm) -> dict:
 
     user_prompt = f"""
     Company Profile:
-    {company_profile}
+    {canonical_profile}
 
     Required Quantities (PRE-CALCULATED):
-    Routers: {router_count}
-    Switches: {switch_count}
-    Access Points: {ap_count}
-    Firewalls: {firewall_count}
+    Routers: {counts['routers']}
+    Switches: {counts['switches']}
+    Access Points: {counts['access_points']}
+    Firewalls: {counts['firewalls']}
 
     Cisco Router Options:
     {cisco_routers}
@@ -104,7 +102,44 @@ def design(requirements: dict, company_profile: dict, llm) -> dict:
     }}
     """
 
-    selection = llm.call(system_prompt, user_prompt)
+    return llm.call(system_prompt, user_prompt)
+
+
+def design(
+    requirements,
+    company_profile: dict,
+    llm,
+    backend: str = "llm",
+) -> dict:
+
+    loader = get_catalog()
+
+    security_level = company_profile["security_level"]
+    cloud_pref = company_profile["cloud_preference"]
+
+    # -----------------------------
+    # 1️⃣ Deterministic Quantity Logic
+    # -----------------------------
+
+    counts = component_counts(company_profile)
+
+    router_count = counts["routers"]
+    switch_count = counts["switches"]
+    ap_count = counts["access_points"]
+    firewall_count = counts["firewalls"]
+    ids_count = counts["ids_systems"]
+
+    # -----------------------------
+    # 2️⃣ Model Selection (LLM or deterministic ranker)
+    # -----------------------------
+
+    if backend == "deterministic":
+        selection = deterministic_engine.select_architecture(
+            company_profile, loader
+        )
+    else:
+        selection = _select_with_llm(company_profile, counts, loader, llm)
+
     validator = SelectionValidator(loader)
     validated_cisco = validator.validate_vendor_selection(
         "Cisco", selection["cisco_models"]
@@ -115,7 +150,7 @@ def design(requirements: dict, company_profile: dict, llm) -> dict:
     )
 
     # -----------------------------
-    # 4️⃣ Final Structured Output
+    # 3️⃣ Final Structured Output
     # -----------------------------
 
     architecture = {
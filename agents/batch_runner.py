@@ -0,0 +1,351 @@
+import csv
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import nullcontext
+
+from agents.system_pipeline import run_full_pipeline
+from models import rate_limiter
+from utils import memory_profile, sampling_profiler
+from utils.result_store import input_hash
+
+
+NUMERIC_FIELDS = (
+    "num_employees",
+    "office_size_sqft",
+    "growth_rate_percent",
+    "budget",
+)
+
+
+# ---------------------------
+# Input Sources
+# ---------------------------
+
+def _coerce_profile(row: dict) -> dict:
+    profile = dict(row)
+    for field in NUMERIC_FIELDS:
+        if isinstance(profile.get(field), str):
+            profile[field] = int(float(profile[field]))
+    return profile
+
+
+def iter_rows(source):
+    """
+    Lazily yield raw input rows from a .csv or .jsonl path, or from any
+    iterable of dicts: a dict per CSV row or item, the text of each
+    JSONL line. Nothing is read ahead of the consumer, and nothing is
+    parsed, so one malformed row cannot stop the iteration.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+
+        if path.endswith(".csv"):
+            with open(path, newline="") as f:
+                yield from csv.DictReader(f)
+
+        elif path.endswith(".jsonl"):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        yield line
+
+        else:
+            raise ValueError("Batch input must be a .csv or .jsonl file")
+
+    else:
+        yield from source
+
+
+def parse_row(row) -> dict:
+    """
+    Profile from one raw row. Raises ValueError for rows that are not
+    valid JSON objects or whose numeric fields are not numbers.
+    """
+
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise ValueError("Batch row must be a JSON object")
+    return _coerce_profile(row)
+
+
+def iter_profiles(source):
+    """
+    Lazily yield parsed profiles; raises on the first malformed row.
+    """
+
+    for row in iter_rows(source):
+        yield parse_row(row)
+
+
+# ---------------------------
+# Resumable Checkpoint
+# ---------------------------
+
+class BatchCheckpoint:
+    """
+    Tracks finished input positions as a contiguous watermark plus the few
+    positions finished ahead of it, so its size is bounded by the number
+    of items in flight rather than the length of the input.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.watermark = 0
+        self.done_ahead = set()
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.watermark = state["watermark"]
+            self.done_ahead = set(state["done_ahead"])
+
+    def is_done(self, index: int) -> bool:
+        return index < self.watermark or index in self.done_ahead
+
+    def mark_done(self, index: int):
+        self.done_ahead.add(index)
+        while self.watermark in self.done_ahead:
+            self.done_ahead.remove(self.watermark)
+            self.watermark += 1
+        self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "watermark": self.watermark,
+                    "done_ahead": sorted(self.done_ahead),
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+
+# ---------------------------
+# Concurrency Limits
+# ---------------------------
+
+class ConcurrencyLimitedLLM:
+    """
+    Wraps an LLM handler so that at most `limit` calls are in flight
+    across every pipeline sharing the wrapper.
+    """
+
+    def __init__(self, llm, limit: int):
+        self.llm = llm
+        self._gate = threading.BoundedSemaphore(limit)
+
+    def call(self, system_prompt: str, user_prompt: str, **kwargs) -> dict:
+        with self._gate:
+            return self.llm.call(system_prompt, user_prompt, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+def render_artifacts(index: int, result: dict, artifact_dir: str) -> dict:
+    """
+    Diagram and PDF for one finished item. Runs in a worker process, so
+    the imports stay local and only plain dicts cross the boundary. With
+    NETARCHITECT_PROFILE_MEMORY=1 / NETARCHITECT_PROFILE_CPU=1 the
+    returned dict also carries the memory report / CPU profile files for
+    both renders.
+    """
+
+    from utils.network_diagram import generate_network_diagram
+    from utils.pdf_report import generate_pdf
+
+    topology = result["topology"]["cisco"]
+
+    memory = (
+        memory_profile.MemoryProfiler() if memory_profile.ENABLED
+        else nullcontext()
+    )
+    cpu = (
+        sampling_profiler.SamplingProfiler(
+            input_hash(result["infra"]["company_profile"]) + "_render"
+        )
+        if sampling_profiler.ENABLED else nullcontext()
+    )
+
+    with memory, cpu:
+        with memory_profile.section("diagram"), \
+                sampling_profiler.section("diagram"):
+            diagram = generate_network_diagram(
+                result["infra"], topology=topology
+            )
+        with memory_profile.section("pdf"), sampling_profiler.section("pdf"):
+            pdf = generate_pdf(
+                result["infra"],
+                result["optimized_analysis"],
+                result["deployment"],
+                result["insights"],
+                topology,
+            )
+
+    paths = {
+        "diagram": os.path.join(artifact_dir, f"item_{index:06d}.png"),
+        "pdf": os.path.join(artifact_dir, f"item_{index:06d}.pdf"),
+    }
+    with open(paths["diagram"], "wb") as f:
+        f.write(diagram.getvalue())
+    with open(paths["pdf"], "wb") as f:
+        f.write(pdf.getvalue())
+
+    if memory_profile.ENABLED:
+        paths["memory"] = memory.report()
+    if sampling_profiler.ENABLED:
+        paths["profile"] = cpu.summary()
+
+    return paths
+
+
+# ---------------------------
+# Batch Entry Point
+# ---------------------------
+
+def run_batch(
+    source,
+    llm,
+    output_path: str,
+    checkpoint_path: str = None,
+    artifact_dir: str = None,
+    llm_concurrency: int = 4,
+    cpu_workers: int = 2,
+    backends=None,
+):
+    """
+    Run the pipeline over every profile in `source`, appending one JSON
+    line per item to `output_path` as soon as it finishes.
+
+    At most `llm_concurrency` LLM calls are in flight at once; diagram and
+    PDF rendering (only when `artifact_dir` is given) runs on a separate
+    pool of `cpu_workers` processes. A failing item, including a row that
+    cannot be parsed, is written with its error and the batch carries
+    on. With `checkpoint_path`, re-running the same batch skips items
+    that already finished.
+
+    LLM calls are made at batch priority, so when the process-wide rate
+    limiter is the bottleneck, interactive sessions are served first.
+
+    Returns a summary dict with ok / failed / skipped counts.
+    """
+
+    checkpoint = BatchCheckpoint(checkpoint_path)
+    limited_llm = (
+        ConcurrencyLimitedLLM(llm, llm_concurrency) if llm is not None else None
+    )
+
+    # Bounds how many items are read ahead of the ones still running
+    max_in_flight = llm_concurrency + cpu_workers * 2
+    window = threading.BoundedSemaphore(max_in_flight)
+
+    write_lock = threading.Lock()
+    summary = {"ok": 0, "failed": 0, "skipped": 0}
+
+    if artifact_dir:
+        os.makedirs(artifact_dir, exist_ok=True)
+        render_context = ProcessPoolExecutor(max_workers=cpu_workers)
+    else:
+        render_context = nullcontext()
+
+    with open(output_path, "a") as out, \
+            ThreadPoolExecutor(max_workers=llm_concurrency) as pipelines, \
+            render_context as renderers:
+
+        def finish(index, record):
+            with write_lock:
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+                checkpoint.mark_done(index)
+                summary[record["status"]] += 1
+            window.release()
+
+        def failed(index, item_id, error):
+            return {
+                "index": index,
+                "id": item_id,
+                "status": "failed",
+                "error": "".join(
+                    traceback.format_exception_only(type(error), error)
+                ).strip(),
+            }
+
+        def run_item(index, item_id, profile):
+            try:
+                # Interactive sessions get their LLM calls in first
+                with rate_limiter.priority(rate_limiter.BATCH):
+                    result = run_full_pipeline(
+                        profile,
+                        limited_llm,
+                        backends=backends,
+                        render=False,
+                    )
+            except Exception as e:
+                finish(index, failed(index, item_id, e))
+                return
+
+            result.pop("diagram", None)
+            record = {
+                "index": index,
+                "id": item_id,
+                "status": "ok",
+                "result": result,
+            }
+
+            if renderers is None:
+                finish(index, record)
+                return
+
+            def rendered(job):
+                try:
+                    record["artifacts"] = job.result()
+                except Exception as e:
+                    record.update(failed(index, item_id, e))
+                    record.pop("result", None)
+                finish(index, record)
+
+            try:
+                job = renderers.submit(
+                    render_artifacts, index, result, artifact_dir
+                )
+            except Exception as e:
+                finish(index, failed(index, item_id, e))
+                return
+
+            job.add_done_callback(rendered)
+
+        for index, row in enumerate(iter_rows(source)):
+            if checkpoint.is_done(index):
+                summary["skipped"] += 1
+                continue
+
+            window.acquire()
+
+            # A malformed row is recorded like any other failed item
+            try:
+                profile = parse_row(row)
+            except Exception as e:
+                item_id = index
+                if isinstance(row, dict):
+                    item_id = row.get("id", index)
+                finish(index, failed(index, item_id, e))
+                continue
+
+            item_id = profile.pop("id", index)
+            pipelines.submit(run_item, index, item_id, profile)
+
+        # Every permit back means every item has been written
+        for _ in range(max_in_flight):
+            window.acquire()
+
+    return summary
@@ -0,0 +1,180 @@
+import numpy as np
+
+from agents.deterministic_engine import per_unit_demand, rank_devices
+from agents.performance_agent import PerformanceAgent
+from agents.security_agent import SecurityAgent
+from agents.topology_engine import allocate
+from utils.catalog_loader import CATEGORIES, get_catalog, normalize_vendor
+from utils.selection_validator import SELECTION_KEYS
+
+
+DUAL_ISP_MULTIPLIER = 1.1
+
+
+def pareto_mask(cost, score):
+    """
+    Boolean mask of points not dominated under (minimise cost, maximise
+    score). Of several points with identical cost and score only the
+    first is kept.
+    """
+
+    order = np.lexsort((-score, cost))
+    sorted_score = score[order]
+
+    best_before = np.maximum.accumulate(sorted_score)
+    best_before = np.concatenate(([-np.inf], best_before[:-1]))
+
+    mask = np.zeros(len(cost), dtype=bool)
+    mask[order[sorted_score > best_before]] = True
+    return mask
+
+
+class BOMOptimizer:
+    """
+    Searches every router x switch x access point x firewall combination
+    for a vendor and returns the cost/performance Pareto frontier.
+
+    Cost and performance points are both sums of per-category terms, so a
+    device dominated within its category can never appear on the overall
+    frontier. Each category is pruned first and the product is built one
+    category at a time, pruning again after every step, which keeps the
+    arrays small even with hundreds of SKUs per category.
+
+    Each switch model is wired by the topology allocator, so it is priced
+    at the switch count it actually needs and scored with its uplink
+    factor, as CostingAgent and PerformanceAgent do for the chosen design.
+    """
+
+    def __init__(self, respect_capacity: bool = True):
+        self.loader = get_catalog()
+        self.respect_capacity = respect_capacity
+        self.security_agent = SecurityAgent()
+
+        self.points = {
+            "routers": PerformanceAgent.router_points,
+            "switches": PerformanceAgent.switch_points,
+            "access_points": PerformanceAgent.access_point_points,
+            "firewalls": lambda device: 0.0,
+        }
+
+    # ---------------------------
+    # Candidate Arrays
+    # ---------------------------
+
+    def _candidates(self, vendor, category, demand, quantity, infra_package):
+        if self.respect_capacity:
+            devices = rank_devices(self.loader, vendor, category, demand)
+        else:
+            devices = list(self.loader.sorted_by_price(vendor, category))
+
+        # A category that is not deployed only needs one placeholder model
+        if quantity == 0:
+            devices = devices[:1]
+
+        quantities = [quantity] * len(devices)
+        points = [self.points[category](d) for d in devices]
+
+        if category == "switches":
+            topologies = [
+                allocate(vendor, infra_package, d["model"]) for d in devices
+            ]
+            quantities = [t["summary"]["switches"] for t in topologies]
+            points = [
+                p * PerformanceAgent.uplink_factor(t)
+                for p, t in zip(points, topologies)
+            ]
+
+        cost = np.array(
+            [q * d["price"] for q, d in zip(quantities, devices)], dtype=float
+        )
+        points = np.array(points, dtype=float)
+
+        keep = pareto_mask(cost, points)
+        return [d for d, k in zip(devices, keep) if k], cost[keep], points[keep]
+
+    # ---------------------------
+    # Search
+    # ---------------------------
+
+    def search_vendor(self, vendor, infra_package):
+
+        profile = infra_package["company_profile"]
+        design = infra_package["infrastructure_design"]
+        components = design["components"]
+        demand = per_unit_demand(profile)
+
+        devices = {}
+        cost = np.zeros(1)
+        points = np.zeros(1)
+        index = np.zeros((1, 0), dtype=int)
+
+        for category in CATEGORIES:
+            options, option_cost, option_points = self._candidates(
+                vendor, category, demand[category], components[category],
+                infra_package,
+            )
+            devices[category] = options
+
+            # Outer sum with the frontier built so far, then prune
+            cost = np.add.outer(cost, option_cost).ravel()
+            points = np.add.outer(points, option_points).ravel()
+            index = np.hstack([
+                np.repeat(index, len(options), axis=0),
+                np.tile(np.arange(len(options)), len(index))[:, None],
+            ])
+
+            keep = pareto_mask(cost, points)
+            cost, points, index = cost[keep], points[keep], index[keep]
+
+        if design["redundancy"]["dual_isp"]:
+            cost = cost * DUAL_ISP_MULTIPLIER
+
+        score = np.round(
+            np.minimum(points / 10, 100), 2
+        )
+
+        # The cap at 100 can make pricier points equal; prune once more
+        keep = pareto_mask(cost, score)
+        cost, score, index = cost[keep], score[keep], index[keep]
+
+        order = np.argsort(cost)
+        cost, score, index = cost[order], score[order], index[order]
+
+        # Risk does not depend on the chosen models, only on components
+        vendor_key = normalize_vendor(vendor)
+        risk = self.security_agent.evaluate(infra_package)[vendor_key]
+
+        frontier = []
+        for row, total, perf in zip(index, cost, score):
+            frontier.append({
+                "models": {
+                    SELECTION_KEYS[category]: devices[category][i]["model"]
+                    for category, i in zip(CATEGORIES, row)
+                },
+                "total_cost": round(float(total), 2),
+                "performance": float(perf),
+                "risk": risk,
+            })
+
+        budget = profile["budget"]
+        feasible = [point for point in frontier if point["total_cost"] <= budget]
+
+        if feasible:
+            # Frontier is sorted by cost, so the last feasible point has
+            # the highest performance within budget
+            best = feasible[-1]
+        else:
+            best = frontier[0]
+
+        return {
+            "frontier": frontier,
+            "feasible": feasible,
+            "best": best,
+            "within_budget": bool(feasible),
+        }
+
+    def search(self, infra_package):
+        return {
+            "cisco": self.search_vendor("Cisco", infra_package),
+            "tplink": self.search_vendor("TP-Link", infra_package),
+        }
@@ -1,18 +1,27 @@
-from utils.catalog_loader import CatalogLoader
+from agents.topology_engine import allocate
+from utils.catalog_loader import get_catalog
 
 
 class CostingAgent:
 
     def __init__(self):
-        self.loader = CatalogLoader()
+        self.loader = get_catalog()
 
-    def calculate_vendor_cost(self, vendor, infra_package):
-
-        catalog = self.loader.get_vendor_catalog(vendor)
+    def calculate_vendor_cost(self, vendor, infra_package, topology=None):
+        """
+        Hardware cost for one vendor. Switches are priced at the count
+        the topology allocator wires (`topology`, computed when not
+        given), which can exceed the design's count when ports or uplink
+        bandwidth run out.
+        """
 
         design = infra_package["infrastructure_design"]
         components = design["components"]
 
+        if topology is None:
+            topology = allocate(vendor, infra_package)
+        switch_count = topology["summary"]["switches"]
+
         normalized_vendor = vendor.lower().replace("-", "").replace(" ", "")
         selected = design["selected_models"][normalized_vendor]
 
@@ -20,9 +29,8 @@ class CostingAgent:
         total_cost = 0
 
         # Router
-        router = next(
-            d for d in catalog["routers"]
-            if d["model"] == selected["router_model"]
+        router = self.loader.get_device(
+            vendor, "routers", selected["router_model"]
         )
         router_cost = components["routers"] * router["price"]
         breakdown["routers"] = {
@@ -34,23 +42,21 @@ class CostingAgent:
         total_cost += router_cost
 
         # Switch
-        switch = next(
-            d for d in catalog["switches"]
-            if d["model"] == selected["switch_model"]
+        switch = self.loader.get_device(
+            vendor, "switches", selected["switch_model"]
         )
-        switch_cost = components["switches"] * switch["price"]
+        switch_cost = switch_count * switch["price"]
         breakdown["switches"] = {
             "model": switch["model"],
-            "quantity": components["switches"],
+            "quantity": switch_count,
             "unit_price": switch["price"],
             "total": switch_cost
         }
         total_cost += switch_cost
 
         # Access Points
-        ap = next(
-            d for d in catalog["access_points"]
-            if d["model"] == selected["access_point_model"]
+        ap = self.loader.get_device(
+            vendor, "access_points", selected["access_point_model"]
         )
         ap_cost = components["access_points"] * ap["price"]
         breakdown["access_points"] = {
@@ -63,9 +69,8 @@ class CostingAgent:
 
         # Firewall
         if components["firewalls"] > 0:
-            fw = next(
-                d for d in catalog["firewalls"]
-                if d["model"] == selected["firewall_model"]
+            fw = self.loader.get_device(
+                vendor, "firewalls", selected["firewall_model"]
             )
             fw_cost = components["firewalls"] * fw["price"]
             breakdown["firewalls"] = {
@@ -81,14 +86,16 @@ class CostingAgent:
 
         return round(total_cost, 2), breakdown
 
-    def calculate_cost(self, infra_package):
+    def calculate_cost(self, infra_package, topology=None):
+
+        topology = topology or {}
 
         cisco_total, cisco_breakdown = self.calculate_vendor_cost(
-            "Cisco", infra_package
+            "Cisco", infra_package, topology.get("cisco")
         )
 
         tplink_total, tplink_breakdown = self.calculate_vendor_cost(
-            "TP-Link", infra_package
+            "TP-Link", infra_package, topology.get("tplink")
         )
 
         return {
@@ -1,33 +1,69 @@
 import math
 
+from agents.topology_engine import allocate
+
+
+# Average cable run per connection type (meters)
+DROP_RUN_METERS = 30
+UPLINK_RUN_METERS = 15
+PATCH_RUN_METERS = 3
+
+# Rack units per device; each switch also gets a patch panel
+RACK_UNITS = {
+    "router": 2,
+    "firewall": 2,
+    "ids": 2,
+    "switch": 1,
+    "patch_panel": 1,
+}
+
 
 class DeploymentAgent:
 
-    def estimate(self, infra_package, cost_output):
+    def estimate(self, infra_package, cost_output, topology=None):
+        """
+        Physical build-out for the Cisco design (the one priced in the
+        project total), from the port-level topology. `topology` is the
+        allocation for that design; it is computed when not given.
+        """
 
         profile = infra_package["company_profile"]
-        design = infra_package["infrastructure_design"]
-        components = design["components"]
 
+        if topology is None:
+            topology = allocate("Cisco", infra_package)
+
+        summary = topology["summary"]
         sqft = profile["office_size_sqft"]
 
-        # Cable estimation
-        avg_cable_per_device = 30  # meters
+        # Cable estimation: desk drops and AP runs to their switch,
+        # switch uplinks to the core, patch leads between inline devices
+        inline_links = len(topology["kinds"]) - summary["switches"] - 1
 
-        total_devices = (
-            components["routers"] +
-            components["switches"] +
-            components["access_points"] +
-            components["firewalls"]
+        cable_length = (
+            (summary["drops"] + summary["access_points"]) * DROP_RUN_METERS
+            + summary["switches"] * UPLINK_RUN_METERS
+            + inline_links * PATCH_RUN_METERS
         )
-
-        cable_length = total_devices * avg_cable_per_device
         cable_type = "Fiber" if sqft > 10000 else "Cat6"
 
         # Rack estimation
-        rack_units = total_devices * 2
+        rack_units = (
+            summary["routers"] * RACK_UNITS["router"]
+            + summary["firewalls"] * RACK_UNITS["firewall"]
+            + summary["ids_systems"] * RACK_UNITS["ids"]
+            + summary["switches"]
+            * (RACK_UNITS["switch"] + RACK_UNITS["patch_panel"])
+        )
         racks_required = math.ceil(rack_units / 42)
 
+        total_devices = (
+            summary["routers"] +
+            summary["switches"] +
+            summary["access_points"] +
+            summary["firewalls"] +
+            summary["ids_systems"]
+        )
+
         # Labour estimation
         labour_hours = total_devices * 4
         labour_cost = labour_hours * 1500
@@ -46,6 +82,8 @@ class DeploymentAgent:
             "cable_type": cable_type,
             "rack_units_required": rack_units,
             "racks_required": racks_required,
+            "switch_ports_used": summary["ports_used"],
+            "switch_ports_total": summary["ports_total"],
             "estimated_labour_hours": labour_hours,
             "labour_cost": labour_cost,
             "estimated_power_kw": estimated_power_kw,
@@ -0,0 +1,302 @@
+import math
+
+from utils.canonical_profile import component_counts, project_users
+from utils.selection_validator import SELECTION_KEYS
+
+
+# Agents that can run without the LLM, and the backends they accept
+BACKENDS = ("llm", "deterministic")
+AGENTS = ("requirements", "architecture", "scalability", "insights")
+
+# Everything offline except the executive prose
+OFFLINE_BACKENDS = {
+    "requirements": "deterministic",
+    "architecture": "deterministic",
+    "scalability": "deterministic",
+    "insights": "llm",
+}
+
+# Sustained per-user bandwidth by deployment model (Mbps)
+BANDWIDTH_PER_USER = {
+    "Cloud": 8,
+    "Hybrid": 6,
+    "On-Prem": 4,
+}
+
+
+def resolve_backends(backends=None) -> dict:
+    resolved = {agent: "llm" for agent in AGENTS}
+    resolved.update(backends or {})
+
+    for agent, backend in resolved.items():
+        if agent not in AGENTS:
+            raise ValueError(f"Unknown agent '{agent}'")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}' for {agent}")
+
+    return resolved
+
+
+# ---------------------------
+# Requirement Analysis
+# ---------------------------
+
+def analyze_requirements(user_input: dict) -> dict:
+
+    num_users = user_input["num_employees"]
+    security_level = user_input["security_level"]
+    per_user = BANDWIDTH_PER_USER.get(user_input["cloud_preference"], 6)
+
+    if security_level == "High" or num_users > 500:
+        risk_profile = "High"
+    elif security_level == "Medium" or num_users > 150:
+        risk_profile = "Medium"
+    else:
+        risk_profile = "Low"
+
+    return {
+        "expected_bandwidth_mbps": num_users * per_user,
+        "redundancy_required": security_level in ["Medium", "High"],
+        "compliance_level": security_level,
+        "risk_profile": risk_profile,
+    }
+
+
+# ---------------------------
+# Cost-effectiveness Ranking
+# ---------------------------
+
+def per_unit_demand(company_profile: dict) -> dict:
+    """
+    Users and floor area each deployed unit has to carry, given the
+    quantities from component_counts.
+    """
+
+    num_users = company_profile["num_employees"]
+    office_sqft = company_profile["office_size_sqft"]
+    counts = component_counts(company_profile)
+
+    return {
+        "routers": {
+            "max_users_supported": math.ceil(num_users / counts["routers"]),
+            "coverage_sqft": math.ceil(office_sqft / counts["routers"]),
+        },
+        "switches": {
+            "max_devices_supported": math.ceil(
+                num_users / counts["switches"]
+            ),
+        },
+        "access_points": {
+            "max_users_supported": math.ceil(
+                num_users / counts["access_points"]
+            ),
+            "coverage_sqft": math.ceil(
+                office_sqft / counts["access_points"]
+            ),
+        },
+        "firewalls": {
+            "max_users_supported": num_users,
+        },
+    }
+
+
+def rank_devices(loader, vendor: str, category: str, demand: dict) -> list:
+    """
+    Devices that meet every per-unit demand, cheapest first with higher
+    throughput breaking ties. When nothing qualifies, the highest
+    capacity device is returned alone, matching SelectionValidator.
+    """
+
+    eligible = [
+        device for device in loader.sorted_by_price(vendor, category)
+        if all(device.get(field, 0) >= need for field, need in demand.items())
+    ]
+
+    if not eligible:
+        return [loader.highest_capacity(vendor, category)]
+
+    return sorted(
+        eligible,
+        key=lambda d: (d["price"], -d.get("throughput_mbps", 0)),
+    )
+
+
+def select_topology(company_profile: dict) -> str:
+    counts = component_counts(company_profile)
+
+    if company_profile["security_level"] == "High" and counts["routers"] > 1:
+        return "Mesh"
+    if counts["switches"] > 1:
+        return "Hybrid"
+    return "Star"
+
+
+def select_architecture(company_profile: dict, loader) -> dict:
+    """
+    Same shape as the architecture agent's LLM selection.
+    """
+
+    demand = per_unit_demand(company_profile)
+    selection = {"topology": select_topology(company_profile)}
+
+    for vendor, key in [("Cisco", "cisco_models"), ("TP-Link", "tplink_models")]:
+        selection[key] = {
+            SELECTION_KEYS[category]: rank_devices(
+                loader, vendor, category, category_demand
+            )[0]["model"]
+            for category, category_demand in demand.items()
+        }
+
+    return selection
+
+
+# ---------------------------
+# Scalability Forecast
+# ---------------------------
+
+def supported_users(architecture: dict, vendor_key: str, loader) -> int:
+    """
+    Head count the selected models can serve at the designed quantities.
+    """
+
+    components = architecture["components"]
+    selected = architecture["selected_models"][vendor_key]
+
+    def device(category):
+        return loader.get_device(
+            vendor_key, category, selected[SELECTION_KEYS[category]]
+        )
+
+    limits = [
+        components["routers"] * device("routers")["max_users_supported"],
+        components["switches"] * device("switches")["max_devices_supported"],
+        components["access_points"]
+        * device("access_points")["max_users_supported"],
+    ]
+    if components["firewalls"] > 0:
+        limits.append(
+            components["firewalls"]
+            * device("firewalls")["max_users_supported"]
+        )
+
+    return min(limits)
+
+
+def project_scalability(
+    company_profile: dict, architecture: dict, loader
+) -> dict:
+
+    year_users = project_users(
+        company_profile["num_employees"],
+        company_profile["growth_rate_percent"],
+    )
+    year_3_users = year_users[-1]
+
+    capacity = min(
+        supported_users(architecture, vendor_key, loader)
+        for vendor_key in ("cisco", "tplink")
+    )
+    future_counts = component_counts(
+        dict(company_profile, num_employees=year_3_users)
+    )
+    short_components = [
+        category for category in ("routers", "switches")
+        if future_counts[category] > architecture["components"][category]
+    ]
+
+    if year_3_users > capacity:
+        upgrade_reason = (
+            f"Projected {year_3_users} users in year 3 exceed the "
+            f"{capacity} users supported by the selected models."
+        )
+    elif short_components:
+        upgrade_reason = (
+            f"Projected {year_3_users} users in year 3 need additional "
+            f"{' and '.join(short_components)}."
+        )
+    else:
+        upgrade_reason = (
+            f"Current design supports the projected {year_3_users} users "
+            f"in year 3."
+        )
+
+    return {
+        "year_1_users": year_users[0],
+        "year_2_users": year_users[1],
+        "year_3_users": year_3_users,
+        "upgrade_required": year_3_users > capacity or bool(short_components),
+        "upgrade_reason": upgrade_reason,
+    }
+
+
+# ---------------------------
+# Template Insights
+# ---------------------------
+
+def summarize_insights(infra_package: dict, analysis: dict, deployment: dict):
+    """
+    Plain template text in the InsightAgent schema, for runs that must
+    not depend on the LLM.
+    """
+
+    profile = infra_package["company_profile"]
+    scalability = infra_package["scalability_projection"]
+    cost = analysis["cost_analysis"]
+    performance = analysis["performance_scores"]
+    risk = analysis["security_scores"]
+
+    cheaper = (
+        "TP-Link"
+        if cost["tplink_total_cost"] <= cost["cisco_total_cost"]
+        else "Cisco"
+    )
+    stronger = (
+        "Cisco" if performance["cisco"] >= performance["tplink"] else "TP-Link"
+    )
+    within_budget = [
+        vendor for vendor, total in [
+            ("Cisco", cost["cisco_total_cost"]),
+            ("TP-Link", cost["tplink_total_cost"]),
+        ]
+        if total <= profile["budget"]
+    ]
+
+    if within_budget:
+        choice = stronger if stronger in within_budget else within_budget[0]
+        recommendation = (
+            f"Proceed with {choice}, which fits the budget of "
+            f"₹{profile['budget']:,}."
+        )
+    else:
+        recommendation = (
+            f"Neither vendor fits the budget of ₹{profile['budget']:,}; "
+            f"{cheaper} is the closest option."
+        )
+
+    return {
+        "executive_summary": (
+            f"Design for {profile['num_employees']} employees across "
+            f"{profile['office_size_sqft']:,} sqft with a "
+            f"{infra_package['infrastructure_design']['topology']} topology."
+        ),
+        "cost_analysis_insight": (
+            f"Cisco totals ₹{cost['cisco_total_cost']:,} and TP-Link "
+            f"₹{cost['tplink_total_cost']:,}; {cheaper} is cheaper by "
+            f"₹{cost['cost_difference']:,}."
+        ),
+        "performance_insight": (
+            f"Performance scores are {performance['cisco']} for Cisco and "
+            f"{performance['tplink']} for TP-Link."
+        ),
+        "risk_insight": (
+            f"Risk scores are {risk['cisco']} for Cisco and "
+            f"{risk['tplink']} for TP-Link."
+        ),
+        "scalability_insight": scalability.get("upgrade_reason", ""),
+        "deployment_insight": (
+            f"{deployment['cable_length_meters']} m of "
+            f"{deployment['cable_type']} cabling and about "
+            f"{deployment['estimated_labour_hours']} labour hours."
+        ),
+        "final_recommendation": recommendation,
+    }
@@ -1,12 +1,40 @@
 # agents/insight_agent.py
 
+from agents import deterministic_engine
+
+
+# Response fields in the order the model is asked to write them
+INSIGHT_FIELDS = [
+    ("executive_summary", "Executive Summary"),
+    ("cost_analysis_insight", "Cost Analysis Insight"),
+    ("performance_insight", "Performance Insight"),
+    ("risk_insight", "Risk Insight"),
+    ("scalability_insight", "Scalability Outlook"),
+    ("deployment_insight", "Deployment Intelligence"),
+    ("final_recommendation", "Final Recommendation"),
+]
+
+
 class InsightAgent:
 
-    def __init__(self, llm):
+    def __init__(self, llm, backend: str = "llm", on_field=None):
         self.llm = llm
+        self.backend = backend
+
+        # Called with (key, text) as each insight field becomes available
+        self.on_field = on_field
 
     def generate(self, infra_package, analysis, deployment):
 
+        if self.backend == "deterministic":
+            insights = deterministic_engine.summarize_insights(
+                infra_package, analysis, deployment
+            )
+            if self.on_field is not None:
+                for key, value in insights.items():
+                    self.on_field(key, value)
+            return insights
+
         system_prompt = """
 You are a Senior Enterprise Infrastructure Consultant.
 Analyze the structured infrastructure data and generate
@@ -38,4 +66,13 @@ Deployment Data:
 Generate structured strategic insights.
 """
 
-        return self.llm.call(system_prompt, user_prompt)
+        if self.on_field is None or not hasattr(self.llm, "stream"):
+            return self.llm.call(system_prompt, user_prompt)
+
+        # Stream so the first fields can be shown while the rest generate
+        insights = {}
+        for key, value in self.llm.stream(system_prompt, user_prompt):
+            insights[key] = value
+            self.on_field(key, value)
+
+        return insights
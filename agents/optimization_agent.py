@@ -1,10 +1,11 @@
-from utils.catalog_loader import CatalogLoader
+from utils.catalog_loader import get_catalog
 
 
 class OptimizationAgent:
 
     def __init__(self):
-        self.loader = CatalogLoader()
+        self.loader = get_catalog()
+        self.bom_optimizer = None
 
         self.performance_threshold = 55
         self.risk_threshold = 30
@@ -56,11 +57,7 @@ class OptimizationAgent:
 
     def downgrade_router(self, vendor, current_model):
 
-        catalog = self.loader.get_vendor_catalog(vendor)
-        devices = sorted(
-            catalog["routers"],
-            key=lambda x: x["price"]
-        )
+        devices = self.loader.sorted_by_price(vendor, "routers")
 
         models = [d["model"] for d in devices]
 
@@ -71,7 +68,18 @@ class OptimizationAgent:
 
         return current_model
 
-    def modify_design(self, infra_package, analysis):
+    def search(self, infra_package):
+        """
+        Pareto frontier of full bills of materials for both vendors.
+        """
+        # NumPy is only needed once a design has to be re-optimised
+        if self.bom_optimizer is None:
+            from agents.bom_optimizer import BOMOptimizer
+            self.bom_optimizer = BOMOptimizer()
+
+        return self.bom_optimizer.search(infra_package)
+
+    def modify_design(self, infra_package, analysis, search=None):
 
         design = infra_package["infrastructure_design"]
 
@@ -80,18 +88,14 @@ class OptimizationAgent:
             design["topology"]
         )
 
-        # Downgrade Cisco router
-        design["selected_models"]["cisco"]["router_model"] = \
-            self.downgrade_router(
-                "Cisco",
-                design["selected_models"]["cisco"]["router_model"]
-            )
+        # Replace every model with the best budget-feasible combination,
+        # or the cheapest one when nothing fits the budget
+        if search is None:
+            search = self.search(infra_package)
 
-        # Downgrade TP-Link router
-        design["selected_models"]["tplink"]["router_model"] = \
-            self.downgrade_router(
-                "TP-Link",
-                design["selected_models"]["tplink"]["router_model"]
+        for vendor_key, result in search.items():
+            design["selected_models"][vendor_key] = dict(
+                result["best"]["models"]
             )
 
         return infra_package
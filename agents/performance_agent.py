@@ -1,14 +1,49 @@
-from utils.catalog_loader import CatalogLoader
+from agents.topology_engine import allocate
+from utils.catalog_loader import get_catalog
 
 
 class PerformanceAgent:
 
     def __init__(self):
-        self.loader = CatalogLoader()
+        self.loader = get_catalog()
 
-    def evaluate_vendor(self, vendor, infra_package):
+    # ---------------------------
+    # Per-device Contributions
+    # ---------------------------
 
-        catalog = self.loader.get_vendor_catalog(vendor)
+    @staticmethod
+    def router_points(router):
+        return router.get("throughput_mbps", 0) * 0.4
+
+    @staticmethod
+    def switch_points(switch):
+        # Use ports if max_devices not present
+        switch_capacity = (
+            switch.get("max_devices")
+            or switch.get("ports")
+            or 0
+        )
+        return switch_capacity * 0.1
+
+    @staticmethod
+    def access_point_points(ap):
+        return ap.get("max_devices", 0) * 0.05
+
+    @staticmethod
+    def uplink_factor(topology):
+        """
+        Share of the switch contribution that survives uplink congestion.
+        The allocator adds switches until every uplink fits its load, so
+        this is 1.0 unless a single AP alone exceeds its uplink.
+        """
+        peak = topology["summary"]["peak_utilization"]
+        return 1.0 if peak <= 1 else 1 / peak
+
+    @staticmethod
+    def normalize(points):
+        return min(points / 10, 100)
+
+    def evaluate_vendor(self, vendor, infra_package, topology=None):
 
         design = infra_package["infrastructure_design"]
         components = design["components"]
@@ -19,45 +54,39 @@ class PerformanceAgent:
         score = 0
 
         # Router performance
-        router = next(
-            d for d in catalog["routers"]
-            if d["model"] == selected["router_model"]
+        router = self.loader.get_device(
+            vendor, "routers", selected["router_model"]
         )
+        score += self.router_points(router)
 
-        throughput = router.get("throughput_mbps", 0)
-        score += throughput * 0.4
-
-        # Switch performance (use ports if max_devices not present)
-        switch = next(
-            d for d in catalog["switches"]
-            if d["model"] == selected["switch_model"]
-        )
-
-        switch_capacity = (
-            switch.get("max_devices")
-            or switch.get("ports")
-            or 0
+        # Switch performance
+        switch = self.loader.get_device(
+            vendor, "switches", selected["switch_model"]
         )
-
-        score += switch_capacity * 0.1
+        if topology is None:
+            topology = allocate(vendor, infra_package)
+        score += self.switch_points(switch) * self.uplink_factor(topology)
 
         # Access Point performance
-        ap = next(
-            d for d in catalog["access_points"]
-            if d["model"] == selected["access_point_model"]
+        ap = self.loader.get_device(
+            vendor, "access_points", selected["access_point_model"]
         )
-
-        ap_capacity = ap.get("max_devices", 0)
-        score += ap_capacity * 0.05
+        score += self.access_point_points(ap)
 
         # Normalize score
-        score = min(score / 10, 100)
+        score = self.normalize(score)
 
         return round(score, 2)
 
-    def evaluate(self, infra_package):
+    def evaluate(self, infra_package, topology=None):
+
+        topology = topology or {}
 
         return {
-            "cisco": self.evaluate_vendor("Cisco", infra_package),
-            "tplink": self.evaluate_vendor("TP-Link", infra_package)
+            "cisco": self.evaluate_vendor(
+                "Cisco", infra_package, topology.get("cisco")
+            ),
+            "tplink": self.evaluate_vendor(
+                "TP-Link", infra_package, topology.get("tplink")
+            )
         }
@@ -1,4 +1,16 @@
-def process(user_input: dict, llm) -> dict:
+from agents import deterministic_engine
+from utils.catalog_loader import get_catalog
+from utils.canonical_profile import canonicalize_profile, reapply_requirements
+
+
+def process(user_input: dict, llm, backend: str = "llm") -> dict:
+
+    if backend == "deterministic":
+        return deterministic_engine.analyze_requirements(user_input)
+
+    # Prompt on the equivalence class so nearby slider values share cached
+    # responses; the bandwidth estimate is rescaled to the exact head count
+    canonical_input = canonicalize_profile(user_input, get_catalog())
 
     system_prompt = """
     You are a Network Requirement Analysis Agent.
@@ -8,7 +20,7 @@ def process(user_input: dict, llm) -> dict:
 
     user_prompt = f"""
     Business Input:
-    {user_input}
+    {canonical_input}
 
     Return JSON:
     {{
@@ -19,4 +31,6 @@ def process(user_input: dict, llm) -> dict:
     }}
     """
 
-    return llm.call(system_prompt, user_prompt)
+    requirements = llm.call(system_prompt, user_prompt)
+
+    return reapply_requirements(requirements, user_input, canonical_input)
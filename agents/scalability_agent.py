@@ -1,4 +1,23 @@
-def project(company_profile: dict, infrastructure_design: dict, llm) -> dict:
+from agents import deterministic_engine
+from utils.catalog_loader import get_catalog
+from utils.canonical_profile import canonicalize_profile, reapply_scalability
+
+
+def project(
+    company_profile: dict,
+    infrastructure_design: dict,
+    llm,
+    backend: str = "llm",
+) -> dict:
+
+    if backend == "deterministic":
+        return deterministic_engine.project_scalability(
+            company_profile, infrastructure_design, get_catalog()
+        )
+
+    # The LLM judges the upgrade need for the profile's equivalence class;
+    # the yearly user counts are recomputed from the exact growth rate
+    canonical_profile = canonicalize_profile(company_profile, get_catalog())
 
     system_prompt = """
     You are a Scalability Forecast Agent.
@@ -8,7 +27,7 @@ def project(company_profile: dict, infrastructure_design: dict, llm) -> dict:
 
     user_prompt = f"""
     Company Profile:
-    {company_profile}
+    {canonical_profile}
 
     Infrastructure Design:
     {infrastructure_design}
@@ -25,4 +44,6 @@ def project(company_profile: dict, infrastructure_design: dict, llm) -> dict:
     }}
     """
 
-    return llm.call(system_prompt, user_prompt)
+    scalability = llm.call(system_prompt, user_prompt)
+
+    return reapply_scalability(scalability, company_profile)
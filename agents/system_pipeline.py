@@ -1,8 +1,15 @@
+import contextvars
 import copy
+import queue
+import threading
+import time
+from contextlib import nullcontext
 
 from agents import requirement_agent
 from agents import architecture_agent
 from agents import scalability_agent
+from agents import deterministic_engine
+from agents import topology_engine
 from agents.costing_agent import CostingAgent
 from agents.performance_agent import PerformanceAgent
 from agents.security_agent import SecurityAgent
@@ -10,16 +17,13 @@ from agents.optimization_agent import OptimizationAgent
 from agents.deployment_agent import DeploymentAgent
 from agents.insight_agent import InsightAgent
 
-from utils.network_diagram import generate_network_diagram
-from utils.pdf_report import generate_pdf
+from utils import memory_profile, sampling_profiler, tracing
+from utils.phase_scheduler import Phase, PhaseScheduler
+from utils.result_store import input_hash
 
 
-def run_full_pipeline(user_input: dict, llm):
-
-    # -------------------------
-    # Phase 1: Business Profile
-    # -------------------------
-    company_profile = {
+def build_company_profile(user_input: dict) -> dict:
+    return {
         "num_employees": user_input["num_employees"],
         "office_size_sqft": user_input["office_size_sqft"],
         "security_level": user_input["security_level"],
@@ -28,136 +32,438 @@ def run_full_pipeline(user_input: dict, llm):
         "budget": user_input["budget"],
     }
 
+
+def build_phases(
+    user_input: dict,
+    llm,
+    backends=None,
+    render: bool = True,
+    on_insight=None,
+):
+    """
+    Declare the pipeline as a dependency graph. Each phase only waits on
+    the outputs it actually consumes, so the requirement, architecture and
+    analysis work overlap wherever the data allows.
+
+    `backends` picks "llm" or "deterministic" per agent (see
+    deterministic_engine.AGENTS); unspecified agents use the LLM. With
+    render=False the diagram phase is left out. `on_insight` is called
+    with (key, text) as each insight field streams in; it runs on a
+    worker thread.
+
+    The PDF report is not a phase: it is built afterwards, on demand or
+    in the background, by utils.report_jobs.
+    """
+
+    backends = deterministic_engine.resolve_backends(backends)
+
     # -------------------------
-    # Phase 2: Architecture Generation
+    # Phase 1: Business Profile
     # -------------------------
-    requirements = requirement_agent.process(user_input, llm)
+    company_profile = build_company_profile(user_input)
 
-    architecture = architecture_agent.design(
-        requirements,
-        company_profile,
+    cost_agent = CostingAgent()
+    performance_agent = PerformanceAgent()
+    security_agent = SecurityAgent()
+    optimizer = OptimizationAgent()
+    deployment_agent = DeploymentAgent()
+    insight_agent = InsightAgent(
         llm,
+        backend=backends["insights"],
+        on_field=on_insight,
     )
 
-    scalability = scalability_agent.project(
-        company_profile,
-        architecture,
-        llm,
-    )
+    # -------------------------
+    # Phase 2: Architecture Generation
+    # -------------------------
+    def requirements():
+        return requirement_agent.process(
+            user_input, llm, backend=backends["requirements"]
+        )
 
-    infra_package = {
-        "company_profile": company_profile,
-        "infrastructure_design": {
-            "topology": architecture["topology"],
-            "components": architecture["components"],
-            "cloud_architecture": architecture["cloud_architecture"],
-            "redundancy": architecture["redundancy"],
-            "selected_models": architecture["selected_models"],
-        },
-        "scalability_projection": scalability,
-    }
+    # Model selection only reads the company profile, so it does not wait
+    # on the requirement analysis
+    def architecture():
+        return architecture_agent.design(
+            None, company_profile, llm, backend=backends["architecture"]
+        )
+
+    def scalability(architecture):
+        return scalability_agent.project(
+            company_profile,
+            architecture,
+            llm,
+            backend=backends["scalability"],
+        )
+
+    def infra(architecture, scalability):
+        return {
+            "company_profile": company_profile,
+            "infrastructure_design": {
+                "topology": architecture["topology"],
+                "components": architecture["components"],
+                "cloud_architecture": architecture["cloud_architecture"],
+                "redundancy": architecture["redundancy"],
+                "selected_models": architecture["selected_models"],
+            },
+            "scalability_projection": scalability,
+        }
 
     # -------------------------
     # Phase 3: Multi-Agent Analysis
     # -------------------------
-    cost_agent = CostingAgent()
-    performance_agent = PerformanceAgent()
-    security_agent = SecurityAgent()
+    def topology(infra):
+        return topology_engine.allocate_all(infra)
 
-    cost_output = cost_agent.calculate_cost(infra_package)
-    performance_output = performance_agent.evaluate(infra_package)
-    security_output = security_agent.evaluate(infra_package)
+    def cost(infra, topology):
+        return cost_agent.calculate_cost(infra, topology)
 
-    initial_analysis = {
-        "cost_analysis": cost_output,
-        "performance_scores": performance_output,
-        "security_scores": security_output,
-    }
+    def performance(infra, topology):
+        return performance_agent.evaluate(infra, topology)
 
-    initial_design = copy.deepcopy(infra_package)
+    def security(infra):
+        return security_agent.evaluate(infra)
 
     # -------------------------
     # Phase 4: Optimization
     # -------------------------
-    optimizer = OptimizationAgent()
+    def optimization(infra, topology, cost, performance, security):
 
-    decision = optimizer.evaluate(
-        infra_package,
-        initial_analysis,
-    )
+        infra_package = infra
+
+        initial_analysis = {
+            "cost_analysis": cost,
+            "performance_scores": performance,
+            "security_scores": security,
+        }
 
-    if decision["optimization_needed"]:
+        initial_design = copy.deepcopy(infra_package)
 
-        infra_package = optimizer.modify_design(
+        decision = optimizer.evaluate(
             infra_package,
             initial_analysis,
         )
 
-        # Re-run analysis after optimization
-        cost_output = cost_agent.calculate_cost(infra_package)
-        performance_output = performance_agent.evaluate(infra_package)
-        security_output = security_agent.evaluate(infra_package)
+        bom_search = None
 
-    optimized_analysis = {
-        "cost_analysis": cost_output,
-        "performance_scores": performance_output,
-        "security_scores": security_output,
-    }
+        if decision["optimization_needed"]:
+
+            bom_search = optimizer.search(infra_package)
+
+            infra_package = optimizer.modify_design(
+                infra_package,
+                initial_analysis,
+                bom_search,
+            )
+
+            # Re-run analysis after optimization
+            topology = topology_engine.allocate_all(infra_package)
+            cost = cost_agent.calculate_cost(infra_package, topology)
+            performance = performance_agent.evaluate(infra_package, topology)
+            security = security_agent.evaluate(infra_package)
+
+        return {
+            "infra": infra_package,
+            "initial_design": initial_design,
+            "initial_analysis": initial_analysis,
+            "decision": decision,
+            "bom_search": bom_search,
+            "topology": topology,
+            "optimized_analysis": {
+                "cost_analysis": cost,
+                "performance_scores": performance,
+                "security_scores": security,
+            },
+        }
 
     # -------------------------
     # Phase 5: Deployment Estimation
     # -------------------------
-    deployment_agent = DeploymentAgent()
-    deployment_output = deployment_agent.estimate(
-        infra_package,
-        cost_output,
-    )
+    def deployment(optimization):
+        return deployment_agent.estimate(
+            optimization["infra"],
+            optimization["optimized_analysis"]["cost_analysis"],
+            optimization["topology"]["cisco"],
+        )
 
-        # -------------------------
+    # -------------------------
     # Phase 6: AI Insight Generation
     # -------------------------
-
-    insight_agent = InsightAgent(llm)
-
-    insights = insight_agent.generate(
-        infra_package,
-        optimized_analysis,
-        deployment_output
-    )
+    def insights(optimization, deployment):
+        return insight_agent.generate(
+            optimization["infra"],
+            optimization["optimized_analysis"],
+            deployment,
+        )
 
     # -------------------------
     # Phase 7: Visualization
     # -------------------------
+    def diagram(optimization):
+        # matplotlib is only loaded when a raster diagram is wanted
+        from utils.network_diagram import generate_network_diagram
 
-    diagram = generate_network_diagram(infra_package)
+        return generate_network_diagram(
+            optimization["infra"],
+            topology=optimization["topology"]["cisco"],
+        )
 
-    # -------------------------
-    # Phase 8: PDF Report Generation
-    # -------------------------
+    phases = [
+        Phase("requirements", requirements),
+        Phase("architecture", architecture),
+        Phase("scalability", scalability, requires=("architecture",)),
+        Phase("infra", infra, requires=("architecture", "scalability")),
+        Phase("topology", topology, requires=("infra",)),
+        Phase("cost", cost, requires=("infra", "topology")),
+        Phase("performance", performance, requires=("infra", "topology")),
+        Phase("security", security, requires=("infra",)),
+        Phase(
+            "optimization",
+            optimization,
+            requires=("infra", "topology", "cost", "performance", "security"),
+        ),
+        Phase("deployment", deployment, requires=("optimization",)),
+        Phase(
+            "insights",
+            insights,
+            requires=("optimization", "deployment"),
+        ),
+    ]
+
+    if render:
+        phases.append(Phase("diagram", diagram, requires=("optimization",)))
+
+    return phases
 
-    pdf_buffer = generate_pdf(
-        infra_package,
-        optimized_analysis,
-        deployment_output,
-        insights,
-        diagram
-    )
 
+def assemble_result(outputs: dict, timings: dict, trace=None) -> dict:
+
+    optimization = outputs["optimization"]
+    optimized_analysis = optimization["optimized_analysis"]
 
     # -------------------------
     # Final Response Package
     # -------------------------
     return {
-        "infra": infra_package,
-        "cost": cost_output,
-        "performance": performance_output,
-        "security": security_output,
-        "deployment": deployment_output,
-        "diagram": diagram,
-        "pdf": pdf_buffer,
-        "initial_design": initial_design,
-        "initial_analysis": initial_analysis,
+        "infra": optimization["infra"],
+        "requirements": outputs["requirements"],
+        "cost": optimized_analysis["cost_analysis"],
+        "performance": optimized_analysis["performance_scores"],
+        "security": optimized_analysis["security_scores"],
+        "deployment": outputs["deployment"],
+        "diagram": outputs.get("diagram"),
+        "initial_design": optimization["initial_design"],
+        "initial_analysis": optimization["initial_analysis"],
         "optimized_analysis": optimized_analysis,
-        "optimization_decision": decision,
-        "insights": insights,
+        "optimization_decision": optimization["decision"],
+        "bom_search": optimization["bom_search"],
+        "topology": optimization["topology"],
+        "insights": outputs["insights"],
+        "timings": timings,
+        "trace": trace.to_dict() if trace is not None else None,
     }
+
+
+def _make_scheduler(user_input, llm, max_workers, backends, render,
+                    on_insight, profile_memory):
+
+    # tracemalloc cannot tell threads apart, so phases run one at a time
+    # while memory is being attributed to them
+    if profile_memory:
+        max_workers = 1
+
+    return PhaseScheduler(
+        build_phases(user_input, llm, backends, render, on_insight),
+        max_workers=max_workers,
+    )
+
+
+def _execute(scheduler, user_input, profile_memory, profile_cpu,
+             on_phase_done=None) -> dict:
+
+    memory = (
+        memory_profile.MemoryProfiler() if profile_memory else nullcontext()
+    )
+    cpu = (
+        sampling_profiler.SamplingProfiler(input_hash(user_input))
+        if profile_cpu else nullcontext()
+    )
+
+    # Every phase and LLM call nests under this span; the tree is returned
+    # as result["trace"]
+    with memory, cpu, tracing.span("pipeline") as trace:
+        outputs, timings = scheduler.run(on_phase_done=on_phase_done)
+
+    result = assemble_result(outputs, timings, trace)
+    result["memory"] = memory.report(result) if profile_memory else None
+    result["profile"] = cpu.summary() if profile_cpu else None
+
+    return result
+
+
+def run_full_pipeline(
+    user_input: dict,
+    llm,
+    max_workers: int = 4,
+    backends=None,
+    render: bool = True,
+    on_insight=None,
+    profile_memory: bool = None,
+    profile_cpu: bool = None,
+):
+    """
+    Run every phase and return the result package.
+
+    With profile_memory (default: the NETARCHITECT_PROFILE_MEMORY env
+    var) result["memory"] holds per-phase allocations, peak RSS and the
+    result's retained size. With profile_cpu (default:
+    NETARCHITECT_PROFILE_CPU) each phase is sampled into a collapsed-stack
+    file named by input hash and phase, listed in result["profile"].
+    """
+
+    if profile_memory is None:
+        profile_memory = memory_profile.ENABLED
+    if profile_cpu is None:
+        profile_cpu = sampling_profiler.ENABLED
+
+    scheduler = _make_scheduler(
+        user_input, llm, max_workers, backends, render, on_insight,
+        profile_memory,
+    )
+
+    return _execute(scheduler, user_input, profile_memory, profile_cpu)
+
+
+# ---------------------------
+# Progress Events
+# ---------------------------
+
+# Event kinds, in the order they normally arrive
+EVENT_KINDS = (
+    "requirements",
+    "architecture",
+    "analysis",
+    "optimization",
+    "deployment",
+    "insight_field",
+    "insights",
+    "diagram",
+    "result",
+)
+
+# Phases whose output is forwarded as an event of the same kind
+EVENT_PHASES = ("requirements", "architecture", "optimization",
+                "deployment", "insights", "diagram")
+
+# The "analysis" event fires once all of these have finished
+ANALYSIS_PHASES = ("cost", "performance", "security")
+
+
+class PipelineEvent:
+    """
+    One step of pipeline progress. `kind` is one of EVENT_KINDS, `data`
+    the matching output and `elapsed_ms` the time since the run started.
+
+    - architecture: model selection, topology and component counts
+    - analysis: {"infra", "cost", "performance", "security"} for the
+      initial design, before any optimisation
+    - optimization: the optimization phase output (decision, optimized
+      analysis, final infra and topology)
+    - insight_field: {"key", "text"} for one insight as it streams in,
+      before the complete "insights" event
+    - result: the full run_full_pipeline dictionary; always last
+    """
+
+    def __init__(self, kind: str, data, elapsed_ms: float):
+        self.kind = kind
+        self.data = data
+        self.elapsed_ms = round(elapsed_ms, 2)
+
+    def __repr__(self):
+        return f"PipelineEvent({self.kind!r}, {self.elapsed_ms} ms)"
+
+
+def iter_pipeline(
+    user_input: dict,
+    llm,
+    max_workers: int = 4,
+    backends=None,
+    render: bool = True,
+    on_insight=None,
+    profile_memory: bool = None,
+    profile_cpu: bool = None,
+):
+    """
+    Same run as run_full_pipeline, but yields a PipelineEvent as each
+    stage becomes available, ending with a "result" event. A failure in
+    any phase is raised from the generator.
+
+    The graph runs on a background thread; the consumer sees events on
+    its own thread, so UI code can draw from them directly. Insights are
+    always streamed and arrive as "insight_field" events; `on_insight`,
+    if given, is still called on the worker thread as well. Abandoning
+    the generator early does not cancel phases already running.
+    """
+
+    if profile_memory is None:
+        profile_memory = memory_profile.ENABLED
+    if profile_cpu is None:
+        profile_cpu = sampling_profiler.ENABLED
+
+    events = queue.Queue()
+    start = time.perf_counter()
+    finished = {}
+
+    def emit(kind, data):
+        elapsed = (time.perf_counter() - start) * 1000
+        events.put(PipelineEvent(kind, data, elapsed))
+
+    def insight_field(key, text):
+        emit("insight_field", {"key": key, "text": text})
+        if on_insight is not None:
+            on_insight(key, text)
+
+    scheduler = _make_scheduler(
+        user_input, llm, max_workers, backends, render, insight_field,
+        profile_memory,
+    )
+
+    def phase_done(name, output, ms):
+        finished[name] = output
+
+        if name in EVENT_PHASES:
+            emit(name, output)
+
+        if name in ANALYSIS_PHASES and all(
+            phase in finished for phase in ANALYSIS_PHASES
+        ):
+            emit("analysis", {
+                "infra": finished["infra"],
+                **{phase: finished[phase] for phase in ANALYSIS_PHASES},
+            })
+
+    def run():
+        try:
+            emit("result", _execute(
+                scheduler, user_input, profile_memory, profile_cpu,
+                phase_done,
+            ))
+        except BaseException as e:
+            events.put(e)
+
+    # Run in a copy of the caller's context so the pipeline span nests
+    # under any span the caller has open
+    threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(run,),
+        name="pipeline",
+        daemon=True,
+    ).start()
+
+    while True:
+        event = events.get()
+        if isinstance(event, BaseException):
+            raise event
+        yield event
+        if event.kind == "result":
+            return
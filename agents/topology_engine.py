@@ -0,0 +1,212 @@
+import math
+
+from agents.deterministic_engine import BANDWIDTH_PER_USER
+from utils.catalog_loader import get_catalog, normalize_vendor
+
+
+# Ports on every switch kept free for its uplink
+UPLINK_PORTS = 1
+
+# Access ports are gigabit; used for the nominal oversubscription ratio
+ACCESS_PORT_MBPS = 1000
+
+# Share of each user's bandwidth assumed to move over Wi-Fi rather than
+# the desk drop
+WIRELESS_SHARE = 0.5
+
+
+def _distribute(total: int, buckets: int) -> list:
+    base, extra = divmod(total, buckets)
+    return [base + (1 if i < extra else 0) for i in range(buckets)]
+
+
+def _pack_drops(drops: int, capacities: list) -> list:
+    """
+    Spread `drops` over switches with the given free capacities, as evenly
+    as the capacities allow. Returns None when they do not all fit.
+    """
+
+    if sum(capacities) < drops:
+        return None
+
+    target = math.ceil(drops / len(capacities))
+    assigned = []
+    remaining = drops
+
+    for capacity in capacities:
+        take = min(capacity, target, remaining)
+        assigned.append(take)
+        remaining -= take
+
+    # Whatever did not fit under the even share goes where there is room
+    for i, capacity in enumerate(capacities):
+        if remaining == 0:
+            break
+        take = min(capacity - assigned[i], remaining)
+        assigned[i] += take
+        remaining -= take
+
+    return assigned
+
+
+def _assign(switches, access_points, drops, port_limit, uplink_mbps,
+            ap_mbps, drop_mbps):
+    """
+    APs spread round-robin for even wireless coverage, then drops packed
+    into whatever ports and uplink bandwidth each switch has left.
+    """
+
+    aps = _distribute(access_points, switches)
+
+    capacities = []
+    for ap_count in aps:
+        free_ports = port_limit - ap_count
+        free_mbps = uplink_mbps - ap_count * ap_mbps
+        # An AP busier than an uplink on its own still needs a switch;
+        # it just gets that switch to itself
+        if free_ports < 0 or (free_mbps < 0 and ap_count > 1):
+            return None
+        if drop_mbps > 0:
+            free_ports = max(0, min(free_ports, int(free_mbps // drop_mbps)))
+        capacities.append(free_ports)
+
+    packed = _pack_drops(drops, capacities)
+    if packed is None:
+        return None
+
+    return aps, packed
+
+
+def allocate(vendor: str, infra_package: dict,
+             switch_model: str = None) -> dict:
+    """
+    Wire one vendor's design: router(s) -> firewall -> IDS -> switches,
+    with every AP and user drop bin-packed onto a switch port subject to
+    the switch's port count and uplink throughput.
+
+    The design's switch count is used when it is enough; otherwise
+    switches are added until everything fits. APs and drops are kept as
+    per-switch counts, so the cost is linear in the number of switches
+    rather than in the number of drops.
+
+    The result is a parent-indexed adjacency: node i hangs off
+    parent[i] (-1 for the root), with kinds[i] naming the device.
+    summary["switches"] is the number of switches to buy. `switch_model`
+    wires a candidate model in place of the selected one.
+    """
+
+    loader = get_catalog()
+
+    profile = infra_package["company_profile"]
+    design = infra_package["infrastructure_design"]
+    components = design["components"]
+
+    vendor_key = normalize_vendor(vendor)
+    selected = design["selected_models"][vendor_key]
+    switch = loader.get_device(
+        vendor, "switches", switch_model or selected["switch_model"]
+    )
+
+    num_users = profile["num_employees"]
+    access_points = components["access_points"]
+    per_user = BANDWIDTH_PER_USER.get(profile["cloud_preference"], 6)
+
+    port_limit = switch["ports"] - UPLINK_PORTS
+    uplink_mbps = switch["throughput_mbps"]
+
+    ap_users = math.ceil(num_users / access_points) if access_points else 0
+    ap_mbps = ap_users * per_user * WIRELESS_SHARE
+    drop_mbps = per_user * (1 - WIRELESS_SHARE)
+
+    # Lower bound from ports and bandwidth; integrality may need a few more
+    total_mbps = access_points * ap_mbps + num_users * drop_mbps
+    switches = max(
+        1,
+        components["switches"],
+        math.ceil((access_points + num_users) / port_limit),
+        min(
+            math.ceil(total_mbps / uplink_mbps),
+            access_points + math.ceil(num_users / port_limit),
+        ),
+    )
+
+    assignment = _assign(
+        switches, access_points, num_users,
+        port_limit, uplink_mbps, ap_mbps, drop_mbps,
+    )
+    while assignment is None:
+        switches += 1
+        assignment = _assign(
+            switches, access_points, num_users,
+            port_limit, uplink_mbps, ap_mbps, drop_mbps,
+        )
+
+    # ---------------------------
+    # Adjacency
+    # ---------------------------
+    kinds = ["router"]
+    parent = [-1]
+
+    if components["firewalls"] > 0:
+        kinds.append("firewall")
+        parent.append(len(kinds) - 2)
+    if components.get("ids_systems", 0) > 0:
+        kinds.append("ids")
+        parent.append(len(kinds) - 2)
+
+    core = len(kinds) - 1
+
+    switch_rows = []
+    peak_utilization = 0.0
+    peak_oversubscription = 0.0
+
+    for ap_count, drop_count in zip(*assignment):
+        kinds.append("switch")
+        parent.append(core)
+
+        access_ports = ap_count + drop_count
+        load_mbps = ap_count * ap_mbps + drop_count * drop_mbps
+        utilization = load_mbps / uplink_mbps
+        oversubscription = access_ports * ACCESS_PORT_MBPS / uplink_mbps
+
+        peak_utilization = max(peak_utilization, utilization)
+        peak_oversubscription = max(peak_oversubscription, oversubscription)
+
+        switch_rows.append({
+            "node": len(kinds) - 1,
+            "access_points": ap_count,
+            "drops": drop_count,
+            "ports_used": access_ports + UPLINK_PORTS,
+            "load_mbps": round(load_mbps, 2),
+            "utilization": round(utilization, 3),
+        })
+
+    return {
+        "vendor": vendor_key,
+        "switch_model": switch["model"],
+        "ports_per_switch": switch["ports"],
+        "uplink_mbps": uplink_mbps,
+        "kinds": kinds,
+        "parent": parent,
+        "switches": switch_rows,
+        "summary": {
+            "routers": components["routers"],
+            "firewalls": components["firewalls"],
+            "ids_systems": components.get("ids_systems", 0),
+            "switches": switches,
+            "switches_added": max(0, switches - components["switches"]),
+            "access_points": access_points,
+            "drops": num_users,
+            "ports_used": sum(row["ports_used"] for row in switch_rows),
+            "ports_total": switches * switch["ports"],
+            "peak_utilization": round(peak_utilization, 3),
+            "oversubscription_ratio": round(peak_oversubscription, 1),
+        },
+    }
+
+
+def allocate_all(infra_package: dict) -> dict:
+    return {
+        "cisco": allocate("Cisco", infra_package),
+        "tplink": allocate("TP-Link", infra_package),
+    }
@@ -0,0 +1,180 @@
+"""
+Deterministic stand-in for the Groq API, for benchmarks and load tests.
+
+answer() reads the structured data embedded in each agent's prompt and
+replies with what the deterministic engine would choose, so a run with
+the fake exercises the same catalog, optimisation and rendering work as
+a real one. FakeLLMHandler plugs answer() into LLMHandler below its HTTP
+layer: caching, retries, JSON extraction, streaming and usage accounting
+all run as normal, only the network is skipped.
+
+    from benchmarks.fake_llm import FakeLLMHandler
+    llm = FakeLLMHandler(latency_ms=300)
+"""
+
+import ast
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agents import deterministic_engine
+from models.json_stream import find_object_bounds
+from models.llm_cache import LLMResponseCache
+from models.llm_handler import LLMHandler
+from utils.catalog_loader import get_catalog
+
+
+# Characters per streamed chunk, roughly a few tokens as Groq sends them
+STREAM_CHUNK_CHARS = 16
+
+
+def _embedded(prompt: str, label: str):
+    """
+    The Python literal printed after `label` in an agent prompt.
+    """
+
+    start, end = find_object_bounds(prompt, prompt.index(label))
+    return ast.literal_eval(prompt[start:end])
+
+
+def answer(system_prompt: str, user_prompt: str) -> dict:
+    """
+    The JSON object a well-behaved model would return for this prompt.
+    """
+
+    if "Requirement Analysis" in system_prompt:
+        profile = _embedded(user_prompt, "Business Input:")
+        return deterministic_engine.analyze_requirements(profile)
+
+    if "Model Selection" in system_prompt:
+        profile = _embedded(user_prompt, "Company Profile:")
+        return deterministic_engine.select_architecture(profile, get_catalog())
+
+    if "Scalability Forecast" in system_prompt:
+        return deterministic_engine.project_scalability(
+            _embedded(user_prompt, "Company Profile:"),
+            _embedded(user_prompt, "Infrastructure Design:"),
+            get_catalog(),
+        )
+
+    if "Infrastructure Consultant" in system_prompt:
+        return deterministic_engine.summarize_insights(
+            _embedded(user_prompt, "Infrastructure Data:"),
+            _embedded(user_prompt, "Analysis Data:"),
+            _embedded(user_prompt, "Deployment Data:"),
+        )
+
+    raise ValueError("Fake LLM got a prompt it does not recognise")
+
+
+def usage(system_prompt: str, user_prompt: str, content: str,
+          latency_ms: float) -> dict:
+    # About four characters per token, as for English text
+    return {
+        "prompt_tokens": (len(system_prompt) + len(user_prompt)) // 4,
+        "completion_tokens": len(content) // 4,
+        "total_tokens": (len(system_prompt) + len(user_prompt) + len(content)) // 4,
+        "queue_time": 0.0,
+        "total_time": latency_ms / 1000,
+    }
+
+
+def completion_body(content: str, tokens: dict) -> dict:
+    return {
+        "object": "chat.completion",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": tokens,
+    }
+
+
+def stream_events(content: str, tokens: dict) -> list:
+    """
+    Server-sent event payloads for a streamed completion, with the usage
+    block in the final chunk as Groq sends it.
+    """
+
+    events = [
+        {
+            "object": "chat.completion.chunk",
+            "choices": [{
+                "index": 0,
+                "delta": {"content": content[i:i + STREAM_CHUNK_CHARS]},
+            }],
+        }
+        for i in range(0, len(content), STREAM_CHUNK_CHARS)
+    ]
+    events.append({
+        "object": "chat.completion.chunk",
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        "x_groq": {"usage": tokens},
+    })
+    return events
+
+
+class FakeResponse:
+    """
+    Just enough of requests.Response for LLMHandler.
+    """
+
+    def __init__(self, body: dict = None, events: list = None):
+        self.status_code = 200
+        self.headers = {}
+        self._body = body
+        self._events = events
+
+    @property
+    def text(self):
+        return json.dumps(self._body)
+
+    def json(self):
+        return self._body
+
+    def iter_lines(self):
+        for event in self._events:
+            yield b"data: " + json.dumps(event).encode("utf-8")
+        yield b"data: [DONE]"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeLLMHandler(LLMHandler):
+    """
+    LLMHandler answering from answer() after `latency_ms` of simulated
+    model time. The response cache is off unless one is passed in, so
+    every call does the full amount of work.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, model: str = "fake-llm",
+                 **kwargs):
+        kwargs.setdefault("cache", LLMResponseCache(enabled=False))
+        kwargs.setdefault("base_url", "fake://llm")
+        super().__init__("fake-key", model, **kwargs)
+        self.latency_ms = latency_ms
+
+    def _post(self, headers, payload, stream: bool = False):
+        system_prompt = payload["messages"][0]["content"]
+        user_prompt = payload["messages"][1]["content"]
+
+        content = json.dumps(answer(system_prompt, user_prompt))
+        tokens = usage(system_prompt, user_prompt, content, self.latency_ms)
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        if not stream:
+            return FakeResponse(body=completion_body(content, tokens)), 1
+
+        return FakeResponse(events=stream_events(content, tokens)), 1
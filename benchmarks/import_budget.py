@@ -0,0 +1,112 @@
+"""
+Import-time budget for the modules on the app's start-up path.
+
+Each module is imported in a fresh interpreter (so nothing is already
+cached in sys.modules) and timed with perf_counter; the median of
+--repeat runs is compared to its budget. Modules that must stay off a
+path, such as matplotlib under the pipeline, are checked too.
+
+    python benchmarks/import_budget.py [--repeat 5]
+
+Exits 1 when any budget is exceeded or a forbidden module is loaded.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median import time allowed per module, in ms
+BUDGET_MS = {
+    "agents.system_pipeline": 150,
+    "models.llm_handler": 300,
+    "utils.plotly_charts": 250,
+    "utils.result_store": 20,
+    "utils.warmup": 100,
+    "utils.report_jobs": 400,
+    "utils.network_diagram": 1000,
+}
+
+# Heavy modules that importing the key must not pull in
+FORBIDDEN = {
+    "agents.system_pipeline": ("matplotlib", "numpy", "reportlab"),
+    "utils.plotly_charts": ("matplotlib", "reportlab"),
+    "utils.warmup": ("matplotlib", "numpy", "reportlab"),
+    "utils.report_jobs": ("matplotlib",),
+    # Rendering goes through Figure and the Agg canvas, never pyplot
+    "utils.network_diagram": ("matplotlib.pyplot", "reportlab"),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    "ms": elapsed,
+    "loaded": [m for m in {forbidden!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    forbidden = FORBIDDEN.get(module, ())
+    samples = []
+    loaded = set()
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                PROBE.format(module=module, forbidden=tuple(forbidden)),
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        samples.append(probe["ms"])
+        loaded.update(probe["loaded"])
+
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "forbidden_loaded": sorted(loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+
+    print(f"{'module':<28}{'median':>10}{'budget':>10}  status")
+    for module, budget in BUDGET_MS.items():
+        result = measure(module, args.repeat)
+
+        problems = []
+        if result["median_ms"] > budget:
+            problems.append("over budget")
+        if result["forbidden_loaded"]:
+            problems.append("loads " + ", ".join(result["forbidden_loaded"]))
+
+        failed = failed or bool(problems)
+        print(
+            f"{module:<28}{result['median_ms']:>8.1f}ms{budget:>8}ms  "
+            f"{'; '.join(problems) or 'ok'}"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Closed-loop load generator: N simulated analysts running back to back.
+
+By default each worker runs run_full_pipeline on a random company profile
+with a real LLMHandler pointed at a Groq-compatible server (normally
+mock_groq_server.py). With --http-url the workers hit any HTTP front end
+instead. Reports throughput, p50 / p95 / p99 latency and errors by type.
+
+    # start the mock in-process and drive 16 concurrent pipelines
+    python benchmarks/load_generator.py --mock --concurrency 16 --duration 60
+
+    # against a mock (or anything Groq-compatible) started separately
+    python benchmarks/load_generator.py --base-url http://127.0.0.1:8008
+
+    # any HTTP endpoint, e.g. the Streamlit health check
+    python benchmarks/load_generator.py \\
+        --http-url http://127.0.0.1:8501/_stcore/health --requests 2000
+
+The in-process mock shares this interpreter's GIL with the pipelines;
+run it as a separate process for capacity numbers.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import requests
+
+from agents.system_pipeline import run_full_pipeline
+from benchmarks.mock_groq_server import (
+    add_config_arguments,
+    config_from_args,
+    start_mock_server,
+)
+from models.llm_cache import LLMResponseCache
+from models.llm_handler import LLMHandler
+
+
+SECURITY_LEVELS = ("Low", "Medium", "High")
+CLOUD_PREFERENCES = ("Cloud", "Hybrid", "On-Prem")
+
+
+def random_profile(rng: random.Random) -> dict:
+    return {
+        "num_employees": rng.randint(10, 2000),
+        "office_size_sqft": rng.randint(1000, 60000),
+        "security_level": rng.choice(SECURITY_LEVELS),
+        "growth_rate_percent": rng.randint(0, 30),
+        "cloud_preference": rng.choice(CLOUD_PREFERENCES),
+        "budget": rng.randint(200000, 5000000),
+    }
+
+
+def percentile(values: list, pct: float) -> float:
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+# ---------------------------
+# Tasks
+# ---------------------------
+
+def pipeline_task(llm, stream: bool):
+    on_insight = (lambda key, text: None) if stream else None
+
+    def run(rng):
+        run_full_pipeline(
+            random_profile(rng), llm, render=False, on_insight=on_insight
+        )
+
+    return run
+
+
+def http_task(url: str, body: dict = None):
+    session = requests.Session()
+
+    def run(rng):
+        if body is None:
+            response = session.get(url, timeout=60)
+        else:
+            response = session.post(url, json=body, timeout=60)
+        if response.status_code >= 400:
+            raise Exception(f"HTTP {response.status_code}")
+
+    return run
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+
+def run_load(task, concurrency: int, duration: float = None,
+             max_requests: int = None, seed: int = 0) -> dict:
+    """
+    Run `task(rng)` back to back on `concurrency` threads until
+    `duration` seconds pass or `max_requests` have started.
+    """
+
+    latencies = []
+    errors = Counter()
+    lock = threading.Lock()
+    started = 0
+
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def next_request() -> bool:
+        nonlocal started
+        with lock:
+            if max_requests is not None and started >= max_requests:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            started += 1
+            return True
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        while next_request():
+            t0 = time.perf_counter()
+            try:
+                task(rng)
+            except Exception as e:
+                with lock:
+                    errors[type(e).__name__ + ": " + str(e)[:80]] += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), name=f"analyst-{i}")
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+    completed = len(latencies)
+    failed = sum(errors.values())
+
+    report = {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "requests": completed + failed,
+        "completed": completed,
+        "failed": failed,
+        "error_rate": round(failed / max(1, completed + failed), 4),
+        "throughput_per_s": round(completed / elapsed, 3),
+        "errors": dict(errors.most_common()),
+    }
+
+    if latencies:
+        report["latency_ms"] = {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(max(latencies), 1),
+        }
+
+    return report
+
+
+def print_report(report: dict):
+    print(
+        f"{report['completed']} ok / {report['failed']} failed in "
+        f"{report['elapsed_s']}s at concurrency {report['concurrency']}: "
+        f"{report['throughput_per_s']}/s, error rate "
+        f"{report['error_rate']:.2%}"
+    )
+    if "latency_ms" in report:
+        print("latency " + "  ".join(
+            f"{name} {ms:,.0f}ms" for name, ms in report["latency_ms"].items()
+        ))
+    for error, count in report["errors"].items():
+        print(f"  {count:>6}  {error}")
+    if "llm" in report:
+        llm = report["llm"]
+        print(
+            f"LLM: {llm['calls']} calls, {llm['attempts']} attempts "
+            f"({llm['retries']} retries), {llm['failed_calls']} failed, "
+            f"{llm['prompt_tokens'] + llm['completion_tokens']:,} tokens"
+        )
+    if "rate_limiter" in report:
+        limiter = report["rate_limiter"]
+        print(
+            f"Rate limiter: concurrency limit {limiter['concurrency_limit']}, "
+            f"tpm {limiter['tpm']:,}, {limiter['delayed']} of "
+            f"{limiter['admitted']} requests held back "
+            f"({limiter['wait_seconds']:.1f}s), "
+            f"{limiter['rate_limited']} 429s, {limiter['decreases']} decreases"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float,
+                        help="seconds to run (default 30 unless --requests)")
+    parser.add_argument("--requests", type=int, help="total requests to send")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report JSON here")
+
+    pipeline = parser.add_argument_group("pipeline mode")
+    pipeline.add_argument(
+        "--base-url",
+        help="Groq-compatible server (default NETARCHITECT_LLM_BASE_URL)",
+    )
+    pipeline.add_argument("--mock", action="store_true",
+                          help="start mock_groq_server in this process")
+    pipeline.add_argument("--model", default="llama-3.1-8b-instant")
+    pipeline.add_argument("--stream", action="store_true",
+                          help="stream the insight call, as the dashboard does")
+    pipeline.add_argument("--cache", action="store_true",
+                          help="keep the LLM response cache on")
+
+    http = parser.add_argument_group("HTTP mode")
+    http.add_argument("--http-url", help="GET (or POST --body) this URL")
+    http.add_argument("--body", help="JSON file to POST to --http-url")
+
+    mock = parser.add_argument_group("mock server (with --mock)")
+    add_config_arguments(mock)
+
+    args = parser.parse_args()
+
+    duration = args.duration
+    if duration is None and args.requests is None:
+        duration = 30.0
+
+    server = None
+    llm = None
+
+    if args.http_url:
+        body = None
+        if args.body:
+            with open(args.body) as f:
+                body = json.load(f)
+        task = http_task(args.http_url, body)
+
+    else:
+        base_url = args.base_url
+        if args.mock:
+            server = start_mock_server(config_from_args(args))
+            base_url = server.base_url
+
+        llm = LLMHandler(
+            os.getenv("GROQ_API_KEY", "mock-key"),
+            args.model,
+            base_url=base_url,
+            cache=None if args.cache else LLMResponseCache(enabled=False),
+        )
+        task = pipeline_task(llm, args.stream)
+
+    report = run_load(
+        task, args.concurrency, duration, args.requests, args.seed
+    )
+    if llm is not None:
+        report["llm"] = llm.get_stats()
+        report["rate_limiter"] = llm.limiter.snapshot()
+    if server is not None:
+        report["mock"] = server.stats.snapshot()
+        server.shutdown()
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""
+Local Groq/OpenAI-compatible chat completions server for load tests.
+
+POST /openai/v1/chat/completions answers every agent prompt with the
+schema-valid JSON from fake_llm.answer(), after a latency drawn from a
+log-normal distribution, and fails a configurable share of requests with
+429 (plus Retry-After) or 500. With --rpm-limit / --tpm-limit it also
+enforces per-minute request and token limits the way Groq does, sending
+x-ratelimit-* headers on every response and a 429 once a limit is hit.
+Requests with "stream": true are answered as server-sent events, spread
+over the sampled latency. GET /stats returns request counts; GET /health
+returns 200.
+
+    python benchmarks/mock_groq_server.py [--port 8008]
+        [--latency-ms 400] [--latency-sigma 0.5] [--ttft-fraction 0.3]
+        [--rate-limit-rate 0.02] [--retry-after 1] [--error-rate 0.01]
+        [--rpm-limit 300] [--tpm-limit 60000]
+
+Point the app at it with NETARCHITECT_LLM_BASE_URL=http://127.0.0.1:8008,
+or pass base_url to LLMHandler.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fake_llm import answer, completion_body, stream_events, usage
+from models.rate_limiter import TokenBucket
+
+
+CHAT_PATH = "/openai/v1/chat/completions"
+
+
+class MockConfig:
+    """
+    Behaviour of the mock. Latency is log-normal with the given median;
+    sigma 0 makes it fixed.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 400.0,
+        latency_sigma: float = 0.5,
+        ttft_fraction: float = 0.3,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        error_rate: float = 0.0,
+        rpm_limit: float = 0.0,
+        tpm_limit: float = 0.0,
+        seed: int = None,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.ttft_fraction = ttft_fraction
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_latency(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            return self._random.lognormvariate(
+                math.log(self.latency_ms), self.latency_sigma
+            )
+
+    def sample_failure(self):
+        """
+        429, 500 or None for the next request.
+        """
+
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+
+class MockLimits:
+    """
+    Per-minute request and token budgets, reported in Groq's
+    x-ratelimit-* headers. A limit of 0 is not enforced.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self._lock = threading.Lock()
+        self.buckets = {
+            "requests": TokenBucket(rpm),
+            "tokens": TokenBucket(tpm),
+        }
+
+    def check(self, tokens: int):
+        """
+        (seconds until the request would fit or 0, response headers).
+        A request that fits is charged against both budgets.
+        """
+
+        cost = {"requests": 1, "tokens": tokens}
+
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                bucket.wait_time(cost[name], now)
+                for name, bucket in self.buckets.items()
+            )
+            if not wait:
+                for name, bucket in self.buckets.items():
+                    bucket.take(cost[name])
+
+            headers = {}
+            for name, bucket in self.buckets.items():
+                if not bucket.rate:
+                    continue
+                reset = (bucket.rate - bucket.level) * 60 / bucket.rate
+                headers[f"x-ratelimit-limit-{name}"] = f"{bucket.rate:g}"
+                headers[f"x-ratelimit-remaining-{name}"] = str(
+                    max(0, int(bucket.level))
+                )
+                headers[f"x-ratelimit-reset-{name}"] = f"{reset:.2f}s"
+
+        return wait, headers
+
+
+class MockStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "requests": 0,
+            "ok": 0,
+            "streamed": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "bad_requests": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def add(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.counts[key] += delta
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+
+class MockGroqHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, headers: dict = None):
+        self._send_json(
+            status,
+            {"error": {"message": message, "type": "mock_error"}},
+            headers,
+        )
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.stats.snapshot())
+        else:
+            self._error(404, f"Unknown path {self.path}")
+
+    def do_POST(self):
+        config = self.server.config
+        stats = self.server.stats
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+
+        if self.path != CHAT_PATH:
+            self._error(404, f"Unknown path {self.path}")
+            return
+
+        stats.add(requests=1)
+
+        try:
+            payload = json.loads(body)
+            messages = payload["messages"]
+            system_prompt = messages[0]["content"]
+            user_prompt = messages[-1]["content"]
+            content = json.dumps(answer(system_prompt, user_prompt))
+        except (ValueError, KeyError, IndexError, SyntaxError) as e:
+            stats.add(bad_requests=1)
+            self._error(400, f"Mock cannot answer this request: {e}")
+            return
+
+        latency_ms = config.sample_latency()
+        tokens = usage(system_prompt, user_prompt, content, latency_ms)
+
+        wait, limit_headers = self.server.limits.check(tokens["total_tokens"])
+        if wait:
+            stats.add(rate_limited=1)
+            self._error(
+                429,
+                "Rate limit reached (mock per-minute limit)",
+                {"Retry-After": f"{wait:.2f}", **limit_headers},
+            )
+            return
+
+        failure = config.sample_failure()
+        if failure == 429:
+            stats.add(rate_limited=1)
+            self._error(
+                429,
+                "Rate limit reached (mock)",
+                {"Retry-After": f"{config.retry_after:g}"},
+            )
+            return
+        if failure == 500:
+            # Fail part-way through the model time, as an overloaded
+            # upstream would
+            time.sleep(config.sample_latency() / 2000)
+            stats.add(errors=1)
+            self._error(500, "Internal server error (mock)")
+            return
+
+        stats.add(
+            ok=1,
+            prompt_tokens=tokens["prompt_tokens"],
+            completion_tokens=tokens["completion_tokens"],
+        )
+
+        if not payload.get("stream"):
+            time.sleep(latency_ms / 1000)
+            self._send_json(
+                200, completion_body(content, tokens), limit_headers
+            )
+            return
+
+        stats.add(streamed=1)
+        self._stream(stream_events(content, tokens), latency_ms, limit_headers)
+
+    def _stream(self, events: list, latency_ms: float, headers: dict):
+        config = self.server.config
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        # No Content-Length: the body ends when the connection closes
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        # Time to first token, then the rest spread evenly over the chunks
+        first_token = latency_ms * config.ttft_fraction
+        per_chunk = (latency_ms - first_token) / max(1, len(events) - 1)
+
+        time.sleep(first_token / 1000)
+        for i, event in enumerate(events):
+            if i:
+                time.sleep(per_chunk / 1000)
+            self.wfile.write(
+                b"data: " + json.dumps(event).encode("utf-8") + b"\n\n"
+            )
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class MockGroqServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address, config: MockConfig = None):
+        super().__init__(address, MockGroqHandler)
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self.limits = MockLimits(self.config.rpm_limit, self.config.tpm_limit)
+
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections is normal under load
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_mock_server(config: MockConfig = None, host: str = "127.0.0.1",
+                      port: int = 0) -> MockGroqServer:
+    """
+    Serve the mock on a daemon thread; port 0 picks a free one. Use
+    server.base_url for LLMHandler(base_url=...) and server.shutdown()
+    to stop it.
+    """
+
+    server = MockGroqServer((host, port), config)
+    threading.Thread(
+        target=server.serve_forever, name="mock-groq", daemon=True
+    ).start()
+    return server
+
+
+def add_config_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=400.0,
+                        help="median model time per request")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="log-normal sigma; 0 for fixed latency")
+    parser.add_argument("--ttft-fraction", type=float, default=0.3,
+                        help="share of the latency before the first token")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests answered with 500")
+    parser.add_argument("--rpm-limit", type=float, default=0.0,
+                        help="requests per minute before a 429; 0 for none")
+    parser.add_argument("--tpm-limit", type=float, default=0.0,
+                        help="tokens per minute before a 429; 0 for none")
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        ttft_fraction=args.ttft_fraction,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        rpm_limit=args.rpm_limit,
+        tpm_limit=args.tpm_limit,
+        seed=getattr(args, "seed", None),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--seed", type=int)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockGroqServer((args.host, args.port), config_from_args(args))
+    print(f"Mock Groq API on {server.base_url}{CHAT_PATH}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
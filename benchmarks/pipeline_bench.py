@@ -0,0 +1,393 @@
+"""
+Offline pipeline benchmark over a grid of company profiles.
+
+Every profile in the employees x sqft x security x cloud grid is run
+through run_full_pipeline against the deterministic fake LLM (see
+fake_llm.py), then each agent, the diagram and the PDF are timed on
+their own with that run's data. A second, tracemalloc pass records the
+peak memory of every stage. The report gives p50 / p95 / max latency and
+peak memory per stage and is compared against a stored baseline.
+
+    python benchmarks/pipeline_bench.py [--quick] [--repeat 3]
+        [--latency-ms 0] [--skip-memory] [--output report.json]
+        [--baseline benchmarks/pipeline_baseline.json] [--threshold 0.25]
+        [--update-baseline]
+
+The stored baseline was recorded with --quick and the default repeat;
+runs on another grid, repeat or LLM latency are not compared. Exits 1
+when a stage's p50 (and, given enough samples, p95) latency or peak
+memory is above the baseline by more than the threshold and the noise
+floor. The memory pass dominates the run time (tracemalloc slows
+matplotlib several-fold); --skip-memory leaves it out.
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from agents.costing_agent import CostingAgent
+from agents.deployment_agent import DeploymentAgent
+from agents.optimization_agent import OptimizationAgent
+from agents.performance_agent import PerformanceAgent
+from agents.security_agent import SecurityAgent
+from agents.system_pipeline import run_full_pipeline
+from benchmarks.fake_llm import FakeLLMHandler
+from utils import memory_profile
+from utils.network_diagram import generate_network_diagram
+from utils.pdf_report import generate_pdf
+
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "pipeline_baseline.json")
+
+GRID = {
+    "num_employees": (25, 120, 480, 2000),
+    "office_size_sqft": (2000, 15000, 60000),
+    "security_level": ("Low", "Medium", "High"),
+    "cloud_preference": ("Cloud", "Hybrid", "On-Prem"),
+}
+
+QUICK_GRID = {
+    "num_employees": (25, 480),
+    "office_size_sqft": (2000, 60000),
+    "security_level": ("Low", "High"),
+    "cloud_preference": ("Cloud", "On-Prem"),
+}
+
+# Held constant across the grid
+FIXED_INPUTS = {
+    "growth_rate_percent": 10,
+    "budget": 1500000,
+}
+
+# Differences smaller than these are noise, whatever the ratio
+MIN_DELTA_MS = 5.0
+MIN_DELTA_KB = 256.0
+
+# p95 is only gated with at least this many samples per stage; below it
+# the nearest-rank p95 is one of the few slowest runs, i.e. noise
+MIN_P95_RUNS = 100
+
+# Run settings a baseline must share to be compared against
+MATCHED_META = ("repeat", "llm_latency_ms")
+
+
+def profiles(grid: dict) -> list:
+    keys = list(grid)
+    return [
+        dict(zip(keys, values), **FIXED_INPUTS)
+        for values in itertools.product(*grid.values())
+    ]
+
+
+# ---------------------------
+# Stages
+# ---------------------------
+
+def _optimize(result):
+    # Same steps as the pipeline's optimization phase, on a fresh copy
+    optimizer = OptimizationAgent()
+    infra = copy.deepcopy(result["initial_design"])
+    analysis = result["initial_analysis"]
+
+    decision = optimizer.evaluate(infra, analysis)
+    if decision["optimization_needed"]:
+        bom_search = optimizer.search(infra)
+        infra = optimizer.modify_design(infra, analysis, bom_search)
+    return infra
+
+
+def agent_stages(result: dict) -> dict:
+    """
+    Each agent and renderer as a zero-argument call on `result`'s data.
+    """
+
+    infra = result["infra"]
+    topology = result["topology"]
+
+    return {
+        "cost": lambda: CostingAgent().calculate_cost(infra, topology),
+        "performance": lambda: PerformanceAgent().evaluate(infra, topology),
+        "security": lambda: SecurityAgent().evaluate(infra),
+        "optimization": lambda: _optimize(result),
+        "deployment": lambda: DeploymentAgent().estimate(
+            infra, result["cost"], topology["cisco"]
+        ),
+        "diagram": lambda: generate_network_diagram(
+            infra, topology=topology["cisco"]
+        ),
+        "pdf": lambda: generate_pdf(
+            infra,
+            result["optimized_analysis"],
+            result["deployment"],
+            result["insights"],
+            topology["cisco"],
+        ),
+    }
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+# ---------------------------
+# Runs
+# ---------------------------
+
+def run_profile(profile: dict, llm, samples: dict):
+    """
+    Time the pipeline, its phases and every agent stage for one profile,
+    appending ms to samples[stage]. Returns the pipeline result.
+    """
+
+    start = time.perf_counter()
+    result = run_full_pipeline(
+        profile, llm, render=False, on_insight=lambda key, text: None
+    )
+    samples.setdefault("pipeline", []).append(
+        (time.perf_counter() - start) * 1000
+    )
+
+    for phase, ms in result["timings"].items():
+        if phase != "total":
+            samples.setdefault(f"phase.{phase}", []).append(ms)
+
+    for stage, func in agent_stages(result).items():
+        samples.setdefault(f"agent.{stage}", []).append(_timed(func))
+
+    return result
+
+
+def measure_memory(profile: dict, llm, peaks: dict):
+    """
+    Peak traced memory (KB) of every phase and agent stage for one
+    profile, keeping the largest seen per stage in `peaks`.
+    """
+
+    result = run_full_pipeline(
+        profile, llm, render=False, profile_memory=True,
+        on_insight=lambda key, text: None,
+    )
+    sections = {
+        f"phase.{name}": section
+        for name, section in result["memory"]["sections"].items()
+    }
+
+    with memory_profile.MemoryProfiler() as profiler:
+        for stage, func in agent_stages(result).items():
+            with profiler.section(f"agent.{stage}"):
+                func()
+    sections.update(profiler.sections)
+
+    for stage, section in sections.items():
+        peaks[stage] = max(peaks.get(stage, 0.0), section["peak_kb"])
+    peaks["pipeline"] = max(
+        peaks.get("pipeline", 0.0), result["memory"]["traced_peak_kb"]
+    )
+
+    return result
+
+
+def percentile(values: list, pct: float) -> float:
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: dict, peaks: dict) -> dict:
+    return {
+        stage: {
+            "runs": len(values),
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "max_ms": round(max(values), 2),
+            "peak_kb": peaks.get(stage),
+        }
+        for stage, values in sorted(samples.items())
+    }
+
+
+def run_benchmark(grid: dict, repeat: int = 1, latency_ms: float = 0.0,
+                  memory: bool = True) -> dict:
+    grid_profiles = profiles(grid)
+    llm = FakeLLMHandler(latency_ms=latency_ms)
+
+    # Imports, catalog indexes and font metrics are one-off costs
+    run_profile(grid_profiles[0], llm, {})
+
+    samples = {}
+    peaks = {}
+    max_rss = None
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for profile in grid_profiles:
+            run_profile(profile, llm, samples)
+    elapsed = time.perf_counter() - start
+
+    if memory:
+        for profile in grid_profiles:
+            result = measure_memory(profile, llm, peaks)
+        max_rss = result["memory"]["peak_rss_kb"]
+
+    return {
+        "meta": {
+            "profiles": len(grid_profiles),
+            "repeat": repeat,
+            "llm_latency_ms": latency_ms,
+            "elapsed_s": round(elapsed, 2),
+            "peak_rss_kb": max_rss,
+            "llm": llm.get_stats(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "grid": {key: list(values) for key, values in grid.items()},
+        "stages": summarize(samples, peaks),
+    }
+
+
+# ---------------------------
+# Baseline
+# ---------------------------
+
+def mismatch(report: dict, baseline: dict):
+    """
+    Why `report` cannot be compared against `baseline`, or None if it can.
+    """
+
+    if baseline["grid"] != report["grid"]:
+        return "Baseline was recorded on a different grid"
+
+    for key in MATCHED_META:
+        if baseline["meta"].get(key) != report["meta"][key]:
+            return (
+                f"Baseline was recorded with {key}={baseline['meta'].get(key)}"
+                f", this run used {report['meta'][key]}"
+            )
+
+    return None
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """
+    One line per stage that regressed against `baseline`. Raises
+    ValueError when the two were run with different settings.
+    """
+
+    reason = mismatch(report, baseline)
+    if reason is not None:
+        raise ValueError(reason)
+
+    regressions = []
+
+    for stage, current in report["stages"].items():
+        base = baseline["stages"].get(stage)
+        if base is None:
+            continue
+
+        fields = ["p50_ms"]
+        if min(current["runs"], base["runs"]) >= MIN_P95_RUNS:
+            fields.append("p95_ms")
+
+        for field in fields:
+            if (current[field] > base[field] * (1 + threshold)
+                    and current[field] - base[field] > MIN_DELTA_MS):
+                regressions.append(
+                    f"{stage} {field}: {base[field]} -> {current[field]}"
+                )
+
+        if (current["peak_kb"] is not None and base["peak_kb"] is not None
+                and current["peak_kb"] > base["peak_kb"] * (1 + threshold)
+                and current["peak_kb"] - base["peak_kb"] > MIN_DELTA_KB):
+            regressions.append(
+                f"{stage} peak_kb: {base['peak_kb']} -> {current['peak_kb']}"
+            )
+
+    return regressions
+
+
+def print_report(report: dict, baseline: dict = None):
+    print(
+        f"{'stage':<24}{'p50':>10}{'p95':>10}{'max':>10}"
+        f"{'peak':>11}{'base p50':>11}"
+    )
+    for stage, row in report["stages"].items():
+        base = (baseline or {}).get("stages", {}).get(stage)
+        peak = "-" if row["peak_kb"] is None else f"{row['peak_kb']:,.0f}KB"
+        print(
+            f"{stage:<24}{row['p50_ms']:>8.2f}ms{row['p95_ms']:>8.2f}ms"
+            f"{row['max_ms']:>8.2f}ms{peak:>11}"
+            f"{(str(base['p50_ms']) + 'ms') if base else '-':>11}"
+        )
+
+    meta = report["meta"]
+    print(
+        f"\n{meta['profiles']} profiles x {meta['repeat']} in "
+        f"{meta['elapsed_s']}s, peak RSS {meta['peak_rss_kb'] or 0:,.0f} KB, "
+        f"{meta['llm']['prompt_tokens']:,} prompt tokens"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="2 values per dimension instead of the full grid")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated model time per LLM call")
+    parser.add_argument("--skip-memory", action="store_true",
+                        help="latency only, without the tracemalloc pass")
+    parser.add_argument("--output", help="write the report JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    grid = QUICK_GRID if args.quick else GRID
+    report = run_benchmark(
+        grid, args.repeat, args.latency_ms, memory=not args.skip_memory
+    )
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        reason = mismatch(report, baseline)
+        if reason is not None:
+            print(f"{reason}; not comparing.")
+            baseline = None
+
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
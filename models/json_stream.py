@@ -0,0 +1,144 @@
+import json
+
+
+WHITESPACE = " \t\r\n"
+
+
+def find_object_bounds(text: str, start: int = 0):
+    """
+    (start, end) of the first complete JSON object in `text`, with end
+    exclusive, or None if no object starts or it never closes. Braces
+    inside string values are ignored.
+    """
+
+    start = text.find("{", start)
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        c = text[i]
+
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+
+    return start, None
+
+
+class IncrementalJSONParser:
+    """
+    Feed a JSON object in arbitrary chunks and get back each top-level
+    (key, value) pair as soon as its value is complete. Anything before
+    the first "{" (e.g. a markdown fence) is skipped, as is anything after
+    the object closes.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.result = {}
+
+        self.started = False
+        self.done = False
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+        # "key" -> "colon" -> "value" -> "comma" -> "key" ...
+        self._state = "key"
+        self._key = None
+        self._token_start = None
+        self._value_start = None
+
+    def _emit(self, value_text: str, pairs: list):
+        value = json.loads(value_text)
+        self.result[self._key] = value
+        pairs.append((self._key, value))
+        self._state = "comma"
+        self._value_start = None
+
+    def feed(self, chunk: str) -> list:
+        pairs = []
+        self.text += chunk
+        text = self.text
+
+        while self._pos < len(text) and not self.done:
+            i = self._pos
+            c = text[i]
+            self._pos += 1
+
+            if not self.started:
+                if c == "{":
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        self._key = json.loads(text[self._token_start:i + 1])
+                        self._state = "colon"
+                    elif self._depth == 1 and self._state == "value":
+                        self._emit(text[self._value_start:i + 1], pairs)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._token_start = i
+                elif self._depth == 1 and self._state == "value":
+                    self._value_start = i
+
+            elif c in "{[":
+                if self._depth == 1 and self._state == "value":
+                    self._value_start = i
+                self._depth += 1
+
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value":
+                    self._emit(text[self._value_start:i + 1], pairs)
+                elif self._depth == 0:
+                    if self._state == "value" and self._value_start is not None:
+                        self._emit(text[self._value_start:i].strip(), pairs)
+                    self.done = True
+
+            elif self._depth == 1:
+                if c == ":" and self._state == "colon":
+                    self._state = "value"
+                    self._value_start = None
+                elif c == ",":
+                    if self._state == "value" and self._value_start is not None:
+                        self._emit(text[self._value_start:i].strip(), pairs)
+                    self._state = "key"
+                elif (
+                    self._state == "value"
+                    and self._value_start is None
+                    and c not in WHITESPACE
+                ):
+                    # Number, true, false or null
+                    self._value_start = i
+
+        return pairs
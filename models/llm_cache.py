@@ -0,0 +1,295 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "llm_responses.sqlite3"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for parsed LLM responses: a bounded in-memory LRU in
+    front of an SQLite store that survives restarts and is shared by
+    every process on the host.
+
+    Values are stored as JSON text, so every hit hands back a fresh copy
+    that callers are free to mutate.
+
+    The disk tier is best effort: if the SQLite file cannot be opened,
+    read or written (read-only image, locked or full disk), the error is
+    logged once and the cache carries on in memory only.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_memory_entries: int = 512,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        enabled: bool = True,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._conn = None
+        self.disk_enabled = True
+
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "disk_errors": 0,
+        }
+
+    # ---------------------------
+    # Keys
+    # ---------------------------
+
+    @staticmethod
+    def make_key(endpoint, model, system_prompt, user_prompt,
+                 temperature) -> str:
+        # The endpoint keeps answers from a mock or proxy server apart
+        # from the real API's, even when they share a cache file
+        material = json.dumps(
+            [endpoint, model, system_prompt, user_prompt, temperature],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # ---------------------------
+    # Disk Tier
+    # ---------------------------
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            conn = sqlite3.connect(
+                self.path, timeout=10, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+            conn.commit()
+            self._conn = conn
+
+        return self._conn
+
+    def _disk_failed(self, error):
+        # Called with the lock held; the memory tier keeps working
+        self.counters["disk_errors"] += 1
+        if not self.disk_enabled:
+            return
+
+        self.disk_enabled = False
+        logger.warning(
+            "LLM response cache at %s is unusable (%s); "
+            "continuing with the in-memory cache only",
+            self.path, error,
+        )
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def _evict_disk(self, conn, now):
+        conn.execute(
+            "DELETE FROM responses WHERE created < ?",
+            (now - self.ttl_seconds,),
+        )
+
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        # Drop least recently used rows until back under budget
+        excess = total - self.max_disk_bytes
+        rows = conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        )
+        doomed = []
+        for key, size in rows:
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.counters["evictions"] += len(doomed)
+
+    # ---------------------------
+    # Memory Tier
+    # ---------------------------
+
+    def _remember(self, key, text, created):
+        self._memory[key] = (text, created)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                text, created = entry
+                if now - created <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return json.loads(text)
+                del self._memory[key]
+
+            row = None
+            if self.disk_enabled:
+                try:
+                    conn = self._connect()
+                    row = conn.execute(
+                        "SELECT value, created FROM responses WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+
+                    if row is not None and now - row[1] <= self.ttl_seconds:
+                        conn.execute(
+                            "UPDATE responses SET accessed = ? WHERE key = ?",
+                            (now, key),
+                        )
+                        conn.commit()
+                except (sqlite3.Error, OSError) as e:
+                    self._disk_failed(e)
+                    row = None
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.counters["misses"] += 1
+                return None
+
+            text, created = row
+            self._remember(key, text, created)
+            self.counters["disk_hits"] += 1
+
+        return json.loads(text)
+
+    def set(self, key: str, value: dict):
+        if not self.enabled:
+            return
+
+        text = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, text, now)
+            self.counters["writes"] += 1
+
+            if not self.disk_enabled:
+                return
+
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, value, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, text, len(text.encode("utf-8")), now, now),
+                )
+                self._evict_disk(conn, now)
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                self._disk_failed(e)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+            if not self.disk_enabled:
+                return
+
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                self._disk_failed(e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_enabled"] = self.disk_enabled
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# ---------------------------
+# Process-wide Default Cache
+# ---------------------------
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMResponseCache:
+    """
+    Shared cache used by LLMHandler unless one is passed explicitly.
+    NETARCHITECT_LLM_CACHE=off disables it and
+    NETARCHITECT_LLM_CACHE_PATH moves the SQLite file.
+    """
+    global _default_cache
+
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                enabled = os.getenv("NETARCHITECT_LLM_CACHE", "on").lower()
+                _default_cache = LLMResponseCache(
+                    path=os.getenv(
+                        "NETARCHITECT_LLM_CACHE_PATH", DEFAULT_CACHE_PATH
+                    ),
+                    enabled=enabled not in ("0", "off", "false", "no"),
+                )
+
+    return _default_cache
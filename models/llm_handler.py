@@ -1,13 +1,119 @@
 import requests
 import json
+import os
+import random
 import re
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+from models.json_stream import IncrementalJSONParser, find_object_bounds
+from models.llm_cache import get_default_cache
+from models.rate_limiter import get_rate_limiter
+from utils import tracing
+
+
+DEFAULT_BASE_URL = "https://api.groq.com"
+CHAT_COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Fields kept from the response's usage block: token counts, and the
+# seconds Groq spent queueing and serving the request
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "queue_time", "total_time")
+
+
+# ---------------------------
+# Shared HTTP Transport
+# ---------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+# Cache keys with a request in flight, so identical concurrent calls
+# wait for the first one instead of paying for the same tokens twice
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 16) -> requests.Session:
+    """
+    Process-wide keep-alive session. Connections (and their TLS sessions)
+    are pooled and reused across LLMHandler instances and threads.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
 
 
 class LLMHandler:
-    def __init__(self, api_key: str, model: str):
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        cache=None,
+        use_cache: bool = True,
+        base_url: str = None,
+        limiter=None,
+    ):
         self.api_key = api_key
         self.model = model
-        self.endpoint = "https://api.groq.com/openai/v1/chat/completions"
+
+        # Any Groq/OpenAI-compatible server, e.g. benchmarks/mock_groq_server.py
+        base_url = (
+            base_url
+            or os.getenv("NETARCHITECT_LLM_BASE_URL")
+            or DEFAULT_BASE_URL
+        )
+        self.endpoint = base_url.rstrip("/") + CHAT_COMPLETIONS_PATH
+        self.temperature = 0.2
+
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = get_session()
+
+        self.cache = cache if cache is not None else get_default_cache()
+        self.use_cache = use_cache
+
+        # Shared with every other handler so all sessions stay under the
+        # provider's request and token limits together
+        self.limiter = limiter if limiter is not None else get_rate_limiter()
+
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._totals = {
+            "calls": 0,
+            "cache_hits": 0,
+            "failed_calls": 0,
+            "attempts": 0,
+            "total_latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
 
     def extract_json(self, text: str):
         """
@@ -17,26 +123,218 @@ class LLMHandler:
         # Remove markdown blocks
         text = text.replace("```json", "").replace("```", "").strip()
 
-        # Find first '{'
-        start = text.find("{")
-        if start == -1:
+        # Braces inside string values don't count towards the balance
+        bounds = find_object_bounds(text)
+        if bounds is None:
             raise Exception("No JSON object found in response.")
 
-        # Track bracket balance
-        bracket_count = 0
-        for i in range(start, len(text)):
-            if text[i] == "{":
-                bracket_count += 1
-            elif text[i] == "}":
-                bracket_count -= 1
+        start, end = bounds
+        if end is None:
+            raise Exception("Incomplete JSON object in response.")
+
+        return json.loads(text[start:end])
+
+    # ---------------------------
+    # Retry Helpers
+    # ---------------------------
+
+    def _retry_after(self, response):
+        """
+        Seconds requested by a Retry-After header, or None. Only the
+        delta-seconds form is used by the Groq API.
+        """
+        if response is None:
+            return None
+
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+
+    def _backoff_delay(self, attempt: int, response=None) -> float:
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+
+        # Full jitter exponential backoff
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _record(self, stats: dict):
+        self._local.last_call_stats = stats
+
+        lease_stats = getattr(self._local, "lease_stats", None)
+        if lease_stats is not None and not stats.get("cache_hit"):
+            self._local.lease_stats = None
+            stats["throttle_ms"] = round(lease_stats["throttle_ms"], 2)
+            self.limiter.settle(
+                lease_stats["reserved_tokens"],
+                stats.get("prompt_tokens"),
+                stats.get("completion_tokens"),
+            )
+
+        with self._stats_lock:
+            totals = self._totals
+            totals["calls"] += 1
+            totals["cache_hits"] += 1 if stats.get("cache_hit") else 0
+            totals["failed_calls"] += 0 if stats["ok"] else 1
+            totals["attempts"] += stats["attempts"]
+            totals["total_latency_ms"] += stats["latency_ms"]
+            totals["max_latency_ms"] = max(
+                totals["max_latency_ms"], stats["latency_ms"]
+            )
+            totals["prompt_tokens"] += stats.get("prompt_tokens", 0)
+            totals["completion_tokens"] += stats.get("completion_tokens", 0)
+
+        tracing.record_llm_call(self.model, stats)
+
+    def _usage(self, body: dict) -> dict:
+        """
+        Token and timing fields from a response or stream chunk. Groq puts
+        the usage block under "x_groq" in the final stream chunk.
+        """
+
+        usage = body.get("usage") or (body.get("x_groq") or {}).get("usage")
+        if not usage:
+            return {}
+
+        return {
+            field: usage[field] for field in USAGE_FIELDS
+            if usage.get(field) is not None
+        }
+
+    @property
+    def last_call_stats(self):
+        """
+        Latency, attempts, token usage and final status of the most recent
+        call made from the current thread.
+        """
+        return getattr(self._local, "last_call_stats", None)
+
+    def get_stats(self) -> dict:
+        """
+        Aggregate latency and attempt counts over all calls made by this
+        handler.
+        """
+        with self._stats_lock:
+            totals = dict(self._totals)
+
+        totals["retries"] = (
+            totals["attempts"] - totals["calls"] + totals["cache_hits"]
+        )
+        totals["total_latency_ms"] = round(totals["total_latency_ms"], 2)
+        return totals
+
+    # ---------------------------
+    # API Call
+    # ---------------------------
 
-                if bracket_count == 0:
-                    json_str = text[start:i+1]
-                    return json.loads(json_str)
+    def _post(self, headers, payload, stream: bool = False):
+        """
+        POST with retries on connection errors, timeouts, 429 and 5xx.
+        Returns (response, attempts). With stream=True only the response
+        headers have been read when this returns.
+
+        Every attempt waits for the rate limiter first. A streamed
+        response gives its concurrency slot back once its headers arrive.
+        """
+
+        reserved = self.limiter.estimate_tokens(payload)
+        lease_stats = {"reserved_tokens": reserved, "throttle_ms": 0.0}
+        self._local.lease_stats = lease_stats
+
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+
+            lease = self.limiter.acquire(reserved)
+            lease_stats["throttle_ms"] += lease.waited * 1000
+
+            try:
+                response = self.session.post(
+                    self.endpoint,
+                    headers=headers,
+                    json=payload,
+                    timeout=(self.connect_timeout, self.read_timeout),
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt > self.max_retries:
+                    raise Exception(
+                        f"Groq API Error: {e} (after {attempt} attempts)"
+                    )
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    return response, attempt
+                if attempt > self.max_retries:
+                    return response, attempt
+            finally:
+                lease.release(response)
+
+            time.sleep(self._backoff_delay(attempt - 1, response))
+
+    def call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        use_cache: bool = None,
+    ) -> dict:
+
+        if use_cache is None:
+            use_cache = self.use_cache
+
+        if not use_cache or not self.cache.enabled:
+            return self._call_uncached(system_prompt, user_prompt)
+
+        start = time.perf_counter()
+        cache_key = self.cache.make_key(
+            self.endpoint, self.model, system_prompt, user_prompt,
+            self.temperature,
+        )
 
-        raise Exception("Incomplete JSON object in response.")
+        while True:
+            cached = self.cache.get(cache_key)
 
-    def call(self, system_prompt: str, user_prompt: str) -> dict:
+            if cached is not None:
+                self._record({
+                    "attempts": 0,
+                    "ok": True,
+                    "cache_hit": True,
+                    "latency_ms": round(
+                        (time.perf_counter() - start) * 1000, 2
+                    ),
+                })
+                return cached
+
+            with _inflight_lock:
+                leader = _inflight.get(cache_key)
+                if leader is None:
+                    done = threading.Event()
+                    _inflight[cache_key] = done
+
+            if leader is None:
+                break
+
+            # Another thread is already asking the same question; if it
+            # fails, the loop comes back round and this thread takes over
+            leader.wait()
+
+        try:
+            parsed = self._call_uncached(system_prompt, user_prompt)
+            self.cache.set(cache_key, parsed)
+        finally:
+            with _inflight_lock:
+                del _inflight[cache_key]
+            done.set()
+
+        return parsed
+
+    def _build_request(self, system_prompt: str, user_prompt: str):
 
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -49,14 +347,144 @@ class LLMHandler:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            "temperature": 0.2
+            "temperature": self.temperature
         }
 
-        response = requests.post(self.endpoint, headers=headers, json=payload)
+        return headers, payload
 
-        if response.status_code != 200:
-            raise Exception(f"Groq API Error: {response.text}")
+    def _call_uncached(self, system_prompt: str, user_prompt: str) -> dict:
 
-        content = response.json()["choices"][0]["message"]["content"]
+        headers, payload = self._build_request(system_prompt, user_prompt)
+
+        start = time.perf_counter()
+        stats = {"attempts": 0, "ok": False, "cache_hit": False}
+
+        try:
+            response, stats["attempts"] = self._post(headers, payload)
+            stats["status_code"] = response.status_code
+
+            if response.status_code != 200:
+                raise Exception(f"Groq API Error: {response.text}")
+
+            body = response.json()
+            content = body["choices"][0]["message"]["content"]
+            stats.update(self._usage(body))
+            stats["ok"] = True
+
+        finally:
+            if not stats["attempts"]:
+                stats["attempts"] = self.max_retries + 1
+            stats["latency_ms"] = round(
+                (time.perf_counter() - start) * 1000, 2
+            )
+            self._record(stats)
 
         return self.extract_json(content)
+
+    # ---------------------------
+    # Streaming API Call
+    # ---------------------------
+
+    def _iter_content(self, response, stats: dict):
+        """
+        Text deltas from an OpenAI-compatible server-sent event stream.
+        Usage reported by the final chunk is added to `stats`.
+        """
+
+        for line in response.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                return
+
+            chunk = json.loads(data)
+            stats.update(self._usage(chunk))
+
+            choices = chunk.get("choices") or []
+            if choices:
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
+    def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        use_cache: bool = None,
+    ):
+        """
+        Like call(), but yields (key, value) for each top-level field of
+        the JSON response as soon as that field has fully arrived.
+        """
+
+        if use_cache is None:
+            use_cache = self.use_cache
+
+        start = time.perf_counter()
+        cache_key = None
+
+        if use_cache and self.cache.enabled:
+            cache_key = self.cache.make_key(
+                self.endpoint, self.model, system_prompt, user_prompt,
+                self.temperature,
+            )
+            cached = self.cache.get(cache_key)
+
+            if cached is not None:
+                self._record({
+                    "attempts": 0,
+                    "ok": True,
+                    "cache_hit": True,
+                    "latency_ms": round(
+                        (time.perf_counter() - start) * 1000, 2
+                    ),
+                })
+                yield from cached.items()
+                return
+
+        headers, payload = self._build_request(system_prompt, user_prompt)
+        payload["stream"] = True
+
+        stats = {"attempts": 0, "ok": False, "cache_hit": False}
+        parser = IncrementalJSONParser()
+
+        try:
+            response, stats["attempts"] = self._post(
+                headers, payload, stream=True
+            )
+            stats["status_code"] = response.status_code
+
+            with response:
+                if response.status_code != 200:
+                    raise Exception(f"Groq API Error: {response.text}")
+
+                for content in self._iter_content(response, stats):
+                    if "first_token_ms" not in stats:
+                        stats["first_token_ms"] = round(
+                            (time.perf_counter() - start) * 1000, 2
+                        )
+
+                    # Every field has been yielded once the object closes;
+                    # the rest of the stream is only read for its usage
+                    if not parser.done:
+                        yield from parser.feed(content)
+
+            if not parser.started:
+                raise Exception("No JSON object found in response.")
+            if not parser.done:
+                raise Exception("Incomplete JSON object in response.")
+
+            stats["ok"] = True
+
+        finally:
+            if not stats["attempts"]:
+                stats["attempts"] = self.max_retries + 1
+            stats["latency_ms"] = round(
+                (time.perf_counter() - start) * 1000, 2
+            )
+            self._record(stats)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, parser.result)
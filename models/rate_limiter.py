@@ -0,0 +1,434 @@
+import contextvars
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+
+
+# Request priorities; waiting calls are admitted lowest value first
+INTERACTIVE = 0
+BATCH = 1
+
+# Share of a limit learned from the provider's headers that is used, so
+# throughput settles just under the limit rather than on it
+HEADROOM = 0.9
+
+# Additive increase / multiplicative decrease of the concurrency limit
+INITIAL_CONCURRENCY = 4
+DECREASE_FACTOR = 0.5
+
+# Longest the limiter holds every request back after a 429 or an
+# exhausted request quota; past this, calls go out and fail normally
+MAX_PAUSE = 60.0
+
+# About four characters per token for English prose and JSON
+CHARS_PER_TOKEN = 4
+
+# Completion size assumed before any response has been seen
+COMPLETION_TOKENS_GUESS = 256
+
+_priority = contextvars.ContextVar("netarch_llm_priority", default=INTERACTIVE)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def _header_float(headers, name: str):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _header_seconds(headers, name: str):
+    """
+    A reset header as seconds. Groq writes durations like "7.66s",
+    "2m59.56s" or "120ms"; a bare number is taken as seconds.
+    """
+
+    value = headers.get(name)
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    scale = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+# ---------------------------
+# Token Bucket
+# ---------------------------
+
+class TokenBucket:
+    """
+    Refills at `rate` units per minute and holds at most one minute's
+    worth. A rate of 0 means unlimited. The level may go negative when a
+    call turns out to cost more than was reserved for it; later calls
+    then wait for the debt to refill.
+    """
+
+    def __init__(self, rate: float = 0.0):
+        self.rate = rate
+        self.level = rate
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.rate:
+            self.level = min(
+                self.rate,
+                self.level + (now - self.updated) * self.rate / 60,
+            )
+        self.updated = now
+
+    def set_rate(self, rate: float, now: float):
+        self._refill(now)
+        if not self.rate:
+            self.level = rate
+        self.rate = rate
+        self.level = min(self.level, rate)
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Seconds until `amount` can be taken; 0 if it can be now.
+        """
+
+        if not self.rate:
+            return 0.0
+
+        self._refill(now)
+        # A call bigger than the whole bucket only waits for a full one
+        amount = min(amount, self.rate)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60 / self.rate
+
+    def take(self, amount: float):
+        if self.rate:
+            self.level -= amount
+
+    def give(self, amount: float):
+        if self.rate:
+            self.level = min(self.rate, self.level + amount)
+
+    def clamp(self, remaining: float):
+        # The provider's count wins when it has less left than we think
+        if self.rate:
+            self.level = min(self.level, remaining)
+
+
+# ---------------------------
+# Rate Limiter
+# ---------------------------
+
+class RateLimiter:
+    """
+    Process-wide admission control for LLM requests.
+
+    Each HTTP attempt takes one request and its estimated tokens from the
+    per-minute buckets and one slot of an adaptive concurrency limit.
+    The limit grows by about one per round of successful calls and
+    halves on a 429, at most once per round. Calls that cannot start
+    yet queue by priority, so an interactive run waiting behind a batch
+    job goes first.
+
+    `rpm` / `tpm` are upper bounds; 0 leaves the requests bucket off and
+    takes the token limit from the provider's x-ratelimit-* headers.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 0.0,
+        tpm: float = 0.0,
+        initial_concurrency: int = INITIAL_CONCURRENCY,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(initial_concurrency)
+        self.in_flight = 0
+
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.completion_estimate = float(COMPLETION_TOKENS_GUESS)
+
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._low_tokens = False
+
+        self.counters = {
+            "admitted": 0,
+            "delayed": 0,
+            "rate_limited": 0,
+            "decreases": 0,
+            "wait_seconds": 0.0,
+        }
+
+    # ---------------------------
+    # Estimates
+    # ---------------------------
+
+    def estimate_tokens(self, payload: dict) -> int:
+        """
+        Prompt tokens from the message text plus the running average
+        completion size, reserved before the request is sent.
+        """
+
+        chars = sum(len(message["content"]) for message in payload["messages"])
+        return chars // CHARS_PER_TOKEN + round(self.completion_estimate)
+
+    def settle(self, reserved: int, prompt_tokens=None, completion_tokens=None):
+        """
+        Correct the token bucket once the real usage of a call is known.
+        """
+
+        if prompt_tokens is None or completion_tokens is None:
+            return
+
+        with self._cond:
+            used = prompt_tokens + completion_tokens
+            if used > reserved:
+                self.tokens.take(used - reserved)
+            else:
+                self.tokens.give(reserved - used)
+
+            self.completion_estimate += 0.2 * (
+                completion_tokens - self.completion_estimate
+            )
+            self._cond.notify_all()
+
+    # ---------------------------
+    # Admission
+    # ---------------------------
+
+    def _delay(self, tokens: float, now: float) -> float:
+        return max(
+            self._blocked_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(tokens, now),
+        )
+
+    def acquire(self, tokens: int, priority: int = None):
+        """
+        Block until a request costing `tokens` may be sent. Returns a
+        lease; call lease.release(response) once the response is in.
+        """
+
+        if priority is None:
+            priority = _priority.get()
+
+        start = time.monotonic()
+
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+
+            try:
+                while True:
+                    timeout = None
+                    if (self._waiting[0] == ticket
+                            and self.in_flight < int(self.limit)):
+                        timeout = self._delay(tokens, time.monotonic())
+                        if timeout <= 0:
+                            break
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiting)
+            self.in_flight += 1
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+            waited = time.monotonic() - start
+            self.counters["admitted"] += 1
+            self.counters["delayed"] += 1 if waited > 0.001 else 0
+            self.counters["wait_seconds"] += waited
+
+            # The next in line may be able to start as well
+            self._cond.notify_all()
+
+        return _Lease(self, tokens, start + waited, waited)
+
+    def _release(self, lease, response):
+        with self._cond:
+            at_limit = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if response is not None:
+                self._observe_headers(response.headers, now)
+
+                if response.status_code == 429:
+                    self._throttled(lease, response, now)
+                elif response.status_code < 500:
+                    # Only grow while the limit is actually the constraint
+                    # and the provider still has tokens to spare
+                    if at_limit and not self._low_tokens:
+                        self.limit = min(
+                            self.max_concurrency, self.limit + 1 / self.limit
+                        )
+
+            self._cond.notify_all()
+
+    def _throttled(self, lease, response, now: float):
+        self.counters["rate_limited"] += 1
+
+        # Rejected requests are not billed for tokens
+        self.tokens.give(lease.tokens)
+
+        # Every call already in flight when the limit was cut will see
+        # the same 429; only the first one of the round counts
+        if lease.started >= self._last_decrease:
+            self.limit = max(
+                self.min_concurrency, self.limit * DECREASE_FACTOR
+            )
+            self._last_decrease = now
+            self.counters["decreases"] += 1
+
+        retry_after = _header_seconds(response.headers, "Retry-After")
+        if retry_after is not None:
+            self._pause(retry_after, now)
+
+    def _observe_headers(self, headers, now: float):
+        limit_tokens = _header_float(headers, "x-ratelimit-limit-tokens")
+        if limit_tokens:
+            rate = limit_tokens * HEADROOM
+            if self.tpm:
+                rate = min(rate, self.tpm)
+            if rate != self.tokens.rate:
+                self.tokens.set_rate(rate, now)
+
+        remaining_tokens = _header_float(headers, "x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            reserve = limit_tokens * (1 - HEADROOM) if limit_tokens else 0.0
+            self.tokens.clamp(remaining_tokens - reserve)
+            self._low_tokens = remaining_tokens < reserve
+
+        # Groq's request limit is per day, so it is honoured as a gate
+        # when exhausted rather than turned into a per-minute bucket
+        remaining_requests = _header_float(
+            headers, "x-ratelimit-remaining-requests"
+        )
+        if remaining_requests is not None and remaining_requests < 1:
+            reset = _header_seconds(headers, "x-ratelimit-reset-requests")
+            if reset is not None:
+                self._pause(reset, now)
+
+    def _pause(self, seconds: float, now: float):
+        seconds = min(seconds, MAX_PAUSE)
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    # ---------------------------
+    # Reporting
+    # ---------------------------
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self.tokens._refill(now)
+            self.requests._refill(now)
+
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiting),
+                "rpm": self.requests.rate,
+                "tpm": round(self.tokens.rate),
+                "tokens_available": round(self.tokens.level),
+                "completion_estimate": round(self.completion_estimate),
+                **self.counters,
+                "wait_seconds": round(self.counters["wait_seconds"], 3),
+            }
+
+
+class _Lease:
+
+    __slots__ = ("limiter", "tokens", "started", "waited")
+
+    def __init__(self, limiter, tokens, started, waited):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.started = started
+        self.waited = waited
+
+    def release(self, response=None):
+        self.limiter._release(self, response)
+
+
+# ---------------------------
+# Priority
+# ---------------------------
+
+class _Priority:
+
+    def __init__(self, level):
+        self.level = level
+        self._token = None
+
+    def __enter__(self):
+        self._token = _priority.set(self.level)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _priority.reset(self._token)
+        return False
+
+
+def priority(level: int):
+    """
+    Context manager giving every LLM call made inside it (including from
+    pipeline phases on worker threads) the priority `level`.
+    """
+
+    return _Priority(level)
+
+
+# ---------------------------
+# Shared Limiter
+# ---------------------------
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Limiter shared by every LLMHandler in the process, and so by every
+    Streamlit session. NETARCHITECT_LLM_RPM / NETARCHITECT_LLM_TPM cap
+    the per-minute requests and tokens, NETARCHITECT_LLM_MAX_CONCURRENCY
+    the number of requests in flight.
+    """
+    global _default_limiter
+
+    if _default_limiter is None:
+        with _default_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter(
+                    rpm=float(os.getenv("NETARCHITECT_LLM_RPM", "0")),
+                    tpm=float(os.getenv("NETARCHITECT_LLM_TPM", "0")),
+                    max_concurrency=int(
+                        os.getenv("NETARCHITECT_LLM_MAX_CONCURRENCY", "32")
+                    ),
+                )
+
+    return _default_limiter
@@ -0,0 +1,122 @@
+import json
+
+from agents.batch_runner import BatchCheckpoint, run_batch
+from agents.deterministic_engine import AGENTS
+
+
+OFFLINE = {agent: "deterministic" for agent in AGENTS}
+
+FIELDS = (
+    "id",
+    "num_employees",
+    "office_size_sqft",
+    "security_level",
+    "growth_rate_percent",
+    "cloud_preference",
+    "budget",
+)
+
+
+def _profile(item_id, employees=120):
+    return {
+        "id": item_id,
+        "num_employees": employees,
+        "office_size_sqft": 8000,
+        "security_level": "Medium",
+        "growth_rate_percent": 10,
+        "cloud_preference": "Hybrid",
+        "budget": 900000,
+    }
+
+
+def _records(path):
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    return {record["index"]: record for record in records}
+
+
+def _run(source, output, **kwargs):
+    return run_batch(
+        source, None, str(output), backends=OFFLINE, llm_concurrency=2,
+        **kwargs,
+    )
+
+
+def test_bad_csv_row_is_recorded_and_batch_continues(tmp_path):
+    source = tmp_path / "input.csv"
+    rows = [_profile("a"), _profile("b", employees="abc"), _profile("c")]
+    source.write_text(
+        ",".join(FIELDS) + "\n"
+        + "".join(
+            ",".join(str(row[field]) for field in FIELDS) + "\n"
+            for row in rows
+        )
+    )
+    output = tmp_path / "out.jsonl"
+    checkpoint = tmp_path / "checkpoint.json"
+
+    summary = _run(source, output, checkpoint_path=str(checkpoint))
+
+    assert summary == {"ok": 2, "failed": 1, "skipped": 0}
+    records = _records(output)
+    assert records[1]["status"] == "failed"
+    assert records[1]["id"] == "b"
+    assert records[1]["error"].startswith("ValueError")
+    assert records[0]["status"] == records[2]["status"] == "ok"
+    assert BatchCheckpoint(str(checkpoint)).watermark == 3
+
+
+def test_truncated_jsonl_line_is_recorded_and_batch_continues(tmp_path):
+    source = tmp_path / "input.jsonl"
+    source.write_text(
+        json.dumps(_profile("a")) + "\n"
+        + json.dumps(_profile("b"))[:40] + "\n"
+        + json.dumps(_profile("c")) + "\n"
+    )
+    output = tmp_path / "out.jsonl"
+
+    summary = _run(source, output)
+
+    assert summary == {"ok": 2, "failed": 1, "skipped": 0}
+    records = _records(output)
+    assert records[1]["status"] == "failed"
+    assert "JSONDecodeError" in records[1]["error"]
+
+
+def test_resume_skips_finished_items(tmp_path):
+    profiles = [_profile(str(i), employees=50 + i) for i in range(4)]
+    output = tmp_path / "out.jsonl"
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    # A first run that stopped after items 0, 1 and 3 had been written
+    state = BatchCheckpoint(checkpoint)
+    for index in (0, 1, 3):
+        state.mark_done(index)
+
+    summary = _run(
+        [dict(p) for p in profiles], output, checkpoint_path=checkpoint
+    )
+
+    assert summary == {"ok": 1, "failed": 0, "skipped": 3}
+    assert list(_records(output)) == [2]
+
+    summary = _run(
+        [dict(p) for p in profiles], output, checkpoint_path=checkpoint
+    )
+    assert summary == {"ok": 0, "failed": 0, "skipped": 4}
+
+
+def test_checkpoint_watermark_only_advances_over_contiguous_items(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = BatchCheckpoint(path)
+
+    checkpoint.mark_done(1)
+    checkpoint.mark_done(2)
+    assert checkpoint.watermark == 0
+    assert not checkpoint.is_done(0)
+
+    checkpoint.mark_done(0)
+    reloaded = BatchCheckpoint(path)
+    assert reloaded.watermark == 3
+    assert reloaded.done_ahead == set()
+    assert reloaded.is_done(2) and not reloaded.is_done(3)
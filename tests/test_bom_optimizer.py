@@ -0,0 +1,90 @@
+import numpy as np
+
+from agents import bom_optimizer
+from agents.bom_optimizer import BOMOptimizer, pareto_mask
+from agents.deterministic_engine import AGENTS
+from agents.system_pipeline import run_full_pipeline
+
+
+OFFLINE = {agent: "deterministic" for agent in AGENTS}
+
+
+def _brute_force_mask(cost, score):
+    keep = []
+    for i in range(len(cost)):
+        dominated = any(
+            cost[j] <= cost[i] and score[j] >= score[i]
+            and (cost[j] < cost[i] or score[j] > score[i])
+            for j in range(len(cost))
+        )
+        # Of identical points only the first is kept
+        repeated = any(
+            cost[j] == cost[i] and score[j] == score[i] for j in range(i)
+        )
+        keep.append(not dominated and not repeated)
+    return np.array(keep, dtype=bool)
+
+
+def test_pareto_mask_matches_brute_force_with_ties_and_duplicates():
+    rng = np.random.default_rng(0)
+
+    for size in (1, 2, 5, 20, 60):
+        for _ in range(50):
+            # A small value range makes equal costs, scores and points common
+            cost = rng.integers(0, 8, size).astype(float)
+            score = rng.integers(0, 8, size).astype(float)
+
+            assert np.array_equal(
+                pareto_mask(cost, score), _brute_force_mask(cost, score)
+            ), (cost, score)
+
+
+def _frontier_points(search):
+    return sorted(
+        (point["total_cost"], point["performance"])
+        for point in search["frontier"]
+    )
+
+
+def test_pruned_search_finds_the_exhaustive_frontier(monkeypatch):
+    profiles = [(40, 3000, "Low"), (480, 15000, "Medium"), (1000, 50000, "High")]
+
+    for employees, sqft, security in profiles:
+        infra = run_full_pipeline(
+            {
+                "num_employees": employees,
+                "office_size_sqft": sqft,
+                "security_level": security,
+                "growth_rate_percent": 10,
+                "cloud_preference": "Hybrid",
+                "budget": 1500000,
+            },
+            None, backends=OFFLINE, render=False,
+        )["initial_design"]
+
+        for vendor in ("Cisco", "TP-Link"):
+            pruned = BOMOptimizer(respect_capacity=False).search_vendor(
+                vendor, infra
+            )
+
+            # Keep every combination, then take its frontier by brute force
+            with monkeypatch.context() as patch:
+                patch.setattr(
+                    bom_optimizer, "pareto_mask",
+                    lambda cost, score: np.ones(len(cost), dtype=bool),
+                )
+                everything = BOMOptimizer(
+                    respect_capacity=False
+                ).search_vendor(vendor, infra)
+
+            points = everything["frontier"]
+            keep = _brute_force_mask(
+                [p["total_cost"] for p in points],
+                [p["performance"] for p in points],
+            )
+            exhaustive = sorted(
+                (p["total_cost"], p["performance"])
+                for p, k in zip(points, keep) if k
+            )
+
+            assert _frontier_points(pruned) == exhaustive, (employees, vendor)
@@ -0,0 +1,69 @@
+import itertools
+
+from agents.architecture_agent import _select_with_llm
+from utils.catalog_loader import get_catalog
+from utils.canonical_profile import canonicalize_profile, component_counts
+
+
+def _profile(employees, sqft, security="Medium", growth=10):
+    return {
+        "num_employees": employees,
+        "office_size_sqft": sqft,
+        "security_level": security,
+        "growth_rate_percent": growth,
+        "cloud_preference": "Hybrid",
+        "budget": 700000,
+    }
+
+
+def _options(profile, loader):
+    users = profile["num_employees"]
+    sqft = profile["office_size_sqft"]
+    return [
+        [d["model"] for d in loader.filter_routers(vendor, users, sqft)]
+        + [d["model"] for d in loader.filter_firewalls(vendor, users)]
+        for vendor in ("Cisco", "TP-Link")
+    ]
+
+
+def test_representative_keeps_counts_and_catalog_options():
+    loader = get_catalog()
+
+    for employees, sqft, security in itertools.product(
+        range(10, 1001, 7), range(1000, 50001, 1700), ("Low", "High")
+    ):
+        profile = _profile(employees, sqft, security)
+        canonical = canonicalize_profile(profile, loader)
+
+        assert canonical["num_employees"] >= employees
+        assert canonical["office_size_sqft"] >= sqft
+        assert component_counts(canonical) == component_counts(profile)
+        assert _options(canonical, loader) == _options(profile, loader)
+        assert canonicalize_profile(canonical, loader) == canonical
+
+
+class _RecordingLLM:
+
+    def __init__(self):
+        self.prompts = []
+
+    def call(self, system_prompt, user_prompt):
+        self.prompts.append((system_prompt, user_prompt))
+        return {}
+
+
+def test_profiles_in_one_class_send_the_same_prompt():
+    loader = get_catalog()
+    llm = _RecordingLLM()
+
+    small = _profile(97, 4600, growth=6)
+    large = _profile(100, 5900, growth=9)
+    assert (
+        canonicalize_profile(small, loader)
+        == canonicalize_profile(large, loader)
+    )
+
+    for profile in (small, large):
+        _select_with_llm(profile, component_counts(profile), loader, llm)
+
+    assert llm.prompts[0] == llm.prompts[1]
@@ -0,0 +1,62 @@
+import pytest
+
+from agents.deterministic_engine import AGENTS
+from agents.system_pipeline import EVENT_KINDS, iter_pipeline
+
+
+OFFLINE = {agent: "deterministic" for agent in AGENTS}
+
+PROFILE = {
+    "num_employees": 120,
+    "office_size_sqft": 6000,
+    "security_level": "High",
+    "growth_rate_percent": 10,
+    "cloud_preference": "Cloud",
+    "budget": 700000,
+}
+
+
+class _FailingLLM:
+
+    def call(self, system_prompt, user_prompt):
+        raise RuntimeError("provider down")
+
+
+def test_events_arrive_in_order_and_end_with_the_result():
+    events = list(iter_pipeline(PROFILE, None, backends=OFFLINE))
+    kinds = [event.kind for event in events]
+
+    # Every kind shows up, none before a kind listed ahead of it
+    assert set(kinds) == set(EVENT_KINDS)
+    assert kinds[-1] == "result"
+    assert kinds.count("result") == 1
+    for earlier, later in [
+        ("requirements", "result"),
+        ("architecture", "analysis"),
+        ("analysis", "optimization"),
+        ("optimization", "deployment"),
+        ("deployment", "insight_field"),
+        ("insight_field", "insights"),
+        ("optimization", "diagram"),
+    ]:
+        assert kinds.index(earlier) < kinds.index(later)
+
+    fields = {
+        event.data["key"]: event.data["text"]
+        for event in events if event.kind == "insight_field"
+    }
+    result = events[-1].data
+    assert fields == result["insights"]
+
+
+def test_a_failing_phase_is_raised_from_the_generator():
+    backends = dict(OFFLINE, requirements="llm")
+    kinds = []
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        for event in iter_pipeline(
+            PROFILE, _FailingLLM(), backends=backends, render=False
+        ):
+            kinds.append(event.kind)
+
+    assert "result" not in kinds
@@ -0,0 +1,47 @@
+import json
+
+from models.json_stream import IncrementalJSONParser, find_object_bounds
+
+
+DOCUMENT = {
+    "summary": "Use {braces} and \"quotes\" freely, even a } alone",
+    "scores": {"cisco": 82, "tplink": [1, {"x": "]"}]},
+    "needed": True,
+    "budget": 1250000.5,
+    "note": None,
+}
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_pairs_come_out_whatever_the_chunk_boundaries():
+    text = "```json\n" + json.dumps(DOCUMENT) + "\n```"
+
+    for size in (1, 2, 3, 7, len(text)):
+        parser = IncrementalJSONParser()
+        pairs = []
+        for chunk in _chunks(text, size):
+            pairs.extend(parser.feed(chunk))
+
+        assert pairs == list(DOCUMENT.items()), size
+        assert parser.done
+
+
+def test_a_pair_is_emitted_as_soon_as_its_value_closes():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"a": "x{y') == []
+    assert parser.feed('}", "b": [1, ') == [("a", "x{y}")]
+    assert parser.feed('2], "c": 3') == [("b", [1, 2])]
+    assert parser.feed("}") == [("c", 3)]
+
+
+def test_object_bounds_skip_braces_inside_strings():
+    text = 'Sure! {"a": "}{", "b": {"c": "\\"}"}} trailing }'
+
+    start, end = find_object_bounds(text)
+
+    assert json.loads(text[start:end]) == {"a": "}{", "b": {"c": '"}'}}
+    assert find_object_bounds('{"a": "never closes') == (0, None)
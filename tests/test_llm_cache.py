@@ -0,0 +1,63 @@
+from models.llm_cache import LLMResponseCache
+
+
+def test_round_trip_through_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+
+    LLMResponseCache(path=path).set("key", {"answer": 1})
+
+    # A new instance has an empty memory tier, so this hit comes from disk
+    cache = LLMResponseCache(path=path)
+    assert cache.get("key") == {"answer": 1}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_unusable_disk_falls_back_to_memory(tmp_path):
+    # A regular file where the cache directory should be
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    cache = LLMResponseCache(path=str(blocker / "cache.sqlite3"))
+
+    cache.set("key", {"answer": 1})
+
+    assert cache.get("key") == {"answer": 1}
+    assert cache.get("other") is None
+    stats = cache.stats()
+    assert stats["disk_enabled"] is False
+    assert stats["disk_errors"] == 1
+
+
+def test_corrupt_database_falls_back_to_memory(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    path.write_text("not a database" * 100)
+    cache = LLMResponseCache(path=str(path))
+
+    assert cache.get("key") is None
+    cache.set("key", {"answer": 1})
+    assert cache.get("key") == {"answer": 1}
+    assert cache.stats()["disk_enabled"] is False
+
+
+def test_answers_are_kept_apart_per_endpoint():
+    from benchmarks.fake_llm import FakeLLMHandler
+
+    cache = LLMResponseCache(path=":memory:")
+    mock = FakeLLMHandler(cache=cache, base_url="http://127.0.0.1:8008")
+    real = FakeLLMHandler(cache=cache, base_url="https://api.groq.com")
+
+    system = "Requirement Analysis Agent"
+    user = "Business Input: " + repr({
+        "num_employees": 120,
+        "office_size_sqft": 6000,
+        "security_level": "Low",
+        "growth_rate_percent": 10,
+        "cloud_preference": "Cloud",
+        "budget": 700000,
+    })
+
+    mock.call(system, user)
+    assert cache.stats()["writes"] == 1
+
+    real.call(system, user)
+    assert cache.stats()["writes"] == 2
+    assert real.get_stats()["cache_hits"] == 0
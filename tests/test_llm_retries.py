@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from benchmarks.mock_groq_server import MockConfig, start_mock_server
+from models.llm_cache import LLMResponseCache
+from models.llm_handler import LLMHandler
+from models.rate_limiter import RateLimiter
+
+
+SYSTEM_PROMPT = "Requirement Analysis Agent"
+USER_PROMPT = "Business Input: " + repr({
+    "num_employees": 120,
+    "office_size_sqft": 6000,
+    "security_level": "Low",
+    "growth_rate_percent": 10,
+    "cloud_preference": "Cloud",
+    "budget": 700000,
+})
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+
+    def start(**config):
+        server = start_mock_server(MockConfig(latency_ms=0, **config))
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _handler(server, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    return LLMHandler(
+        "test-key",
+        "test-model",
+        base_url=server.base_url,
+        cache=LLMResponseCache(enabled=False),
+        limiter=RateLimiter(),
+        **kwargs,
+    )
+
+
+def test_server_errors_are_retried_until_one_succeeds(mock_server):
+    # With this seed the first two requests fail and the third succeeds
+    server = mock_server(error_rate=0.5, seed=7)
+    llm = _handler(server)
+
+    answer = llm.call(SYSTEM_PROMPT, USER_PROMPT)
+
+    assert "expected_bandwidth_mbps" in answer
+    assert llm.last_call_stats["attempts"] == 3
+    assert server.stats.snapshot()["errors"] == 2
+
+
+def test_429_waits_for_retry_after_and_gives_up_after_max_retries(
+    mock_server,
+):
+    server = mock_server(rate_limit_rate=1.0, retry_after=0.2)
+    # Jittered backoff could sleep for seconds; Retry-After says 0.2 s
+    llm = _handler(server, max_retries=2, backoff_base=10)
+
+    start = time.monotonic()
+    with pytest.raises(Exception, match="Rate limit reached"):
+        llm.call(SYSTEM_PROMPT, USER_PROMPT)
+    elapsed = time.monotonic() - start
+
+    assert llm.last_call_stats["attempts"] == 3
+    assert llm.last_call_stats["status_code"] == 429
+    assert server.stats.snapshot()["rate_limited"] == 3
+    assert 0.4 <= elapsed < 2
+
+
+def test_persistent_server_errors_give_up_after_max_retries(mock_server):
+    server = mock_server(error_rate=1.0)
+    llm = _handler(server, max_retries=3)
+
+    with pytest.raises(Exception, match="Internal server error"):
+        llm.call(SYSTEM_PROMPT, USER_PROMPT)
+
+    assert llm.last_call_stats["attempts"] == 4
+    assert server.stats.snapshot()["errors"] == 4
+
+
+def test_client_errors_are_not_retried(mock_server):
+    server = mock_server()
+    llm = _handler(server)
+
+    # The mock answers 400 to a prompt it has no answer for
+    with pytest.raises(Exception, match="Mock cannot answer"):
+        llm.call("Unknown Agent", "{}")
+
+    assert llm.last_call_stats["attempts"] == 1
+    assert server.stats.snapshot()["requests"] == 1
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from utils.phase_scheduler import Phase, PhaseScheduler
+
+
+def test_rejects_cycles_missing_and_duplicate_phases():
+    with pytest.raises(ValueError, match="Cycle"):
+        PhaseScheduler([
+            Phase("a", lambda c: 1, requires=("c",)),
+            Phase("b", lambda a: 1, requires=("a",)),
+            Phase("c", lambda b: 1, requires=("b",)),
+        ])
+
+    with pytest.raises(ValueError, match="unknown phase 'missing'"):
+        PhaseScheduler([Phase("a", lambda missing: 1, requires=("missing",))])
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        PhaseScheduler([Phase("a", lambda: 1), Phase("a", lambda: 2)])
+
+
+def test_dependents_run_after_their_inputs_with_their_outputs():
+    log = []
+    lock = threading.Lock()
+
+    def step(name, value):
+        def run(**inputs):
+            with lock:
+                log.append(("start", name))
+            # Long enough that a phase started too early would be seen
+            time.sleep(0.02)
+            with lock:
+                log.append(("end", name))
+            return value + sum(inputs.values())
+        return run
+
+    scheduler = PhaseScheduler([
+        Phase("sum", step("sum", 0), requires=("left", "right")),
+        Phase("left", step("left", 1)),
+        Phase("right", step("right", 2), requires=("root",)),
+        Phase("root", step("root", 10)),
+    ])
+
+    done = []
+    outputs, _ = scheduler.run(
+        on_phase_done=lambda name, output, ms: done.append(name)
+    )
+
+    assert outputs == {"root": 10, "left": 1, "right": 12, "sum": 13}
+    for phase in scheduler.phases.values():
+        for dep in phase.requires:
+            assert (
+                log.index(("end", dep)) < log.index(("start", phase.name))
+            )
+    # Independent phases overlap
+    assert log.index(("start", "root")) < log.index(("end", "left"))
+    assert done[-1] == "sum"
+    assert sorted(done) == sorted(outputs)
+
+
+def test_a_failing_phase_is_raised_and_its_dependents_never_run():
+    ran = []
+
+    def fail():
+        raise KeyError("broken")
+
+    scheduler = PhaseScheduler([
+        Phase("a", fail),
+        Phase("b", lambda a: ran.append("b"), requires=("a",)),
+    ])
+
+    with pytest.raises(KeyError, match="broken"):
+        scheduler.run()
+    assert ran == []
+
+
+def test_timings_cover_every_phase_plus_the_total():
+    scheduler = PhaseScheduler([
+        Phase("a", lambda: time.sleep(0.02)),
+        Phase("b", lambda: time.sleep(0.02)),
+        Phase("c", lambda a, b: None, requires=("a", "b")),
+    ])
+
+    _, timings = scheduler.run()
+
+    assert set(timings) == {"a", "b", "c", "total"}
+    assert all(isinstance(ms, float) for ms in timings.values())
+    # a and b run side by side, so the total is less than their sum
+    assert timings["a"] >= 15 and timings["b"] >= 15
+    assert max(timings["a"], timings["b"]) <= timings["total"]
+    assert timings["total"] < timings["a"] + timings["b"] + timings["c"] + 15
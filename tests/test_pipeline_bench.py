@@ -0,0 +1,42 @@
+import copy
+
+import pytest
+
+from benchmarks import pipeline_bench
+
+
+def _report(runs, p50, p95, repeat=3):
+    return {
+        "meta": {"repeat": repeat, "llm_latency_ms": 0.0},
+        "grid": {"num_employees": [25]},
+        "stages": {
+            "agent.pdf": {
+                "runs": runs, "p50_ms": p50, "p95_ms": p95, "peak_kb": None,
+            },
+        },
+    }
+
+
+def test_refuses_baseline_with_another_repeat():
+    with pytest.raises(ValueError, match="repeat"):
+        pipeline_bench.compare(
+            _report(16, 40, 50, repeat=1), _report(48, 40, 50), 0.25
+        )
+
+
+def test_p95_is_only_gated_with_enough_samples():
+    baseline = _report(48, 40.0, 50.0)
+    noisy_tail = _report(48, 41.0, 120.0)
+
+    assert pipeline_bench.compare(noisy_tail, baseline, 0.25) == []
+
+    slower = copy.deepcopy(noisy_tail)
+    slower["stages"]["agent.pdf"]["p50_ms"] = 60.0
+    assert pipeline_bench.compare(slower, baseline, 0.25) == [
+        "agent.pdf p50_ms: 40.0 -> 60.0"
+    ]
+
+    many = pipeline_bench.MIN_P95_RUNS
+    assert pipeline_bench.compare(
+        _report(many, 41.0, 120.0), _report(many, 40.0, 50.0), 0.25
+    ) == ["agent.pdf p95_ms: 50.0 -> 120.0"]
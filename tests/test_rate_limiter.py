@@ -0,0 +1,62 @@
+import threading
+import time
+
+from models.rate_limiter import BATCH, INTERACTIVE, RateLimiter, priority
+
+
+class _Response:
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _wait_for(limiter, waiting):
+    deadline = time.monotonic() + 5
+    while limiter.snapshot()["waiting"] < waiting:
+        assert time.monotonic() < deadline, "callers never queued"
+        time.sleep(0.005)
+
+
+def test_interactive_calls_are_admitted_before_queued_batch_calls():
+    limiter = RateLimiter(initial_concurrency=1)
+    order = []
+
+    def call(tag, level):
+        with priority(level):
+            lease = limiter.acquire(10)
+        order.append(tag)
+        lease.release()
+
+    # Hold the only slot so every caller below has to queue
+    held = limiter.acquire(10)
+
+    threads = []
+    for tag, level in [("b0", BATCH), ("b1", BATCH), ("i", INTERACTIVE)]:
+        thread = threading.Thread(target=call, args=(tag, level))
+        thread.start()
+        threads.append(thread)
+        _wait_for(limiter, len(threads))
+
+    held.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["i", "b0", "b1"]
+
+
+def test_a_burst_of_429s_halves_the_limit_once_and_pauses():
+    limiter = RateLimiter(initial_concurrency=8)
+
+    leases = [limiter.acquire(100) for _ in range(4)]
+    for lease in leases:
+        lease.release(_Response(429, {"Retry-After": "0.2"}))
+
+    snapshot = limiter.snapshot()
+    assert snapshot["concurrency_limit"] == 4
+    assert snapshot["decreases"] == 1
+    assert snapshot["rate_limited"] == 4
+
+    start = time.monotonic()
+    limiter.acquire(100).release()
+    assert time.monotonic() - start >= 0.15
@@ -0,0 +1,75 @@
+import copy
+import threading
+
+import pytest
+
+from agents.deterministic_engine import AGENTS
+from agents.system_pipeline import run_full_pipeline
+from utils import report_jobs
+from utils.report_jobs import ReportJobManager
+
+
+OFFLINE = {agent: "deterministic" for agent in AGENTS}
+
+
+@pytest.fixture(scope="module")
+def result():
+    profile = {
+        "num_employees": 120,
+        "office_size_sqft": 6000,
+        "security_level": "High",
+        "growth_rate_percent": 10,
+        "cloud_preference": "Cloud",
+        "budget": 700000,
+    }
+    return run_full_pipeline(profile, None, backends=OFFLINE, render=False)
+
+
+def test_same_result_is_built_once(result, monkeypatch):
+    release = threading.Event()
+    builds = []
+
+    def build(result):
+        builds.append(result)
+        release.wait(5)
+        return b"%PDF-fake"
+
+    monkeypatch.setattr(report_jobs, "build_report", build)
+    jobs = ReportJobManager()
+
+    first = jobs.submit(result)
+    # An equal result (same report_key) joins the build under way
+    second = jobs.submit(copy.deepcopy(result))
+    assert second is first
+    assert jobs.status(result) == "running"
+
+    release.set()
+    assert jobs.get(copy.deepcopy(result), timeout=5) == b"%PDF-fake"
+    assert jobs.status(result) == "ready"
+    assert len(builds) == 1
+
+
+def test_failed_build_raises_and_is_retried(result, monkeypatch):
+    attempts = []
+
+    def build(result):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("font missing")
+        return b"%PDF-fake"
+
+    monkeypatch.setattr(report_jobs, "build_report", build)
+    jobs = ReportJobManager()
+
+    with pytest.raises(RuntimeError, match="font missing"):
+        jobs.get(result, timeout=5)
+    assert jobs.status(result) == "missing"
+
+    assert jobs.get(result, timeout=5) == b"%PDF-fake"
+    assert len(attempts) == 2
+
+
+def test_builds_a_real_pdf(result):
+    pdf = ReportJobManager().get(result, timeout=60)
+
+    assert pdf.startswith(b"%PDF")
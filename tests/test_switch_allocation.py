@@ -0,0 +1,60 @@
+import copy
+
+from agents.bom_optimizer import BOMOptimizer
+from agents.costing_agent import CostingAgent
+from agents.deterministic_engine import AGENTS
+from agents.performance_agent import PerformanceAgent
+from agents.system_pipeline import run_full_pipeline
+
+
+OFFLINE = {agent: "deterministic" for agent in AGENTS}
+
+VENDORS = (("cisco", "Cisco"), ("tplink", "TP-Link"))
+
+
+def _result(employees, sqft, cloud="Hybrid"):
+    profile = {
+        "num_employees": employees,
+        "office_size_sqft": sqft,
+        "security_level": "High",
+        "growth_rate_percent": 10,
+        "cloud_preference": cloud,
+        "budget": 1500000,
+    }
+    return run_full_pipeline(profile, None, backends=OFFLINE, render=False)
+
+
+def test_cost_prices_every_allocated_switch():
+    # Both profiles need more switches than the design asks for
+    for employees, sqft in ((1000, 50000), (480, 60000)):
+        result = _result(employees, sqft)
+
+        for vendor_key, _ in VENDORS:
+            summary = result["topology"][vendor_key]["summary"]
+            breakdown = result["cost"][f"{vendor_key}_breakdown"]
+
+            assert summary["switches_added"] > 0
+            assert breakdown["switches"]["quantity"] == summary["switches"]
+
+
+def test_frontier_matches_costing_and_performance_agents():
+    # Few APs for many users, so some switch models run their uplink hot
+    infra = _result(1000, 2000, cloud="Cloud")["infra"]
+
+    for respect_capacity in (True, False):
+        search = BOMOptimizer(respect_capacity).search(infra)
+
+        for vendor_key, vendor in VENDORS:
+            for point in search[vendor_key]["frontier"]:
+                design = copy.deepcopy(infra)
+                design["infrastructure_design"]["selected_models"][
+                    vendor_key
+                ] = dict(point["models"])
+
+                cost, _ = CostingAgent().calculate_vendor_cost(vendor, design)
+                performance = PerformanceAgent().evaluate_vendor(
+                    vendor, design
+                )
+
+                assert cost == point["total_cost"]
+                assert performance == point["performance"]
@@ -0,0 +1,158 @@
+import json
+import math
+
+
+# Sizing rules shared with architecture_agent.design
+USERS_PER_ROUTER = 150
+USERS_PER_SWITCH = 48
+SQFT_PER_AP = 1500
+MIN_ACCESS_POINTS = 2
+
+# Growth is bucketed for the LLM; exact projections are recomputed after
+GROWTH_BAND_PERCENT = 5
+
+
+def component_counts(company_profile: dict) -> dict:
+    num_users = company_profile["num_employees"]
+    office_sqft = company_profile["office_size_sqft"]
+    security_level = company_profile["security_level"]
+
+    return {
+        "routers": max(1, math.ceil(num_users / USERS_PER_ROUTER)),
+        "switches": max(1, math.ceil(num_users / USERS_PER_SWITCH)),
+        "access_points": max(
+            MIN_ACCESS_POINTS, math.ceil(office_sqft / SQFT_PER_AP)
+        ),
+        "firewalls": 1 if security_level in ["Medium", "High"] else 0,
+        "ids_systems": 1 if security_level == "High" else 0,
+    }
+
+
+# ---------------------------
+# Equivalence Intervals
+# ---------------------------
+
+def _upper_bound(value: int, steps, thresholds) -> int:
+    """
+    Largest v >= value for which every ceil(v / step) and every
+    v <= threshold test still gives the same answer as for value.
+    """
+    bounds = [math.ceil(value / step) * step for step in steps]
+    bounds.extend(t for t in thresholds if t >= value)
+    return min(bounds)
+
+
+def _user_thresholds(loader):
+    thresholds = set()
+    for vendor in ("Cisco", "TP-Link"):
+        for category in ("routers", "firewalls"):
+            for device in loader.sorted_by_capacity(vendor, category):
+                thresholds.add(device["max_users_supported"])
+    return thresholds
+
+
+def _sqft_thresholds(loader):
+    thresholds = {MIN_ACCESS_POINTS * SQFT_PER_AP}
+    for vendor in ("Cisco", "TP-Link"):
+        for device in loader.sorted_by_capacity(vendor, "routers"):
+            thresholds.add(device["coverage_sqft"])
+    return thresholds
+
+
+def canonicalize_profile(company_profile: dict, loader) -> dict:
+    """
+    Map a profile to the representative of its equivalence class: the
+    largest employee count and office size that yield the same device
+    counts and the same eligible catalog options, with growth rounded up
+    to its band. Budget is dropped because it never reaches model
+    selection; the optimizer applies it afterwards.
+
+    Profiles in the same class produce byte-identical prompts, so they
+    share cached LLM responses.
+    """
+
+    num_users = company_profile["num_employees"]
+    office_sqft = company_profile["office_size_sqft"]
+    growth = company_profile["growth_rate_percent"]
+
+    users_rep = _upper_bound(
+        num_users,
+        (USERS_PER_ROUTER, USERS_PER_SWITCH),
+        _user_thresholds(loader),
+    )
+
+    # Offices up to MIN_ACCESS_POINTS * SQFT_PER_AP all get the minimum
+    # AP count, so the 1500 sqft step only applies above that
+    sqft_steps = (SQFT_PER_AP,) if office_sqft > (
+        MIN_ACCESS_POINTS * SQFT_PER_AP
+    ) else ()
+    sqft_rep = _upper_bound(
+        office_sqft,
+        sqft_steps,
+        _sqft_thresholds(loader),
+    )
+
+    growth_rep = math.ceil(growth / GROWTH_BAND_PERCENT) * GROWTH_BAND_PERCENT
+
+    return {
+        "num_employees": users_rep,
+        "office_size_sqft": sqft_rep,
+        "security_level": company_profile["security_level"],
+        "growth_rate_percent": growth_rep,
+        "cloud_preference": company_profile["cloud_preference"],
+    }
+
+
+def class_key(canonical_profile: dict) -> str:
+    return json.dumps(canonical_profile, sort_keys=True)
+
+
+# ---------------------------
+# Re-applying Exact Inputs
+# ---------------------------
+
+def reapply_requirements(
+    requirements: dict, company_profile: dict, canonical_profile: dict
+) -> dict:
+    """
+    Scale the bandwidth estimate made for the class representative back
+    to the actual head count.
+    """
+
+    adjusted = dict(requirements)
+    bandwidth = adjusted.get("expected_bandwidth_mbps")
+
+    if isinstance(bandwidth, (int, float)) and not isinstance(bandwidth, bool):
+        ratio = (
+            company_profile["num_employees"]
+            / canonical_profile["num_employees"]
+        )
+        adjusted["expected_bandwidth_mbps"] = round(bandwidth * ratio)
+
+    return adjusted
+
+
+def project_users(num_users: int, growth_rate_percent: float, years: int = 3):
+    growth = 1 + growth_rate_percent / 100
+    return [
+        round(num_users * growth ** year) for year in range(1, years + 1)
+    ]
+
+
+def reapply_scalability(scalability: dict, company_profile: dict) -> dict:
+    """
+    Replace the class-level user forecast with the compound growth of the
+    exact profile. The upgrade assessment is kept from the class.
+    """
+
+    adjusted = dict(scalability)
+    projected = project_users(
+        company_profile["num_employees"],
+        company_profile["growth_rate_percent"],
+    )
+
+    for year, users in enumerate(projected, start=1):
+        adjusted[f"year_{year}_users"] = users
+
+    return adjusted
+
@@ -1,5 +1,26 @@
+import bisect
 import json
 import os
+import threading
+from types import MappingProxyType
+
+
+CATEGORIES = ("routers", "switches", "access_points", "firewalls")
+
+# Field used to rank devices by capacity within each category
+CAPACITY_KEYS = {
+    "routers": "max_users_supported",
+    "switches": "max_devices_supported",
+    "access_points": "max_users_supported",
+    "firewalls": "max_users_supported",
+}
+
+
+def normalize_vendor(vendor_name: str) -> str:
+    """
+    "Cisco" -> "cisco", "TP-Link" / "tp-link" / "tplink" -> "tplink".
+    """
+    return vendor_name.lower().replace("-", "").replace(" ", "")
 
 
 class CatalogLoader:
@@ -7,21 +28,79 @@ class CatalogLoader:
         base_path = os.path.join(os.path.dirname(__file__), "..", "data")
 
         with open(os.path.join(base_path, "cisco_catalog.json"), "r") as f:
-            self.cisco = json.load(f)
+            self.cisco = self._freeze(json.load(f))
 
         with open(os.path.join(base_path, "tplink_catalog.json"), "r") as f:
-            self.tplink = json.load(f)
+            self.tplink = self._freeze(json.load(f))
+
+        self._vendors = MappingProxyType({
+            "cisco": self.cisco,
+            "tplink": self.tplink,
+        })
+
+        self._build_indexes()
+
+    # ---------------------------
+    # Index Construction
+    # ---------------------------
+
+    @staticmethod
+    def _freeze(catalog: dict):
+        # Device records are shared by every session and thread too, so
+        # they are read-only views; use as_dicts() for mutable copies
+        return MappingProxyType({
+            key: tuple(
+                MappingProxyType(item) if isinstance(item, dict) else item
+                for item in value
+            ) if isinstance(value, list) else value
+            for key, value in catalog.items()
+        })
+
+    def _build_indexes(self):
+        by_model = {}
+        by_price = {}
+        by_capacity = {}
+        capacity_values = {}
+        capacity_positions = {}
+
+        for vendor_key, catalog in self._vendors.items():
+            for category in CATEGORIES:
+                devices = catalog.get(category, ())
+                capacity_key = CAPACITY_KEYS[category]
+
+                for device in devices:
+                    by_model[(vendor_key, category, device["model"])] = device
+
+                by_price[(vendor_key, category)] = tuple(
+                    sorted(devices, key=lambda d: d["price"])
+                )
+
+                positions = tuple(sorted(
+                    range(len(devices)),
+                    key=lambda i: devices[i].get(capacity_key, 0),
+                ))
+                by_capacity[(vendor_key, category)] = tuple(
+                    devices[i] for i in positions
+                )
+                capacity_values[(vendor_key, category)] = tuple(
+                    devices[i].get(capacity_key, 0) for i in positions
+                )
+                capacity_positions[(vendor_key, category)] = positions
+
+        self._by_model = MappingProxyType(by_model)
+        self._by_price = MappingProxyType(by_price)
+        self._by_capacity = MappingProxyType(by_capacity)
+        self._capacity_values = MappingProxyType(capacity_values)
+        self._capacity_positions = MappingProxyType(capacity_positions)
 
     # ---------------------------
     # Basic Accessors
     # ---------------------------
 
     def get_vendor_catalog(self, vendor_name: str):
-        if vendor_name.lower() == "cisco":
-            return self.cisco
-        elif vendor_name.lower() == "tp-link":
-            return self.tplink
-        else:
+        try:
+            return self._vendors[normalize_vendor(vendor_name)]
+        except KeyError:
             raise ValueError("Unsupported vendor")
 
     def get_all_vendors(self):
@@ -30,39 +109,66 @@ class CatalogLoader:
             "TP-Link": self.tplink
         }
 
+    # ---------------------------
+    # Indexed Lookups
+    # ---------------------------
+
+    def get_device(self, vendor: str, category: str, model: str):
+        """
+        O(1) lookup by (vendor, category, model). Raises KeyError if the
+        model is not in the vendor's catalog.
+        """
+        return self._by_model[(normalize_vendor(vendor), category, model)]
+
+    def has_model(self, vendor: str, category: str, model) -> bool:
+        return (
+            isinstance(model, str)
+            and (normalize_vendor(vendor), category, model) in self._by_model
+        )
+
+    def sorted_by_price(self, vendor: str, category: str):
+        return self._by_price[(normalize_vendor(vendor), category)]
+
+    def sorted_by_capacity(self, vendor: str, category: str):
+        return self._by_capacity[(normalize_vendor(vendor), category)]
+
+    def highest_capacity(self, vendor: str, category: str):
+        return self.sorted_by_capacity(vendor, category)[-1]
+
+    def _at_least_capacity(self, vendor: str, category: str, minimum: int):
+        """
+        Devices with at least `minimum` capacity, in catalog order so the
+        option lists in prompts read as they always have.
+        """
+        vendor_key = normalize_vendor(vendor)
+        key = (vendor_key, category)
+        idx = bisect.bisect_left(self._capacity_values[key], minimum)
+        devices = self._vendors[vendor_key][category]
+        return [devices[i] for i in sorted(self._capacity_positions[key][idx:])]
+
     # ---------------------------
     # Filtering Helpers
     # ---------------------------
 
     def filter_routers(self, vendor: str, min_users: int, min_sqft: int):
-        catalog = self.get_vendor_catalog(vendor)
         return [
-            r for r in catalog["routers"]
-            if r["max_users_supported"] >= min_users
-            and r["coverage_sqft"] >= min_sqft
+            r for r in self._at_least_capacity(vendor, "routers", min_users)
+            if r["coverage_sqft"] >= min_sqft
         ]
 
     def filter_switches(self, vendor: str, min_devices: int):
-        catalog = self.get_vendor_catalog(vendor)
-        return [
-            s for s in catalog["switches"]
-            if s["max_devices_supported"] >= min_devices
-        ]
+        return list(self._at_least_capacity(vendor, "switches", min_devices))
 
     def filter_access_points(self, vendor: str, min_users: int, min_sqft: int):
-        catalog = self.get_vendor_catalog(vendor)
         return [
-            ap for ap in catalog["access_points"]
-            if ap["max_users_supported"] >= min_users
-            and ap["coverage_sqft"] >= min_sqft
+            ap for ap in self._at_least_capacity(
+                vendor, "access_points", min_users
+            )
+            if ap["coverage_sqft"] >= min_sqft
         ]
 
     def filter_firewalls(self, vendor: str, min_users: int):
-        catalog = self.get_vendor_catalog(vendor)
-        return [
-            fw for fw in catalog["firewalls"]
-            if fw["max_users_supported"] >= min_users
-        ]
+        return list(self._at_least_capacity(vendor, "firewalls", min_users))
 
     # ---------------------------
     # Budget-aware filtering
@@ -86,3 +192,35 @@ class CatalogLoader:
             "access_points": len(catalog["access_points"]),
             "firewalls": len(catalog["firewalls"])
         }
+
+
+def as_dicts(devices) -> list:
+    """
+    Plain dict copies of catalog records, for prompt text (a read-only
+    record prints as mappingproxy(...)) or for callers that modify them.
+    """
+    return [dict(device) for device in devices]
+
+
+# ---------------------------
+# Process-wide Shared Catalog
+# ---------------------------
+
+_shared_catalog = None
+_shared_lock = threading.Lock()
+
+
+def get_catalog() -> CatalogLoader:
+    """
+    Return the process-wide catalog, parsing the JSON files on first use.
+    The returned object is shared by every agent and session, so callers
+    must treat it as read-only.
+    """
+    global _shared_catalog
+
+    if _shared_catalog is None:
+        with _shared_lock:
+            if _shared_catalog is None:
+                _shared_catalog = CatalogLoader()
+
+    return _shared_catalog
@@ -0,0 +1,18 @@
+VENDORS = ["Cisco", "TP-Link"]
+
+# (name, analysis key, y-axis label) for the vendor comparison charts
+COMPARISON_CHARTS = [
+    ("Cost", "cost_analysis", "₹"),
+    ("Performance", "performance_scores", "Score"),
+    ("Risk", "security_scores", "Risk"),
+]
+
+
+def comparison_values(analysis: dict, key: str) -> list:
+    output = analysis.get(key, {})
+    if key == "cost_analysis":
+        return [
+            output.get("cisco_total_cost", 0),
+            output.get("tplink_total_cost", 0),
+        ]
+    return [output.get("cisco", 0), output.get("tplink", 0)]
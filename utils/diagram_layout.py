@@ -0,0 +1,136 @@
+# Groups larger than this are drawn as one "Switch_1 … Switch_21" node
+COLLAPSE_THRESHOLD = 8
+
+# Access points per switch drawn individually before they are grouped
+MAX_APS_PER_SWITCH = 4
+
+TIER_STYLES = {
+    "router": {"color": "#1f77b4", "y": 3.0},
+    "security": {"color": "#d62728", "y": 2.0},
+    "switch": {"color": "#2ca02c", "y": 1.0},
+    "access_point": {"color": "#ff7f0e", "y": 0.0},
+}
+
+
+# ---------------------------
+# Tiered Layout
+# ---------------------------
+
+def _group_label(prefix, first, last):
+    if first == last:
+        return f"{prefix}_{first}"
+    return f"{prefix}_{first} … {prefix}_{last}"
+
+
+def build_layout(topology, collapse_threshold=COLLAPSE_THRESHOLD):
+    """
+    Deterministic router -> firewall/IDS -> switches -> access points tree
+    drawn from a topology_engine allocation.
+
+    Each switch shows the APs and drops the allocator put on it, large
+    groups are collapsed into a single labelled node, and positions are
+    assigned in one pass over the leaves, so the cost is linear in the
+    number of drawn nodes.
+
+    Returns {"nodes": [...], "edges": [(parent_id, child_id), ...]} where
+    each node has id, label, tier, x and y; switch nodes also carry the
+    1-based (first, last) range of switches they stand for.
+    """
+
+    nodes = []
+    edges = []
+    children = {}
+
+    def add(node_id, label, tier, parent=None, **extra):
+        nodes.append({"id": node_id, "label": label, "tier": tier, **extra})
+        children[node_id] = []
+        if parent is not None:
+            edges.append((parent, node_id))
+            children[parent].append(node_id)
+        return node_id
+
+    summary = topology["summary"]
+
+    # Routers
+    routers = max(1, summary["routers"])
+    router_label = (
+        "Router" if routers == 1 else _group_label("Router", 1, routers)
+    )
+    parent = add("router", router_label, "router")
+
+    # Inline security appliances, in the allocator's order
+    for kind in topology["kinds"][1:]:
+        if kind == "firewall":
+            parent = add("firewall", "Firewall", "security", parent)
+        elif kind == "ids":
+            parent = add("ids", "IDS", "security", parent)
+
+    # Switches, each with the access points allocated to it
+    rows = topology["switches"]
+
+    if len(rows) > collapse_threshold:
+        switch_groups = [(
+            1,
+            len(rows),
+            sum(row["access_points"] for row in rows),
+            sum(row["drops"] for row in rows),
+        )]
+    else:
+        switch_groups = [
+            (i + 1, i + 1, row["access_points"], row["drops"])
+            for i, row in enumerate(rows)
+        ]
+
+    ap_number = 0
+    for first, last, ap_count, drops in switch_groups:
+        label = _group_label("Switch", first, last)
+        if drops:
+            label = f"{label}\n{drops} drops"
+        switch_id = add(
+            f"switch_{first}", label, "switch", parent, span=(first, last)
+        )
+
+        if ap_count == 0:
+            continue
+
+        if ap_count > MAX_APS_PER_SWITCH or first != last:
+            add(
+                f"ap_{ap_number + 1}",
+                _group_label("AP", ap_number + 1, ap_number + ap_count),
+                "access_point",
+                switch_id,
+            )
+        else:
+            for i in range(ap_count):
+                add(
+                    f"ap_{ap_number + i + 1}",
+                    f"AP_{ap_number + i + 1}",
+                    "access_point",
+                    switch_id,
+                )
+        ap_number += ap_count
+
+    # Leaves get consecutive x slots; parents sit over their children.
+    # Nodes are created parent-first, so walking them in reverse visits
+    # every child before its parent.
+    by_id = {node["id"]: node for node in nodes}
+    next_slot = 0
+    for node in nodes:
+        if not children[node["id"]]:
+            node["x"] = float(next_slot)
+            next_slot += 1
+
+    for node in reversed(nodes):
+        kids = children[node["id"]]
+        if kids:
+            node["x"] = sum(by_id[k]["x"] for k in kids) / len(kids)
+
+    for node in nodes:
+        node["y"] = TIER_STYLES[node["tier"]]["y"]
+
+    # Firewall and IDS share the security tier; stack them when both exist
+    if "firewall" in by_id and "ids" in by_id:
+        by_id["firewall"]["y"] += 0.25
+        by_id["ids"]["y"] -= 0.25
+
+    return {"nodes": nodes, "edges": edges}
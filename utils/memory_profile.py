@@ -0,0 +1,220 @@
+import contextvars
+import fnmatch
+import os
+import sys
+import tracemalloc
+from contextlib import nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Set NETARCHITECT_PROFILE_MEMORY=1 to profile every pipeline run
+ENABLED = os.environ.get("NETARCHITECT_PROFILE_MEMORY", "0") == "1"
+
+# Allocation sites kept per section
+TOP_SITES = 5
+
+# Allocation sites are reported by the line that allocated
+TRACE_FRAMES = 1
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# Compile the filter patterns now, before anything is traced, so the
+# first section does not report fnmatch's regex cache
+for _filter in _SNAPSHOT_FILTERS:
+    fnmatch.fnmatch("", _filter.filename_pattern)
+
+_current = contextvars.ContextVar("netarch_memory_profiler", default=None)
+
+
+def _kb(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+def source_location(path: str, lineno: int) -> str:
+    """
+    "path:line" for a source line, the path relative to the project root;
+    shared with the sampling profiler so both report sites alike.
+    """
+
+    if path.startswith(ROOT):
+        path = os.path.relpath(path, ROOT)
+    else:
+        # Library files: package and module name are enough
+        path = os.path.join(
+            os.path.basename(os.path.dirname(path)), os.path.basename(path)
+        )
+    return f"{path}:{lineno}"
+
+
+# ---------------------------
+# Sizes
+# ---------------------------
+
+def deep_sizeof(obj, seen=None) -> int:
+    """
+    Bytes retained by `obj` and everything reachable through its dicts,
+    lists, tuples and sets. Shared objects are counted once; BytesIO
+    already reports its buffer.
+    """
+
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+
+    return size
+
+
+def peak_rss_kb():
+    """
+    Highest resident set size of this process so far, or None where the
+    resource module is missing.
+    """
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KB elsewhere
+    return _kb(peak) if sys.platform == "darwin" else float(peak)
+
+
+# ---------------------------
+# Profiler
+# ---------------------------
+
+class MemoryProfiler:
+    """
+    Per-section allocation accounting with tracemalloc.
+
+    While the profiler is active (as a context manager), section(name)
+    records for each block of work the net allocation it left behind,
+    its peak above the starting point and the allocation sites that grew
+    most. tracemalloc sees the whole process, so sections are only
+    attributed exactly when nothing else allocates at the same time; the
+    pipeline runs its phases one at a time while profiling.
+    """
+
+    def __init__(self, top: int = TOP_SITES):
+        self.top = top
+        self.sections = {}
+        self._started = False
+        self._token = None
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started = True
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self.traced_peak_kb = _kb(tracemalloc.get_traced_memory()[1])
+        if self._started:
+            tracemalloc.stop()
+        return False
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def section(self, name: str):
+        return _Section(self, name)
+
+    def report(self, result: dict = None) -> dict:
+        """
+        JSON-ready report: every section, the traced peak, the process
+        peak RSS and, when given, the retained size of `result`.
+        """
+
+        report = {
+            "sections": self.sections,
+            "traced_peak_kb": getattr(self, "traced_peak_kb", None),
+            "peak_rss_kb": peak_rss_kb(),
+        }
+
+        if result is not None:
+            seen = set()
+            breakdown = {
+                key: _kb(deep_sizeof(value, seen))
+                for key, value in result.items()
+            }
+            report["result_kb"] = round(
+                _kb(sys.getsizeof(result)) + sum(breakdown.values()), 1
+            )
+            report["result_breakdown_kb"] = breakdown
+
+        return report
+
+
+class _Section:
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.before = self.profiler._snapshot()
+        tracemalloc.reset_peak()
+        self.start_size = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        size, peak = tracemalloc.get_traced_memory()
+        after = self.profiler._snapshot()
+
+        top = [
+            {
+                "site": source_location(
+                    stat.traceback[0].filename, stat.traceback[0].lineno
+                ),
+                "kb": _kb(stat.size_diff),
+                "blocks": stat.count_diff,
+            }
+            for stat in after.compare_to(self.before, "lineno")
+            if stat.size_diff > 0
+        ][:self.profiler.top]
+
+        self.profiler.sections[self.name] = {
+            "allocated_kb": _kb(size - self.start_size),
+            "peak_kb": _kb(peak - self.start_size),
+            "top_sites": top,
+        }
+        return False
+
+
+def current_profiler():
+    return _current.get()
+
+
+def section(name: str):
+    """
+    section(name) on the active profiler, or a no-op outside one.
+    """
+
+    profiler = _current.get()
+    if profiler is None:
+        return nullcontext()
+    return profiler.section(name)
@@ -1,51 +1,80 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from io import BytesIO
 
-import matplotlib.pyplot as plt
+from agents.topology_engine import allocate
+from utils.diagram_layout import TIER_STYLES, build_layout
 
-def plot_cost_breakdown(breakdown):
 
-    labels = []
-    values = []
+# ---------------------------
+# Rendering
+# ---------------------------
 
-    for item in breakdown.values():
-        labels.append(item["model"])
-        values.append(item["total"])
+def render_layout(layout, fmt="png"):
 
-    fig, ax = plt.subplots()
-    ax.pie(values, labels=labels, autopct='%1.1f%%')
-    return fig
-    if vendor_choice == "Cisco":
-        st.pyplot(plot_cost_breakdown(result["cost"]["cisco_breakdown"]))
+    nodes = layout["nodes"]
+    by_id = {node["id"]: node for node in nodes}
+    leaves = max(1, int(max(node["x"] for node in nodes)) + 1)
 
+    width = min(24, max(6, 1.6 * leaves))
+    fig = Figure(figsize=(width, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
 
-def generate_network_diagram(infra_package):
+    for parent, child in layout["edges"]:
+        a, b = by_id[parent], by_id[child]
+        ax.plot([a["x"], b["x"]], [a["y"], b["y"]], color="#999999",
+                linewidth=1, zorder=1)
 
-    design = infra_package["infrastructure_design"]
-    components = design["components"]
+    for tier, style in TIER_STYLES.items():
+        tier_nodes = [node for node in nodes if node["tier"] == tier]
+        if not tier_nodes:
+            continue
+        ax.scatter(
+            [node["x"] for node in tier_nodes],
+            [node["y"] for node in tier_nodes],
+            s=900,
+            color=style["color"],
+            zorder=2,
+        )
 
-    G = nx.Graph()
+    for node in nodes:
+        ax.annotate(
+            node["label"],
+            (node["x"], node["y"]),
+            xytext=(0, -17),
+            textcoords="offset points",
+            ha="center",
+            va="top",
+            fontsize=8,
+        )
 
-    G.add_node("Router")
+    ax.set_xlim(-0.75, leaves - 0.25)
+    ax.set_ylim(-0.75, 3.5)
+    ax.axis("off")
+    fig.tight_layout()
 
-    for i in range(components["switches"]):
-        switch = f"Switch_{i+1}"
-        G.add_node(switch)
-        G.add_edge("Router", switch)
-
-        for j in range(components["access_points"]):
-            ap = f"AP_{i+1}_{j+1}"
-            G.add_node(ap)
-            G.add_edge(switch, ap)
+    buffer = BytesIO()
 
-    plt.figure(figsize=(10, 8))
-    pos = nx.spring_layout(G)
-    nx.draw(G, pos, with_labels=True, node_size=1500)
+    # Fixed metadata and SVG ids keep the output byte-for-byte repeatable
+    if fmt == "svg":
+        with matplotlib.rc_context({"svg.hashsalt": "netarchitect"}):
+            fig.savefig(buffer, format="svg", metadata={"Date": None})
+    else:
+        fig.savefig(buffer, format="png", metadata={"Software": None})
 
-    buffer = BytesIO()
-    plt.savefig(buffer, format="png")
     buffer.seek(0)
-    plt.close()
-
     return buffer
+
+
+def generate_network_diagram(infra_package, fmt="png", topology=None):
+    """
+    Diagram of the Cisco design. `topology` is its topology_engine
+    allocation; it is computed when not given.
+    """
+
+    if topology is None:
+        topology = allocate("Cisco", infra_package)
+
+    return render_layout(build_layout(topology), fmt)
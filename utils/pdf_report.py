@@ -1,35 +1,122 @@
 import io
-import matplotlib.pyplot as plt
 
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
     Spacer,
-    Image,
     PageBreak,
 )
+from reportlab.graphics.shapes import Drawing, Circle, Line, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 from reportlab.lib.pagesizes import A4
 
+from agents.topology_engine import allocate
+from utils.chart_data import COMPARISON_CHARTS, VENDORS, comparison_values
+from utils.diagram_layout import TIER_STYLES, build_layout
+
+
+BAR_COLOR = colors.HexColor("#1f77b4")
+
 
 # ==========================================================
-# Utility: Convert Matplotlib Figure to ReportLab Image
+# Vector Drawings
 # ==========================================================
 
-def generate_chart_image(fig):
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=150)
-    buffer.seek(0)
-    plt.close(fig)
-    return buffer
+def bar_chart_drawing(title, labels, values, width=4 * inch,
+                      height=3 * inch):
+
+    drawing = Drawing(width, height)
+
+    chart = VerticalBarChart()
+    chart.x = 55
+    chart.y = 30
+    chart.width = width - 75
+    chart.height = height - 65
+    chart.data = [list(values)]
+    chart.categoryAxis.categoryNames = list(labels)
+    chart.categoryAxis.labels.fontSize = 9
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.labelTextFormat = lambda v: f"{v:,.0f}"
+    chart.bars[0].fillColor = BAR_COLOR
+    chart.bars[0].strokeColor = None
+    chart.barLabelFormat = lambda v: f"{v:,.2f}".rstrip("0").rstrip(".")
+    chart.barLabels.fontSize = 8
+    chart.barLabels.nudge = 7
+
+    drawing.add(chart)
+    drawing.add(
+        String(width / 2, height - 18, title, fontSize=11,
+               textAnchor="middle")
+    )
+
+    return drawing
+
+
+def topology_drawing(layout, width=6 * inch, height=3.2 * inch):
+    """
+    The tiered network diagram from diagram_layout, drawn as vector
+    shapes instead of an embedded raster.
+    """
+
+    nodes = layout["nodes"]
+    by_id = {node["id"]: node for node in nodes}
+    leaves = max(1, int(max(node["x"] for node in nodes)) + 1)
+
+    pad_x = 30
+    slot = (width - 2 * pad_x) / leaves
+    radius = min(10, slot / 3)
+    font_size = max(4, min(7, slot / 4))
+
+    # Tier y runs 0 (APs) to 3 (router); leave room for labels below
+    def position(node):
+        x = pad_x + (node["x"] + 0.5) * slot
+        y = 30 + node["y"] * (height - 50) / 3
+        return x, y
+
+    drawing = Drawing(width, height)
+
+    for parent, child in layout["edges"]:
+        x1, y1 = position(by_id[parent])
+        x2, y2 = position(by_id[child])
+        drawing.add(
+            Line(x1, y1, x2, y2, strokeColor=colors.grey, strokeWidth=0.6)
+        )
+
+    for node in nodes:
+        x, y = position(node)
+        color = colors.HexColor(TIER_STYLES[node["tier"]]["color"])
+        drawing.add(
+            Circle(x, y, radius, fillColor=color, strokeColor=None)
+        )
+
+        for i, line in enumerate(node["label"].split("\n")):
+            drawing.add(
+                String(
+                    x,
+                    y - radius - font_size * (i + 1.2),
+                    line,
+                    fontSize=font_size,
+                    textAnchor="middle",
+                )
+            )
+
+    return drawing
 
 
 # ==========================================================
 # MAIN PDF GENERATOR
 # ==========================================================
 
-def generate_pdf(infra_package, analysis, deployment, insights, diagram_image):
+def generate_pdf(infra_package, analysis, deployment, insights, topology=None):
+    """
+    Executive report as PDF bytes in a BytesIO. Charts and the network
+    diagram are drawn with ReportLab's vector graphics; `topology` is the
+    Cisco topology_engine allocation and is computed when not given.
+    """
 
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4)
@@ -90,51 +177,19 @@ def generate_pdf(infra_package, analysis, deployment, insights, diagram_image):
     # VENDOR COMPARISON CHARTS
     # ======================================================
 
-    vendors = ["Cisco", "TP-Link"]
-
-    # Cost Chart
-    fig1, ax1 = plt.subplots(figsize=(4, 3))
-    ax1.bar(vendors, [cisco_cost, tplink_cost])
-    ax1.set_title("Cost Comparison")
-    cost_chart = generate_chart_image(fig1)
-
-    elements.append(Paragraph("Cost Comparison", section_style))
-    elements.append(Spacer(1, 8))
-    elements.append(Image(cost_chart, width=4 * inch, height=3 * inch))
-    elements.append(Spacer(1, 16))
-
-    # Performance Chart
-    fig2, ax2 = plt.subplots(figsize=(4, 3))
-    ax2.bar(
-        vendors,
-        [
-            performance_output.get("cisco", 0),
-            performance_output.get("tplink", 0),
-        ],
-    )
-    ax2.set_title("Performance Comparison")
-    perf_chart = generate_chart_image(fig2)
-
-    elements.append(Paragraph("Performance Comparison", section_style))
-    elements.append(Spacer(1, 8))
-    elements.append(Image(perf_chart, width=4 * inch, height=3 * inch))
-    elements.append(Spacer(1, 16))
-
-    # Risk Chart
-    fig3, ax3 = plt.subplots(figsize=(4, 3))
-    ax3.bar(
-        vendors,
-        [
-            security_output.get("cisco", 0),
-            security_output.get("tplink", 0),
-        ],
-    )
-    ax3.set_title("Risk Comparison")
-    risk_chart = generate_chart_image(fig3)
+    for i, (name, key, _) in enumerate(COMPARISON_CHARTS):
+        elements.append(Paragraph(f"{name} Comparison", section_style))
+        elements.append(Spacer(1, 8))
+        elements.append(
+            bar_chart_drawing(
+                f"{name} Comparison",
+                VENDORS,
+                comparison_values(analysis, key),
+            )
+        )
+        if i < len(COMPARISON_CHARTS) - 1:
+            elements.append(Spacer(1, 16))
 
-    elements.append(Paragraph("Risk Comparison", section_style))
-    elements.append(Spacer(1, 8))
-    elements.append(Image(risk_chart, width=4 * inch, height=3 * inch))
     elements.append(PageBreak())
 
     # ======================================================
@@ -158,7 +213,9 @@ def generate_pdf(infra_package, analysis, deployment, insights, diagram_image):
 
     elements.append(Paragraph("Network Architecture Diagram", section_style))
     elements.append(Spacer(1, 8))
-    elements.append(Image(diagram_image, width=5 * inch, height=3 * inch))
+    if topology is None:
+        topology = allocate("Cisco", infra_package)
+    elements.append(topology_drawing(build_layout(topology)))
     elements.append(PageBreak())
 
     # ======================================================
@@ -0,0 +1,127 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import memory_profile, sampling_profiler, tracing
+
+
+class Phase:
+    """
+    One node of the pipeline graph. `func` is called with the outputs of
+    the phases named in `requires`, passed as keyword arguments.
+    """
+
+    def __init__(self, name: str, func, requires=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+
+
+class PhaseScheduler:
+
+    def __init__(self, phases, max_workers: int = 4):
+        self.phases = {phase.name: phase for phase in phases}
+        self.max_workers = max_workers
+
+        if len(self.phases) != len(phases):
+            raise ValueError("Duplicate phase names in pipeline graph")
+
+        self._validate()
+
+    # ---------------------------
+    # Graph Validation
+    # ---------------------------
+
+    def _validate(self):
+
+        for phase in self.phases.values():
+            for dep in phase.requires:
+                if dep not in self.phases:
+                    raise ValueError(
+                        f"Phase '{phase.name}' requires unknown phase '{dep}'"
+                    )
+
+        # Kahn's algorithm: every phase must be reachable in topological order
+        remaining = {
+            name: set(phase.requires) for name, phase in self.phases.items()
+        }
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"Cycle in pipeline graph: {sorted(remaining)}"
+                )
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    # ---------------------------
+    # Execution
+    # ---------------------------
+
+    def _run_phase(self, phase, kwargs):
+        start = time.perf_counter()
+        with tracing.span(phase.name), \
+                memory_profile.section(phase.name), \
+                sampling_profiler.section(phase.name):
+            output = phase.func(**kwargs)
+        return output, (time.perf_counter() - start) * 1000
+
+    def run(self, on_phase_done=None):
+        """
+        Run every phase as soon as its dependencies have finished.
+
+        `on_phase_done(name, output, ms)` is called as each phase
+        finishes, on the thread that called run(), in completion order.
+        Each phase runs in a copy of the caller's context, so its tracing
+        span nests under whatever span is open around run(), and it is
+        measured by the memory and CPU profilers if they are active.
+
+        Returns (outputs, timings) where timings maps each phase name to its
+        wall time in milliseconds, plus "total" for the whole graph.
+        """
+
+        outputs = {}
+        timings = {}
+        pending = dict(self.phases)
+        running = {}
+
+        run_start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            while pending or running:
+
+                ready = [
+                    phase for phase in pending.values()
+                    if all(dep in outputs for dep in phase.requires)
+                ]
+                for phase in ready:
+                    del pending[phase.name]
+                    kwargs = {dep: outputs[dep] for dep in phase.requires}
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._run_phase, phase, kwargs,
+                    )
+                    running[future] = phase.name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name], timings[name] = future.result()
+                    if on_phase_done is not None:
+                        on_phase_done(name, outputs[name], timings[name])
+
+        except BaseException:
+            # Don't start anything new; in-flight calls finish on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        executor.shutdown(wait=True)
+
+        timings["total"] = (time.perf_counter() - run_start) * 1000
+        timings = {name: round(ms, 2) for name, ms in timings.items()}
+
+        return outputs, timings
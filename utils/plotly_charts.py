@@ -0,0 +1,143 @@
+import plotly.graph_objects as go
+
+from utils.chart_data import COMPARISON_CHARTS, VENDORS, comparison_values
+from utils.diagram_layout import TIER_STYLES, build_layout
+
+
+BAR_COLOR = "#1f77b4"
+
+# Plotly's default template alone is several KB per figure; the
+# Streamlit theme restyles the chart in the browser anyway
+TEMPLATE = "none"
+
+
+def _compact(fig, height, legend=False):
+    fig.update_layout(
+        template=TEMPLATE,
+        height=height,
+        margin={"l": 40, "r": 10, "t": 40, "b": 30},
+        showlegend=legend,
+    )
+    return fig
+
+
+def bar_figure(title, labels, values, ylabel=None, height=260):
+
+    fig = go.Figure(
+        go.Bar(
+            x=list(labels),
+            y=list(values),
+            marker_color=BAR_COLOR,
+            hovertemplate="%{x}: %{y:,}<extra></extra>",
+        )
+    )
+    fig.update_layout(title={"text": title, "font": {"size": 13}})
+    if ylabel:
+        fig.update_yaxes(title_text=ylabel)
+
+    return _compact(fig, height)
+
+
+def comparison_figures(analysis: dict, height=260) -> dict:
+    """
+    Cost, performance and risk bar charts for an optimized analysis, as
+    {name: plotly figure}.
+    """
+
+    return {
+        name: bar_figure(
+            f"{name} Comparison",
+            VENDORS,
+            comparison_values(analysis, key),
+            ylabel=ylabel,
+            height=height,
+        )
+        for name, key, ylabel in COMPARISON_CHARTS
+    }
+
+
+def cost_distribution_figure(breakdown: dict, height=320):
+
+    fig = go.Figure(
+        go.Pie(
+            labels=[item["model"] for item in breakdown.values()],
+            values=[item["total"] for item in breakdown.values()],
+            customdata=[item["quantity"] for item in breakdown.values()],
+            hovertemplate=(
+                "%{label}<br>%{customdata} units, ₹%{value:,}"
+                "<extra></extra>"
+            ),
+            textinfo="percent",
+        )
+    )
+    fig.update_layout(title={"text": "Cost Distribution", "font": {"size": 13}})
+    return _compact(fig, height, legend=True)
+
+
+def topology_figure(topology: dict, height=420):
+    """
+    Interactive version of the network diagram, laid out by
+    diagram_layout.build_layout. Hovering a switch shows the APs, drops
+    and uplink load the topology engine allocated to it.
+    """
+
+    layout = build_layout(topology)
+    nodes = layout["nodes"]
+    by_id = {node["id"]: node for node in nodes}
+
+    # All edges in one trace, separated by gaps
+    edge_x, edge_y = [], []
+    for parent, child in layout["edges"]:
+        a, b = by_id[parent], by_id[child]
+        edge_x += [a["x"], b["x"], None]
+        edge_y += [a["y"], b["y"], None]
+
+    fig = go.Figure(
+        go.Scatter(
+            x=edge_x,
+            y=edge_y,
+            mode="lines",
+            line={"color": "#999999", "width": 1},
+            hoverinfo="skip",
+        )
+    )
+
+    # Per-switch load for hover text; collapsed groups get totals
+    rows = topology["switches"]
+    uplink = topology["uplink_mbps"]
+
+    def hover(node):
+        label = node["label"].replace("\n", "<br>")
+        if node["tier"] != "switch":
+            return label
+
+        first, last = node["span"]
+        group = rows[first - 1:last]
+        load = sum(row["load_mbps"] for row in group)
+        return (
+            f"{label}<br>{sum(row['access_points'] for row in group)} APs"
+            f"<br>{load:,.0f} of {uplink * len(group):,} Mbps uplink"
+        )
+
+    for tier, style in TIER_STYLES.items():
+        tier_nodes = [node for node in nodes if node["tier"] == tier]
+        if not tier_nodes:
+            continue
+        fig.add_trace(
+            go.Scatter(
+                x=[node["x"] for node in tier_nodes],
+                y=[node["y"] for node in tier_nodes],
+                mode="markers+text",
+                marker={"size": 26, "color": style["color"]},
+                text=[node["label"].split("\n")[0] for node in tier_nodes],
+                textposition="bottom center",
+                textfont={"size": 10},
+                hovertext=[hover(node) for node in tier_nodes],
+                hoverinfo="text",
+            )
+        )
+
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(visible=False, range=[-0.6, 3.4])
+
+    return _compact(fig, height)
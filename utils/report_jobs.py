@@ -0,0 +1,137 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import memory_profile, sampling_profiler, tracing
+from utils.pdf_report import generate_pdf
+
+
+def report_key(result: dict) -> str:
+    """
+    SHA-256 of everything the PDF is built from, so identical results
+    share one report.
+    """
+
+    payload = json.dumps(
+        [
+            result["infra"],
+            result["optimized_analysis"],
+            result["deployment"],
+            result["insights"],
+            result["topology"]["cisco"],
+        ],
+        sort_keys=True,
+        default=str,
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_report(result: dict) -> bytes:
+    with tracing.span("report"), \
+            memory_profile.section("report"), \
+            sampling_profiler.section("report"):
+        pdf = generate_pdf(
+            result["infra"],
+            result["optimized_analysis"],
+            result["deployment"],
+            result["insights"],
+            result["topology"]["cisco"],
+        )
+    return pdf.getvalue()
+
+
+class ReportJobManager:
+    """
+    Builds executive PDFs off the interactive path.
+
+    submit() starts a report on a background worker and returns at once;
+    get() returns the PDF bytes, waiting only if the build is still
+    running. Reports are keyed by report_key, so a result that was
+    already typeset (or is being typeset) is never built twice. At most
+    `max_entries` finished reports are kept; a failed build is dropped
+    so the next request retries it.
+    """
+
+    def __init__(self, max_workers: int = 1, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="report",
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        # Only finished reports are evicted; running ones stay reachable
+        finished = [key for key, job in self._jobs.items() if job.done()]
+        for key in finished[:max(0, len(self._jobs) - self.max_entries)]:
+            del self._jobs[key]
+
+    @staticmethod
+    def _failed(job) -> bool:
+        return job.done() and job.exception() is not None
+
+    def _forget_failed(self, key, job):
+        if job.exception() is not None:
+            with self._lock:
+                if self._jobs.get(key) is job:
+                    del self._jobs[key]
+
+    def submit(self, result: dict):
+        """
+        Future for the PDF bytes of `result`, starting the build if it is
+        not already done or under way.
+        """
+
+        key = report_key(result)
+
+        with self._lock:
+            job = self._jobs.get(key)
+            # A failed build may still be listed until its callback runs
+            if job is not None and not self._failed(job):
+                self._jobs.move_to_end(key)
+                return job
+
+            job = self._executor.submit(build_report, result)
+            self._jobs[key] = job
+            self._evict()
+
+        job.add_done_callback(lambda done: self._forget_failed(key, done))
+        return job
+
+    def get(self, result: dict, timeout: float = None) -> bytes:
+        return self.submit(result).result(timeout)
+
+    def status(self, result: dict) -> str:
+        """
+        "missing", "running" or "ready" for the report of `result`.
+        """
+
+        with self._lock:
+            job = self._jobs.get(report_key(result))
+
+        if job is None or self._failed(job):
+            return "missing"
+        return "ready" if job.done() else "running"
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_report_jobs() -> ReportJobManager:
+    """
+    Process-wide report job manager, created on first use.
+    """
+
+    global _manager
+
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ReportJobManager()
+
+    return _manager
@@ -0,0 +1,50 @@
+import hashlib
+import json
+from collections import OrderedDict
+
+
+def input_key(user_input: dict) -> str:
+    """
+    Canonical form of the dashboard inputs: the same values in any order
+    give the same key.
+    """
+
+    return json.dumps(user_input, sort_keys=True, separators=(",", ":"))
+
+
+def input_hash(user_input: dict) -> str:
+    """
+    Short, file-name-safe digest of input_key, used to name profiles.
+    """
+
+    return hashlib.sha256(input_key(user_input).encode("utf-8")).hexdigest()[:12]
+
+
+class ResultStore:
+    """
+    Size-bounded LRU of pipeline results keyed by input_key. One lives in
+    each Streamlit session, so reruns triggered by widgets are served from
+    memory and only "Run Optimization" on new inputs runs the pipeline.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return key in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key):
+        if key not in self._results:
+            return None
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
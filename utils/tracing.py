@@ -0,0 +1,319 @@
+import contextvars
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Set NETARCHITECT_TRACING=0 to turn spans into no-ops
+ENABLED = os.environ.get("NETARCHITECT_TRACING", "1") != "0"
+
+# Upper bounds, in seconds, of the span duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.025, 0.1, 0.25, 1.0, 2.5, 10.0, 30.0)
+
+# Token and timing fields copied from the LLM call stats onto its span
+LLM_FIELDS = (
+    "attempts",
+    "cache_hit",
+    "ok",
+    "status_code",
+    "first_token_ms",
+    "throttle_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "queue_time",
+    "total_time",
+)
+
+_current = contextvars.ContextVar("netarch_span", default=None)
+
+
+# ---------------------------
+# Spans
+# ---------------------------
+
+class Span:
+    """
+    One timed operation. Used as a context manager it becomes the parent
+    of every span opened inside it on the same context, including phases
+    the scheduler runs on worker threads.
+    """
+
+    __slots__ = ("name", "attrs", "start", "end", "children", "_token")
+
+    def __init__(self, name: str, attrs: dict, start: float = None):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter() if start is None else start
+        self.end = None
+        self.children = []
+        self._token = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = time.perf_counter() if self.end is None else self.end
+        return (end - self.start) * 1000
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def finish(self):
+        self.end = time.perf_counter()
+        METRICS.observe_span(self.name, self.end - self.start)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.finish()
+        return False
+
+    def to_dict(self, origin: float = None) -> dict:
+        """
+        JSON-ready tree; offsets are in ms from the start of the root.
+        """
+
+        if origin is None:
+            origin = self.start
+
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration_ms, 2),
+            "attrs": self.attrs,
+            "children": [
+                child.to_dict(origin)
+                for child in sorted(self.children, key=lambda c: c.start)
+            ],
+        }
+
+
+class _NullSpan:
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def to_dict(self, origin: float = None):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing `name` as a child of the current span, or as a
+    new root when there is none. Durations feed the Prometheus metrics
+    whether or not anyone keeps the tree.
+    """
+
+    if not ENABLED:
+        return _NULL_SPAN
+
+    child = Span(name, attrs)
+    parent = _current.get()
+    if parent is not None:
+        parent.children.append(child)
+    return child
+
+
+def current_span():
+    return _current.get()
+
+
+def record_llm_call(model: str, stats: dict):
+    """
+    Attach a finished LLM call to the current span and count its tokens.
+    The call is timed by the handler, so its span is back-dated from
+    `latency_ms` rather than opened around the request.
+    """
+
+    if not ENABLED:
+        return
+
+    METRICS.observe_llm(model, stats)
+    METRICS.observe_span("llm", stats["latency_ms"] / 1000)
+
+    parent = _current.get()
+    if parent is None:
+        return
+
+    now = time.perf_counter()
+    child = Span(
+        "llm",
+        {"model": model, **{
+            key: stats[key] for key in LLM_FIELDS if key in stats
+        }},
+        start=now - stats["latency_ms"] / 1000,
+    )
+    child.end = now
+    parent.children.append(child)
+
+
+# ---------------------------
+# Prometheus Metrics
+# ---------------------------
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class Metrics:
+    """
+    Process-wide counters behind the Prometheus text endpoint: a duration
+    histogram per span name and call / token / attempt counters per model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._llm = {}
+
+    def observe_span(self, name: str, seconds: float):
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                entry = self._spans[name] = {
+                    "buckets": [0] * len(DURATION_BUCKETS),
+                    "count": 0,
+                    "sum": 0.0,
+                }
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+            entry["count"] += 1
+            entry["sum"] += seconds
+
+    def observe_llm(self, model: str, stats: dict):
+        with self._lock:
+            entry = self._llm.get(model)
+            if entry is None:
+                entry = self._llm[model] = {
+                    "calls": 0,
+                    "cache_hits": 0,
+                    "failed_calls": 0,
+                    "attempts": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "queue_seconds": 0.0,
+                    "throttle_seconds": 0.0,
+                }
+            entry["calls"] += 1
+            entry["cache_hits"] += 1 if stats.get("cache_hit") else 0
+            entry["failed_calls"] += 0 if stats.get("ok") else 1
+            entry["attempts"] += stats.get("attempts", 0)
+            entry["prompt_tokens"] += stats.get("prompt_tokens", 0)
+            entry["completion_tokens"] += stats.get("completion_tokens", 0)
+            entry["queue_seconds"] += stats.get("queue_time") or 0.0
+            entry["throttle_seconds"] += (stats.get("throttle_ms") or 0.0) / 1000
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._llm.clear()
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+
+        with self._lock:
+            spans = {
+                name: dict(entry, buckets=list(entry["buckets"]))
+                for name, entry in self._spans.items()
+            }
+            llm = {model: dict(entry) for model, entry in self._llm.items()}
+
+        lines = [
+            "# HELP netarch_span_duration_seconds Pipeline span durations.",
+            "# TYPE netarch_span_duration_seconds histogram",
+        ]
+        for name, entry in sorted(spans.items()):
+            for bound, count in zip(DURATION_BUCKETS, entry["buckets"]):
+                lines.append(
+                    "netarch_span_duration_seconds_bucket"
+                    f"{{{_labels(span=name, le=bound)}}} {count}"
+                )
+            lines.append(
+                "netarch_span_duration_seconds_bucket"
+                f"{{{_labels(span=name, le='+Inf')}}} {entry['count']}"
+            )
+            lines.append(
+                "netarch_span_duration_seconds_sum"
+                f"{{{_labels(span=name)}}} {entry['sum']:.6f}"
+            )
+            lines.append(
+                "netarch_span_duration_seconds_count"
+                f"{{{_labels(span=name)}}} {entry['count']}"
+            )
+
+        counters = (
+            ("llm_calls_total", "calls", "LLM calls, cached or not."),
+            ("llm_cache_hits_total", "cache_hits", "LLM calls served from cache."),
+            ("llm_failed_calls_total", "failed_calls", "LLM calls that failed."),
+            ("llm_attempts_total", "attempts", "HTTP attempts, including retries."),
+            ("llm_prompt_tokens_total", "prompt_tokens", "Prompt tokens billed."),
+            ("llm_completion_tokens_total", "completion_tokens", "Completion tokens billed."),
+            ("llm_queue_seconds_total", "queue_seconds", "Time queued at the provider."),
+            ("llm_throttle_seconds_total", "throttle_seconds", "Time held by the client rate limiter."),
+        )
+        for metric, field, help_text in counters:
+            lines.append(f"# HELP netarch_{metric} {help_text}")
+            lines.append(f"# TYPE netarch_{metric} counter")
+            for model, entry in sorted(llm.items()):
+                lines.append(
+                    f"netarch_{metric}{{{_labels(model=model)}}} {entry[field]}"
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+# ---------------------------
+# Metrics Endpoint
+# ---------------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = METRICS.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood stderr
+        pass
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve /metrics on a daemon thread for a Prometheus scraper. Returns
+    the server; call shutdown() on it to stop.
+    """
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(
+        target=server.serve_forever,
+        name="metrics",
+        daemon=True,
+    ).start()
+    return server
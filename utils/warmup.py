@@ -0,0 +1,71 @@
+import importlib
+import threading
+import time
+
+from utils.catalog_loader import get_catalog
+
+
+# Modules kept off the import path of the first page render, loaded here
+# instead: ReportLab for the deferred PDF, NumPy for the BOM search
+DEFERRED_MODULES = (
+    "utils.report_jobs",
+    "agents.bom_optimizer",
+)
+
+# Every font the report's stylesheet and drawings use
+REPORT_FONTS = (
+    "Helvetica",
+    "Helvetica-Bold",
+    "Helvetica-BoldOblique",
+)
+
+
+def _load_fonts():
+    from reportlab.pdfbase import pdfmetrics
+
+    for font in REPORT_FONTS:
+        pdfmetrics.stringWidth("NetArchitect", font, 10)
+
+
+def warm_up() -> dict:
+    """
+    Pay the one-off start-up costs before the first request needs them:
+    the catalog parse and indexes, the deferred heavy modules and the
+    PDF font metrics. Returns the time spent per step in ms.
+    """
+
+    steps = [("catalog", get_catalog)]
+    steps += [
+        (name, lambda name=name: importlib.import_module(name))
+        for name in DEFERRED_MODULES
+    ]
+    steps.append(("report_fonts", _load_fonts))
+
+    timings = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        step()
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    return timings
+
+
+def start_warm_up() -> threading.Thread:
+    """
+    Run warm_up on a daemon thread so the first page renders without
+    waiting for it. A request that imports a module still loading simply
+    blocks on Python's import lock until it is ready. Code that looks a
+    module up in sys.modules instead (plotly does this for NumPy) can
+    see it half-initialised, so it should join the returned thread first.
+    """
+
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # Run once at container start (or as a readiness check) to see where
+    # start-up time goes
+    for name, ms in warm_up().items():
+        print(f"{name:<24}{ms:>9.1f} ms")